@@ -1,5 +1,6 @@
 import os
 import sys
+import argparse
 
 # Add the project root to the system path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "."))
@@ -11,6 +12,7 @@ from scripts.data_preprocessing.balance_sheet_transformation import BalanceSheet
 from scripts.data_preprocessing.income_statement_transformation import IncomeStatementTransformer
 from scripts.data_preprocessing.cash_flow_transformation import CashFlowTransformer
 from scripts.generate_scripts import main as generate_scripts_main
+from scripts.batch_runner import run_batch
 from scripts.utilities.data_transformation_utils import (
     get_data_paths,
     archive_files,
@@ -29,7 +31,7 @@ def validate_and_archive_folders():
     # Ensure directories exist
     for directory in [raw_data_dir, processed_data_dir, raw_archive_dir, processed_archive_dir]:
         os.makedirs(directory, exist_ok=True)
-        logger.info(f"Validated or created directory: {directory}")
+        logger.info("Validated or created directory: %s", directory)
 
 def run_data_ingestion():
     """Runs the data ingestion process."""
@@ -65,7 +67,23 @@ def main():
 
         logger.info("Main workflow completed successfully.")
     except Exception as e:
-        logger.exception(f"An error occurred in the main execution: {e}")
+        logger.exception("An error occurred in the main execution: %s", e)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Run the financial modeling pipeline.")
+    parser.add_argument('tickers', nargs='*', help="Tickers to run through the resumable batch queue")
+    parser.add_argument('--processes', type=int, default=4, help="Worker processes (0 runs in this process)")
+    resume = parser.add_mutually_exclusive_group()
+    resume.add_argument('--resume', dest='resume', action='store_true', default=True,
+                        help="Continue tickers left unfinished by an interrupted batch (default)")
+    resume.add_argument('--fresh', dest='resume', action='store_false',
+                        help="Discard all queued tasks and start every ticker from the first stage")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args(sys.argv[1:])
+    # Tickers on the command line run through the resumable batch queue
+    if args.tickers:
+        run_batch(args.tickers, processes=args.processes, resume=args.resume)
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,163 @@
+# scripts/analysis/backtesting.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scripts.models.time_series_forecast import (
+    METHODS,
+    forecast_auto,
+    forecast_mean,
+    forecast_series,
+    align_to_last_observation,
+    aligned_panel_groups
+)
+from scripts.utilities.data_transformation_utils import get_data_paths, logger
+from scripts.utilities.dynamic_assumptions import DEFAULT_THRESHOLDS
+from scripts.utilities.panel import load_tagged_panel
+
+SERIES_KEYS = ['Ticker', 'Statement Type', 'Category']
+REPORT_COLUMNS = ['Method', 'Step', 'Observations', 'MAPE', 'Bias', 'Band Coverage']
+
+def series_matrices(panel):
+    """
+    Aligns the long panel once into one (series x period) matrix per reporting frequency,
+    on the canonical period grid and then on each series' last observation. Column -k is
+    every series' own k-th latest period, so a cutoff is a column slice that holds back
+    the same number of periods of each series, whatever its fiscal calendar.
+
+    Returns:
+        list[tuple[int, pd.MultiIndex, np.ndarray]]: Season length, series keys and values.
+    """
+    return [
+        (season_length, series, align_to_last_observation(values))
+        for season_length, series, _, values in aligned_panel_groups(panel, SERIES_KEYS)
+    ]
+
+def scenario_bands(history, categories, thresholds=None):
+    """
+    Weak/Strong bands as generate_scenarios builds them: the historical mean
+    +/- the category's threshold (5% by default).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Lower and upper band per series.
+    """
+    thresholds = thresholds or DEFAULT_THRESHOLDS
+    baseline = forecast_mean(history, 1)[:, 0]
+    threshold = np.array([thresholds.get(category, 0.05) for category in categories])
+    weak, strong = baseline * (1 - threshold), baseline * (1 + threshold)
+    return np.minimum(weak, strong), np.maximum(weak, strong)
+
+def score_cutoff(args):
+    """
+    Forecasts from the data available at one cutoff and scores every method against
+    the realized values that follow it.
+
+    Returns:
+        pd.DataFrame: One row per (method, step) with summed errors and counts, ready to pool.
+    """
+    values, cutoff, horizon, methods, categories, thresholds, season_length = args
+    history, actual = values[:, :cutoff], values[:, cutoff:cutoff + horizon]
+    steps = actual.shape[1]
+    lower, upper = scenario_bands(history, categories, thresholds)
+    in_band = (actual >= lower[:, None]) & (actual <= upper[:, None])
+
+    rows = []
+    for method in methods:
+        if method == 'auto':
+            candidates = [m for m in METHODS if m != 'seasonal' or season_length > 1]
+            predicted, _ = forecast_auto(history, steps, methods=candidates, season_length=season_length)
+        else:
+            predicted = forecast_series(history, steps, method, season_length)
+        with np.errstate(all='ignore'):
+            pct_error = (predicted - actual) / np.abs(actual)
+        scored = np.isfinite(pct_error)
+        for step in range(steps):
+            mask = scored[:, step]
+            rows.append({
+                'Cutoff': cutoff,
+                'Method': method,
+                'Step': step + 1,
+                'Observations': int(mask.sum()),
+                'Abs Error Sum': float(np.abs(pct_error[mask, step]).sum()),
+                'Error Sum': float(pct_error[mask, step].sum()),
+                'In Band': int(in_band[mask, step].sum()),
+            })
+    return pd.DataFrame(rows)
+
+def run_backtest(panel, horizon=2, min_history=3, methods=None, thresholds=None, max_workers=None):
+    """
+    Replays forecasts at every historical cutoff across all tickers and scores them.
+
+    Args:
+        panel (pd.DataFrame): Long panel (Ticker, Statement Type, Category, Period, Amount).
+        horizon (int): Periods forecast after each cutoff.
+        min_history (int): Periods required before the first cutoff.
+        methods (list[str], optional): Forecast methods to compare; 'mean' reproduces generate_forecast.
+        thresholds (dict, optional): Scenario thresholds for the Weak/Strong bands.
+        max_workers (int, optional): Worker processes over cutoffs; 1 runs inline.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: (report by method and step, per-cutoff detail).
+        A detail row's Cutoff is the number of each series' latest periods held back.
+    """
+    methods = methods or ['mean', 'linear', 'holt', 'auto']
+    tasks, held_back, n_series = [], [], 0
+    for season_length, series, values in series_matrices(panel):
+        categories = list(series.get_level_values('Category'))
+        n_series += len(values)
+        cutoffs = range(min_history, values.shape[1])
+        # Each task only carries the columns it can see plus its realized horizon
+        tasks += [
+            (values[:, :cutoff + horizon], cutoff, horizon, methods, categories, thresholds, season_length)
+            for cutoff in cutoffs
+        ]
+        held_back += [values.shape[1] - cutoff for cutoff in cutoffs]
+    if not tasks:
+        logger.warning("Not enough periods to backtest: %d required.", min_history + 1)
+        return pd.DataFrame(columns=REPORT_COLUMNS), pd.DataFrame()
+
+    if max_workers == 1 or len(tasks) == 1:
+        results = [score_cutoff(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(score_cutoff, tasks))
+
+    detail = pd.concat([result.assign(Cutoff=held) for result, held in zip(results, held_back)], ignore_index=True)
+    pooled = detail.groupby(['Method', 'Step'], sort=False)[['Observations', 'Abs Error Sum', 'Error Sum', 'In Band']].sum()
+    observations = pooled['Observations'].where(pooled['Observations'] > 0)
+    report = pd.DataFrame({
+        'Observations': pooled['Observations'],
+        'MAPE': pooled['Abs Error Sum'] / observations,
+        'Bias': pooled['Error Sum'] / observations,
+        'Band Coverage': pooled['In Band'] / observations,
+    }).reset_index()[REPORT_COLUMNS]
+    logger.info("Backtested %d series over %d cutoffs.", n_series, len(tasks))
+    return report, detail
+
+def save_backtest_report(report, detail=None, output_dir=None):
+    """Writes the backtest report (and optional per-cutoff detail) to data/outputs."""
+    if output_dir is None:
+        _, processed_data_dir = get_data_paths()
+        output_dir = os.path.join(os.path.dirname(processed_data_dir), 'outputs')
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, 'backtest_report.csv')
+    report.to_csv(output_path, index=False)
+    if detail is not None:
+        detail.to_csv(os.path.join(output_dir, 'backtest_detail.csv'), index=False)
+    logger.info("Backtest report saved to %s", output_path)
+    return output_path
+
+def main():
+    """Backtests every tagged ticker in the processed data directory."""
+    panel = load_tagged_panel()
+    if panel.empty:
+        logger.warning("No tagged statements to backtest.")
+        return
+    report, detail = run_backtest(panel)
+    save_backtest_report(report, detail)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+# scripts/analysis/screening.py
+
+import os
+import re
+import numpy as np
+import pandas as pd
+from scripts.utilities.data_transformation_utils import logger
+from scripts.utilities.panel import find_tagged_files, read_tagged_statement
+from scripts.utilities.periods import parse_period_label
+
+# Ratio metrics derived from standardized categories: numerator / denominator
+RATIO_METRICS = {
+    'Gross Margin': ('Gross Profit', 'Revenue'),
+    'Operating Margin': ('Operating Income', 'Revenue'),
+    'Net Margin': ('Net Income', 'Revenue'),
+    'FCF Margin': ('Free Cash Flow', 'Revenue'),
+    'Debt to Equity': ('Long-Term Debt', 'Total Equity'),
+}
+
+# Year-over-year growth metrics derived from standardized categories
+GROWTH_METRICS = {
+    'Revenue Growth': 'Revenue',
+    'Net Income Growth': 'Net Income',
+    'Free Cash Flow Growth': 'Free Cash Flow',
+}
+
+# Window aggregation used so that a predicate must hold in every period of the window
+_OPERATORS = {
+    '>': ('min', 'right', False),
+    '>=': ('min', 'left', False),
+    '<': ('max', 'left', True),
+    '<=': ('max', 'right', True),
+}
+
+_FILTER_PATTERN = re.compile(r'^\s*(.+?)\s*(>=|<=|>|<)\s*(-?[\d.]+%?)\s*(?:over\s+(\d+))?\s*$')
+
+def parse_filter(expression):
+    """
+    Parses a filter such as "Gross Margin > 40%" or "Revenue Growth > 0.1 over 3".
+
+    Returns:
+        tuple: (metric, operator, value, periods)
+    """
+    match = _FILTER_PATTERN.match(expression)
+    if not match:
+        raise ValueError(f"Cannot parse screening filter: {expression!r}")
+    metric, operator, value, periods = match.groups()
+    value = float(value[:-1]) / 100 if value.endswith('%') else float(value)
+    return metric, operator, value, int(periods) if periods else 1
+
+def build_metric_frame(ticker_panel):
+    """
+    Pivots one ticker's long panel rows into a fiscal-year x metric frame,
+    including the derived ratio and growth metrics.
+    """
+    # Fiscal years, so a 52/53-week year ending in early January counts as the prior year
+    parsed = {label: parse_period_label(label) for label in ticker_panel['Period'].unique()}
+    years = ticker_panel['Period'].map(lambda label: parsed[label].fiscal_year if parsed[label] else np.nan)
+    frame = (
+        ticker_panel.assign(Year=years)
+        .dropna(subset=['Year'])
+        .pivot_table(index='Year', columns='Category', values='Amount', aggfunc='last')
+        .sort_index()
+    )
+    frame.index = frame.index.astype(int)
+
+    derived = {}
+    for metric, (numerator, denominator) in RATIO_METRICS.items():
+        if numerator in frame.columns and denominator in frame.columns:
+            derived[metric] = frame[numerator] / frame[denominator].replace(0, np.nan)
+    for metric, category in GROWTH_METRICS.items():
+        if category in frame.columns:
+            previous = frame[category].shift(1)
+            consecutive = pd.Series(frame.index, index=frame.index).diff() == 1
+            derived[metric] = ((frame[category] - previous) / previous.abs().replace(0, np.nan)).where(consecutive)
+    if derived:
+        frame = pd.concat([frame, pd.DataFrame(derived)], axis=1)
+    return frame
+
+class ScreeningIndex:
+    """
+    Screening and ranking engine over the tagged statements of every ticker.
+
+    Per-ticker metric frames are cached and only reloaded when a tagged file changes.
+    The metrics are stacked into a (ticker x metric x year) array, and each
+    (metric, window, aggregation) used by a query gets a sorted index so that
+    predicates resolve with a binary search and rankings with a slice.
+    """
+
+    def __init__(self, processed_dir=None, default_ticker='DEFAULT'):
+        self.processed_dir = processed_dir
+        self.default_ticker = default_ticker
+        self._file_mtimes = {}
+        self._ticker_frames = {}
+        self._sorted_indexes = {}
+        self.tickers = np.array([], dtype=object)
+        self.metrics = []
+        self.years = np.array([], dtype=int)
+        self.values = np.empty((0, 0, 0))
+        self._last_valid = np.empty((0, 0), dtype=int)
+        self.refresh()
+
+    def refresh(self):
+        """
+        Reloads tickers whose tagged files were added, changed or removed since the last refresh.
+
+        Returns:
+            list[str]: The tickers that were reloaded or dropped.
+        """
+        current = {
+            (ticker, statement_type, file_path): os.path.getmtime(file_path)
+            for ticker, statement_type, file_path in find_tagged_files(self.processed_dir, self.default_ticker)
+        }
+        changed = {key[0] for key, mtime in current.items() if self._file_mtimes.get(key) != mtime}
+        changed |= {key[0] for key in self._file_mtimes if key not in current}
+        if not changed:
+            return []
+
+        for ticker in changed:
+            files = [key for key in current if key[0] == ticker]
+            if not files:
+                self._ticker_frames.pop(ticker, None)
+                continue
+            ticker_panel = pd.concat(
+                [read_tagged_statement(file_path, statement_type, ticker) for _, statement_type, file_path in files],
+                ignore_index=True
+            )
+            self._ticker_frames[ticker] = build_metric_frame(ticker_panel)
+
+        self._file_mtimes = current
+        self._rebuild_arrays()
+        logger.info("Screening index refreshed for %s tickers (%s indexed).", len(changed), len(self.tickers))
+        return sorted(changed)
+
+    def _rebuild_arrays(self):
+        """Stacks the cached per-ticker frames into the metric array and drops stale sorted indexes."""
+        self.tickers = np.array(sorted(self._ticker_frames), dtype=object)
+        self.metrics = sorted({metric for frame in self._ticker_frames.values() for metric in frame.columns})
+        self.years = np.array(sorted({year for frame in self._ticker_frames.values() for year in frame.index}), dtype=int)
+
+        self.values = np.full((len(self.tickers), len(self.metrics), len(self.years)), np.nan)
+        metric_positions = {metric: i for i, metric in enumerate(self.metrics)}
+        for row, ticker in enumerate(self.tickers):
+            frame = self._ticker_frames[ticker]
+            columns = [metric_positions[metric] for metric in frame.columns]
+            year_positions = np.searchsorted(self.years, frame.index.to_numpy())
+            self.values[row][np.ix_(columns, year_positions)] = frame.to_numpy(dtype=float).T
+
+        # Position of the latest reported year per ticker and metric (-1 if never reported)
+        reported = ~np.isnan(self.values)
+        last_from_end = np.argmax(reported[:, :, ::-1], axis=2)
+        self._last_valid = np.where(reported.any(axis=2), len(self.years) - 1 - last_from_end, -1)
+        self._sorted_indexes = {}
+
+    def window_values(self, metric, periods=1, aggregation='min'):
+        """
+        Aggregates each ticker's last `periods` reported values of a metric.
+
+        Tickers with fewer than `periods` consecutive reported values get NaN.
+        """
+        if metric not in self.metrics:
+            raise KeyError(f"Unknown screening metric: {metric}")
+        m = self.metrics.index(metric)
+        last = self._last_valid[:, m]
+        offsets = last[:, None] - np.arange(periods)[::-1]
+        valid = (last[:, None] >= 0) & (offsets >= 0)
+        window = self.values[np.arange(len(self.tickers))[:, None], m, np.clip(offsets, 0, None)]
+        window = np.where(valid, window, np.nan)
+        complete = ~np.isnan(window).any(axis=1)
+        result = window.min(axis=1) if aggregation == 'min' else window.max(axis=1)
+        return np.where(complete, result, np.nan)
+
+    def sorted_index(self, metric, periods=1, aggregation='min'):
+        """Returns (sorted values, ticker order) for a metric window, building it on first use."""
+        key = (metric, periods, aggregation)
+        if key not in self._sorted_indexes:
+            values = self.window_values(metric, periods, aggregation)
+            valid = np.flatnonzero(~np.isnan(values))
+            order = valid[np.argsort(values[valid], kind='stable')]
+            self._sorted_indexes[key] = (values[order], order)
+        return self._sorted_indexes[key]
+
+    def filter_mask(self, metric, operator, value, periods=1):
+        """Boolean ticker mask for a single predicate holding in each of the last `periods` years."""
+        if operator not in _OPERATORS:
+            raise ValueError(f"Unsupported screening operator: {operator}")
+        aggregation, side, below = _OPERATORS[operator]
+        sorted_values, order = self.sorted_index(metric, periods, aggregation)
+        cut = np.searchsorted(sorted_values, value, side=side)
+        mask = np.zeros(len(self.tickers), dtype=bool)
+        mask[order[:cut] if below else order[cut:]] = True
+        return mask
+
+    def screen(self, filters, sort_by=None, top=None, ascending=False):
+        """
+        Evaluates multi-predicate filters and optionally ranks the passing tickers.
+
+        Args:
+            filters (list): Expressions like "Gross Margin > 40%" or (metric, operator, value[, periods]) tuples.
+            sort_by (str, optional): Metric used for ranking (latest reported value).
+            top (int, optional): Number of tickers to return after ranking.
+            ascending (bool): Rank from the lowest value instead of the highest.
+
+        Returns:
+            pd.DataFrame: One row per passing ticker with the latest value of every referenced metric.
+        """
+        mask = np.ones(len(self.tickers), dtype=bool)
+        referenced = []
+        for item in filters:
+            metric, operator, value, *rest = parse_filter(item) if isinstance(item, str) else item
+            mask &= self.filter_mask(metric, operator, value, rest[0] if rest else 1)
+            referenced.append(metric)
+
+        if sort_by is not None:
+            _, order = self.sorted_index(sort_by, 1, 'min')
+            order = order if ascending else order[::-1]
+            selected = order[mask[order]]
+            referenced.insert(0, sort_by)
+        else:
+            selected = np.flatnonzero(mask)
+        if top is not None:
+            selected = selected[:top]
+
+        result = pd.DataFrame({'Ticker': self.tickers[selected]})
+        for metric in dict.fromkeys(referenced):
+            result[metric] = self.window_values(metric, 1)[selected]
+        return result
+
+    def top_k(self, metric, k=10, ascending=False):
+        """Ranks all tickers by the latest reported value of a metric."""
+        return self.screen([], sort_by=metric, top=k, ascending=ascending)
+
+if __name__ == "__main__":
+    index = ScreeningIndex()
+    results = index.screen(["Gross Margin > 40%", "Revenue Growth > 10% over 3"], sort_by='Gross Margin', top=25)
+    print(results)
@@ -0,0 +1,134 @@
+# scripts/analysis/tagging_evaluation.py
+
+import os
+import time
+
+import pandas as pd
+from fuzzywuzzy import process
+
+from scripts.utilities.data_transformation_utils import (
+    get_data_paths,
+    alias_lookup,
+    line_item_dict,
+    match_line_item,
+    logger
+)
+
+UNMAPPED = '(unmapped)'
+REPORT_COLUMNS = [
+    'Strategy', 'Threshold', 'Labels', 'Precision', 'Recall', 'F1', 'Accuracy', 'Labels per Second'
+]
+
+def default_gold_path():
+    raw_data_dir, _ = get_data_paths()
+    return os.path.join(os.path.dirname(raw_data_dir), 'gold', 'line_item_gold.csv')
+
+def load_gold_set(path=None):
+    """
+    Reads the labeled gold set: real yfinance labels with the standard category they
+    should be tagged as. A blank Category means no standard category applies and the
+    label should be left untagged.
+    """
+    gold = pd.read_csv(path or default_gold_path(), keep_default_na=False)
+    gold['Category'] = gold['Category'].replace('', UNMAPPED)
+    return gold
+
+def match_keys(label, threshold, dictionary=line_item_dict):
+    """
+    The data_transformation_utils tagger: fuzzy match against the standard category
+    names only. Calls the unmemoized function so timings measure matching, not the cache.
+    """
+    return match_line_item.__wrapped__(label, tuple(dictionary), threshold)
+
+def match_aliases(label, threshold, dictionary=line_item_dict):
+    """The dt / new_data_transformation_utils tagger: best fuzzy match over every alias list."""
+    matches = [(key, process.extractOne(label, aliases)) for key, aliases in dictionary.items()]
+    best_match, (_, score) = max(matches, key=lambda match: match[1][1])
+    return best_match if score >= threshold else label
+
+# id(dictionary) -> (dictionary, lookup); holding the dictionary keeps its id from being reused
+_EXACT_LOOKUPS = {}
+
+def match_exact(label, threshold=None, dictionary=line_item_dict):
+    """
+    Case-insensitive exact lookup of category names and aliases, as standardize_labels
+    tags; the no-fuzz baseline. The lookup is built once per dictionary.
+    """
+    cached = _EXACT_LOOKUPS.get(id(dictionary))
+    if cached is None or cached[0] is not dictionary:
+        cached = _EXACT_LOOKUPS[id(dictionary)] = (dictionary, alias_lookup(dictionary))
+    match = cached[1].get(label.strip().lower())
+    return match[0] if match is not None else label
+
+STRATEGIES = {
+    'keys': match_keys,
+    'aliases': match_aliases,
+    'exact': match_exact,
+}
+
+def score(expected, predicted):
+    """Precision and recall over mapped labels; accuracy also credits correctly unmapped ones."""
+    mapped = predicted != UNMAPPED
+    relevant = expected != UNMAPPED
+    correct = expected == predicted
+    precision = (correct & mapped).sum() / mapped.sum() if mapped.any() else float('nan')
+    recall = (correct & relevant).sum() / relevant.sum() if relevant.any() else float('nan')
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1, correct.mean()
+
+def evaluate(gold=None, strategies=None, thresholds=(70, 80, 90), repeats=1):
+    """
+    Runs every strategy at every threshold over the gold set.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: (report per strategy and threshold,
+        confusion counts of expected vs predicted category for the misses).
+    """
+    gold = load_gold_set() if gold is None else gold
+    strategies = strategies or STRATEGIES
+    categories = set(line_item_dict)
+    labels = gold['Label'].tolist()
+    expected = gold['Category'].to_numpy()
+
+    rows, confusion = [], []
+    for name, matcher in strategies.items():
+        for threshold in (thresholds if name != 'exact' else (None,)):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                results = [matcher(label, threshold) for label in labels]
+            elapsed = time.perf_counter() - start
+            predicted = pd.Series([result if result in categories else UNMAPPED for result in results]).to_numpy()
+
+            precision, recall, f1, accuracy = score(expected, predicted)
+            rows.append({
+                'Strategy': name,
+                'Threshold': threshold,
+                'Labels': len(labels),
+                'Precision': precision,
+                'Recall': recall,
+                'F1': f1,
+                'Accuracy': accuracy,
+                'Labels per Second': len(labels) * repeats / elapsed if elapsed else float('inf'),
+            })
+            misses = pd.DataFrame({'Expected': expected, 'Predicted': predicted})
+            misses = misses[misses['Expected'] != misses['Predicted']]
+            counts = misses.value_counts().rename('Count').reset_index()
+            counts.insert(0, 'Threshold', threshold)
+            counts.insert(0, 'Strategy', name)
+            confusion.append(counts)
+
+    report = pd.DataFrame(rows, columns=REPORT_COLUMNS)
+    return report, pd.concat(confusion, ignore_index=True)
+
+def main():
+    """Evaluates the taggers on the gold set and saves the reports to data/outputs."""
+    report, confusion = evaluate()
+    _, processed_data_dir = get_data_paths()
+    output_dir = os.path.join(os.path.dirname(processed_data_dir), 'outputs')
+    os.makedirs(output_dir, exist_ok=True)
+    report.to_csv(os.path.join(output_dir, 'tagging_evaluation.csv'), index=False)
+    confusion.to_csv(os.path.join(output_dir, 'tagging_confusion.csv'), index=False)
+    logger.info("Tagging evaluation:\n%s", report.to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# scripts/batch_runner.py
+
+import os
+import time
+import multiprocessing
+from scripts.data_ingestion.data_retrieval import (
+    get_financial_data_yfinance,
+    get_reporting_currency,
+    save_financial_data_to_csv
+)
+from scripts.data_ingestion.restatements import commit_snapshot, record_pull
+from scripts.data_preprocessing.financial_statement_transformer import (
+    BalanceSheetTransformer,
+    IncomeStatementTransformer,
+    CashFlowTransformer
+)
+from scripts.generate_scripts import main as generate_scripts_main
+from scripts.outputs.analytical_store import sync_ticker
+from scripts.utilities.currency import record_reporting_currency
+from scripts.utilities.data_transformation_utils import get_data_paths, logger
+from scripts.utilities.logging_config import configure_worker_logging, log_context, start_process_log_listener
+from scripts.utilities.work_queue import WorkQueue
+
+def run_ingest(ticker):
+    """
+    Fetches and saves the raw statements for one ticker. Returns False, skipping the
+    downstream stages, when the pull neither adds periods nor materially restates any value.
+    """
+    financial_data = get_financial_data_yfinance(ticker)
+    if not financial_data:
+        raise RuntimeError(f"No financial data retrieved for {ticker}")
+    material = record_pull(financial_data, ticker)
+    save_financial_data_to_csv(financial_data, ticker)
+    record_reporting_currency(ticker, get_reporting_currency(ticker))
+    return material
+
+def run_preprocess(ticker):
+    """Transforms and tags the three statements for one ticker."""
+    for Transformer in [BalanceSheetTransformer, IncomeStatementTransformer, CashFlowTransformer]:
+        Transformer(ticker).transform(raise_errors=True)
+
+def run_baseline(ticker):
+    """
+    Combines the tagged statements and computes the baseline for one ticker. Returns False,
+    skipping the store stage, when validation quarantined the ticker.
+    """
+    return generate_scripts_main(ticker)
+
+def run_store(ticker):
+    """Upserts the ticker's statements, tags, baseline, scenarios and forecasts into the analytical store."""
+    sync_ticker(ticker)
+
+# Ordered pipeline stages. A handler returning False stops the ticker's pipeline after that stage.
+STAGES = [
+    ('ingest', run_ingest),
+    ('preprocess', run_preprocess),
+    ('baseline', run_baseline),
+    ('store', run_store),
+]
+
+def default_queue_path():
+    _, processed_data_dir = get_data_paths()
+    return os.path.join(os.path.dirname(processed_data_dir), 'batch_queue.sqlite')
+
+def run_task(queue, task):
+    """Runs one claimed task and enqueues the ticker's next stage on success."""
+    stage_names = [name for name, _ in STAGES]
+    handler = dict(STAGES)[task['stage']]
+    with log_context(ticker=task['ticker'], stage=task['stage']):
+        try:
+            proceed = handler(task['ticker'])
+        except Exception as e:
+            status = queue.fail(task['id'], e)
+            logger.error("Task failed (attempt %d, now %s): %s", task['attempts'] + 1, status, e)
+            return
+
+    position = stage_names.index(task['stage'])
+    if proceed is not False and position + 1 < len(stage_names):
+        # Enqueue before completing so other workers never see an empty queue mid-pipeline
+        queue.enqueue(task['ticker'], stage_names[position + 1], task['priority'])
+    elif proceed is not False:
+        # Every stage succeeded: later pulls are diffed against this one
+        commit_snapshot(task['ticker'])
+    queue.complete(task['id'])
+
+def worker_loop(db_path, worker, max_attempts=3, backoff_seconds=30.0, log_queue=None):
+    """Claims and runs tasks until no pending or running task is left."""
+    if log_queue is not None:
+        configure_worker_logging(log_queue)
+    queue = WorkQueue(db_path, max_attempts, backoff_seconds)
+    while True:
+        task = queue.claim(worker)
+        if task is not None:
+            run_task(queue, task)
+            continue
+        if not queue.has_unfinished():
+            return
+        wait = queue.next_retry_in()
+        time.sleep(min(wait, 5.0) if wait else 0.5)
+
+def run_batch(tickers, processes=4, db_path=None, resume=True, priorities=None, max_attempts=3, backoff_seconds=30.0):
+    """
+    Runs the pipeline for many tickers through the durable work queue.
+
+    Args:
+        tickers (list[str]): Ticker symbols to process.
+        processes (int): Worker processes; 0 runs the tasks in the current process.
+        db_path (str, optional): Queue database path (defaults to data/batch_queue.sqlite).
+        resume (bool): Let tickers with unfinished tasks from an interrupted run pick up where
+            they stopped; False discards all queued tasks first. Tickers whose previous run
+            finished (done or failed) always start a new run.
+        priorities (dict, optional): Ticker -> priority; higher runs first.
+        max_attempts (int): Attempts before a task is marked failed.
+        backoff_seconds (float): Base delay of the exponential retry backoff.
+
+    Returns:
+        list[dict]: Task counts and durations by stage and status.
+    """
+    db_path = db_path or default_queue_path()
+    queue = WorkQueue(db_path, max_attempts, backoff_seconds)
+    if not resume:
+        queue.clear()
+    queue.requeue_running()
+
+    priorities = priorities or {}
+    resumed = 0
+    for ticker in tickers:
+        ticker = ticker.strip().upper()
+        resumed += not queue.start_pipeline(ticker, STAGES[0][0], priorities.get(ticker, 0))
+    if resumed:
+        logger.info("Resuming unfinished runs for %d tickers.", resumed)
+
+    if processes <= 0:
+        worker_loop(db_path, 'main', max_attempts, backoff_seconds)
+    else:
+        # Workers ship their records to a single listener so output lines never interleave
+        log_queue, listener = start_process_log_listener()
+        workers = [
+            multiprocessing.Process(
+                target=worker_loop, args=(db_path, f'worker-{i}', max_attempts, backoff_seconds, log_queue)
+            )
+            for i in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        listener.stop()
+
+    summary = queue.summary()
+    for row in summary:
+        logger.info("Batch %s %s: %d tasks, %.1fs", row['stage'], row['status'], row['tasks'], row['seconds'] or 0)
+    return summary
@@ -16,7 +16,7 @@ def get_financial_data_yfinance(ticker_symbol: str) -> Dict[str, pd.DataFrame]:
         as DataFrames for income statement, balance sheet, and cash flow.
     """
     try:
-        logger.info(f"Fetching financial data for ticker: {ticker_symbol}")
+        logger.info("Fetching financial data for ticker: %s", ticker_symbol)
         ticker = yf.Ticker(ticker_symbol)
 
         # Fetch financial statements
@@ -25,48 +25,61 @@ def get_financial_data_yfinance(ticker_symbol: str) -> Dict[str, pd.DataFrame]:
         cash_flow = ticker.cashflow
 
         if income_statement.empty or balance_sheet.empty or cash_flow.empty:
-            logger.warning(f"No financial data found for ticker: {ticker_symbol}")
+            logger.warning("No financial data found for ticker: %s", ticker_symbol)
             return {}
 
-        logger.info(f"Successfully fetched financial data for {ticker_symbol}")
+        logger.info("Successfully fetched financial data for %s", ticker_symbol)
         return {
             'income_statement': income_statement,
             'balance_sheet': balance_sheet,
             'cash_flow': cash_flow
         }
     except Exception as e:
-        logger.error(f"An error occurred while fetching financial data for {ticker_symbol}: {e}")
+        logger.error("An error occurred while fetching financial data for %s: %s", ticker_symbol, e)
         return {}
 
-def save_financial_data_to_csv(financial_data: Dict[str, pd.DataFrame]):
+def get_reporting_currency(ticker_symbol: str) -> str:
+    """
+    Returns the currency the ticker's statements are reported in (e.g. "JPY" for an ADR),
+    falling back to USD when yfinance does not say.
+    """
+    try:
+        info = yf.Ticker(ticker_symbol).info or {}
+        return (info.get('financialCurrency') or 'USD').upper()
+    except Exception as e:
+        logger.warning("Could not determine reporting currency for %s: %s", ticker_symbol, e)
+        return 'USD'
+
+def save_financial_data_to_csv(financial_data: Dict[str, pd.DataFrame], ticker_symbol: str = None):
     """
     Saves the financial data to separate CSV files in the 'raw' subfolder.
 
     Args:
         financial_data (Dict[str, pd.DataFrame]): Dictionary of DataFrames to save.
+        ticker_symbol (str, optional): Saves into the ticker's own 'raw' subfolder when given.
     """
     if not financial_data:
         logger.error("No financial data available to save.")
         return
 
     try:
-        raw_data_dir, _ = get_data_paths()
+        raw_data_dir, _ = get_data_paths(ticker_symbol)
         raw_data_dir = os.path.abspath(raw_data_dir)
         os.makedirs(raw_data_dir, exist_ok=True)
-        logger.info(f"Saving financial data to directory: {raw_data_dir}")
+        logger.info("Saving financial data to directory: %s", raw_data_dir)
 
         for statement_type, df in financial_data.items():
             if df.empty:
-                logger.warning(f"{statement_type} DataFrame is empty. Skipping save.")
+                logger.warning("%s DataFrame is empty. Skipping save.", statement_type)
                 continue
 
             csv_path = os.path.join(raw_data_dir, f"{statement_type}.csv")
             df.to_csv(csv_path, index=True)
-            logger.info(f"Saved {statement_type} data to {csv_path}")
+            logger.info("Saved %s data to %s", statement_type, csv_path)
 
         logger.info("Financial data saved successfully.")
     except Exception as e:
-        logger.error(f"An error occurred while saving financial data: {e}")
+        logger.error("An error occurred while saving financial data: %s", e)
 
 def main(ticker_symbol=None):
     """
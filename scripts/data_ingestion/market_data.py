@@ -0,0 +1,145 @@
+# scripts/data_ingestion/market_data.py
+
+import zlib
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from scripts.utilities.data_transformation_utils import logger
+from scripts.utilities.periods import reported_period_end
+from scripts.utilities.timeseries_store import TimeSeriesStore
+
+PRICE_FIELD = 'close'
+MULTIPLE_COLUMNS = ['Ticker', 'Period', 'Price', 'Shares', 'Market Cap', 'Enterprise Value', 'P/E', 'EV/EBITDA', 'EV/Revenue']
+
+class PriceProvider:
+    """Source of daily closing prices."""
+
+    def fetch(self, ticker_symbol, start, end):
+        """
+        Returns:
+            pd.Series: Closing prices indexed by date for start <= date <= end.
+        """
+        raise NotImplementedError
+
+class YFinancePriceProvider(PriceProvider):
+    """Daily closes from Yahoo Finance (split-adjusted, not dividend-adjusted)."""
+
+    def fetch(self, ticker_symbol, start, end):
+        history = yf.Ticker(ticker_symbol).history(
+            start=str(start), end=str(pd.Timestamp(end) + timedelta(days=1))[:10], auto_adjust=False
+        )
+        if history.empty:
+            return pd.Series(dtype=float)
+        closes = history['Close']
+        closes.index = pd.DatetimeIndex(closes.index).tz_localize(None).normalize()
+        return closes
+
+class FakePriceProvider(PriceProvider):
+    """Deterministic business-day random walk per ticker, for tests and offline runs."""
+
+    def __init__(self, start_price=100.0, volatility=0.02):
+        self.start_price = start_price
+        self.volatility = volatility
+        self.calls = []
+
+    def fetch(self, ticker_symbol, start, end):
+        self.calls.append((ticker_symbol, str(start), str(end)))
+        # The walk is anchored at 2000-01-03 so overlapping fetches agree
+        days = np.arange(np.datetime64('2000-01-03'), np.datetime64(str(pd.Timestamp(end).date())) + 1)
+        days = pd.DatetimeIndex(days[np.is_busday(days)])
+        rng = np.random.default_rng(zlib.crc32(ticker_symbol.encode()))
+        prices = self.start_price * np.exp(np.cumsum(rng.normal(0, self.volatility, len(days))))
+        series = pd.Series(prices, index=days)
+        return series[series.index >= pd.Timestamp(start)]
+
+def ingest_prices(tickers, provider=None, store=None, start='2000-01-01', end=None):
+    """
+    Appends new daily closes for every ticker to the time-series store, fetching only
+    dates after each ticker's last stored date, then compacts the store.
+
+    Returns:
+        int: Number of price points appended.
+    """
+    provider = provider or YFinancePriceProvider()
+    store = store or TimeSeriesStore()
+    end = pd.Timestamp(end or date.today())
+    last_dates = store.last_dates(PRICE_FIELD)
+
+    frames = []
+    for ticker in tickers:
+        first = last_dates[ticker] + timedelta(days=1) if ticker in last_dates else pd.Timestamp(start)
+        if first > end:
+            continue
+        try:
+            closes = provider.fetch(ticker, first.date(), end.date()).dropna()
+        except Exception as e:
+            logger.error("Could not fetch prices for %s: %s", ticker, e)
+            continue
+        if not closes.empty:
+            frames.append(pd.DataFrame({'Ticker': ticker, 'Date': closes.index, 'Close': closes.to_numpy()}))
+
+    appended = sum(len(frame) for frame in frames)
+    if frames:
+        prices = pd.concat(frames, ignore_index=True)
+        store.append(PRICE_FIELD, prices['Ticker'].to_numpy(), prices['Date'], prices['Close'].to_numpy())
+        store.compact(PRICE_FIELD)
+    logger.info("Appended %d prices for %d tickers.", appended, len(tickers))
+    return appended
+
+def _latest(wide, *categories):
+    """First available category per row, in preference order."""
+    result = pd.Series(np.nan, index=wide.index)
+    for category in categories:
+        if category in wide.columns:
+            result = result.fillna(wide[category])
+    return result
+
+def market_multiples(panel, store=None):
+    """
+    Prices every Ticker x Period of the panel at the last close on or before its reported
+    period end and derives market cap, enterprise value and multiples for the whole
+    universe at once. 52/53-week period ends are used as reported, not snapped to the
+    month end, so no price after the period end is ever used.
+
+    Shares are Diluted Average Shares (Basic when diluted is missing); EBITDA falls back
+    to Operating Income plus Depreciation and Amortization.
+
+    Returns:
+        pd.DataFrame: One row per Ticker and Period in the MULTIPLE_COLUMNS layout.
+    """
+    store = store or TimeSeriesStore()
+    amounts = pd.to_numeric(panel['Amount'], errors='coerce')
+    wide = panel.assign(Amount=amounts).pivot_table(
+        index=['Ticker', 'Period'], columns='Category', values='Amount', aggfunc='last'
+    )
+    periods = wide.index.get_level_values('Period')
+    reported = {label: reported_period_end(label) for label in periods.unique()}
+    ends = pd.DatetimeIndex([reported[label] if reported[label] is not None else pd.NaT for label in periods])
+    valid = ~ends.isna()
+
+    prices = np.full(len(wide), np.nan)
+    prices[valid] = store.asof(PRICE_FIELD, wide.index.get_level_values('Ticker')[valid], ends[valid])
+
+    shares = _latest(wide, 'Diluted Average Shares', 'Basic Average Shares')
+    ebitda = _latest(wide, 'EBITDA')
+    ebitda = ebitda.fillna(_latest(wide, 'Operating Income') + _latest(wide, 'Depreciation and Amortization'))
+    debt = _latest(wide, 'Short-Term Debt').fillna(0) + _latest(wide, 'Long-Term Debt').fillna(0)
+    cash = _latest(wide, 'Cash and Cash Equivalents').fillna(0)
+
+    market_cap = prices * shares
+    enterprise_value = market_cap + debt - cash
+    with np.errstate(all='ignore'):
+        result = pd.DataFrame({
+            'Price': prices,
+            'Shares': shares,
+            'Market Cap': market_cap,
+            'Enterprise Value': enterprise_value,
+            'P/E': market_cap / _latest(wide, 'Net Income'),
+            'EV/EBITDA': enterprise_value / ebitda,
+            'EV/Revenue': enterprise_value / _latest(wide, 'Revenue'),
+        }, index=wide.index)
+    result = result.replace([np.inf, -np.inf], np.nan)
+    return result.reset_index()[MULTIPLE_COLUMNS]
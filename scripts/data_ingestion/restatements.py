@@ -0,0 +1,170 @@
+# scripts/data_ingestion/restatements.py
+
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from scripts.utilities.data_transformation_utils import get_data_paths, logger
+
+CHANGE_LOG_COLUMNS = [
+    'Pulled At', 'Ticker', 'Statement Type', 'Category', 'Period',
+    'Change', 'Previous', 'Current', 'Relative Change'
+]
+
+def _normalize_statement(df):
+    """Gives a fresh pull and a snapshot read back from CSV the same string labels and float values."""
+    df = df.copy()
+    df.index = df.index.astype(str).str.strip()
+    df.columns = [
+        str(pd.Timestamp(col).date()) if not pd.isna(pd.to_datetime(col, errors='coerce')) else str(col)
+        for col in df.columns
+    ]
+    df = df.apply(pd.to_numeric, errors='coerce')
+    return df[~df.index.duplicated(keep='first')].T.groupby(level=0).first().T
+
+def diff_statement(previous, current, statement_type=None, tolerance=1e-9):
+    """
+    Diffs two pulls of one statement cell by cell on aligned arrays.
+
+    Both frames (line items x periods) are reindexed onto the union of their labels and
+    compared as whole NumPy arrays. Only changed cells are returned:
+    'Restated' (value changed), 'Added' (new value) and 'Removed' (value disappeared).
+
+    Returns:
+        pd.DataFrame: Statement Type, Category, Period, Change, Previous, Current, Relative Change.
+    """
+    previous, current = _normalize_statement(previous), _normalize_statement(current)
+    rows = previous.index.union(current.index, sort=False)
+    columns = previous.columns.union(current.columns, sort=False)
+    before = previous.reindex(index=rows, columns=columns).to_numpy(dtype=float)
+    after = current.reindex(index=rows, columns=columns).to_numpy(dtype=float)
+
+    had, has = ~np.isnan(before), ~np.isnan(after)
+    restated = had & has & (np.abs(after - before) > tolerance * np.maximum(np.abs(before), 1.0))
+    added, removed = ~had & has, had & ~has
+
+    kinds = np.select([restated, added, removed], ['Restated', 'Added', 'Removed'], default='')
+    row_idx, col_idx = np.nonzero(kinds != '')
+    with np.errstate(all='ignore'):
+        relative = (after - before) / np.abs(before)
+    return pd.DataFrame({
+        'Statement Type': statement_type,
+        'Category': rows[row_idx],
+        'Period': columns[col_idx],
+        'Change': kinds[row_idx, col_idx],
+        'Previous': before[row_idx, col_idx],
+        'Current': after[row_idx, col_idx],
+        'Relative Change': relative[row_idx, col_idx],
+    })
+
+STATEMENT_TYPES = ['income_statement', 'balance_sheet', 'cash_flow']
+
+def snapshot_dir(ticker_symbol=None):
+    """raw/[<TICKER>/]committed: the raw statements as of the last fully processed pull."""
+    raw_data_dir, _ = get_data_paths(ticker_symbol)
+    return os.path.join(raw_data_dir, 'committed')
+
+def load_snapshot(ticker_symbol=None):
+    """Reads the last committed snapshot, keyed by statement type (empty before the first commit)."""
+    directory = snapshot_dir(ticker_symbol)
+    snapshot = {}
+    for statement_type in STATEMENT_TYPES:
+        path = os.path.join(directory, f'{statement_type}.csv')
+        if os.path.isfile(path):
+            snapshot[statement_type] = pd.read_csv(path, index_col=0)
+    return snapshot
+
+def commit_snapshot(ticker_symbol=None):
+    """
+    Marks the raw statements on disk as processed. Call only after every downstream
+    stage succeeded: until then, later pulls keep diffing against the previous commit
+    and stay material, so a failed run is rebuilt.
+    """
+    raw_data_dir, _ = get_data_paths(ticker_symbol)
+    directory = snapshot_dir(ticker_symbol)
+    os.makedirs(directory, exist_ok=True)
+    for statement_type in STATEMENT_TYPES:
+        source = os.path.join(raw_data_dir, f'{statement_type}.csv')
+        if os.path.isfile(source):
+            staging = os.path.join(directory, f'.{statement_type}.csv.tmp')
+            shutil.copyfile(source, staging)
+            os.replace(staging, os.path.join(directory, f'{statement_type}.csv'))
+    logger.info("Committed raw snapshot for %s.", ticker_symbol)
+
+def detect_changes(financial_data, ticker_symbol=None):
+    """
+    Diffs a fresh pull against the last committed snapshot.
+
+    Returns:
+        tuple[pd.DataFrame, bool]: (changed cells, whether a previous snapshot existed).
+    """
+    snapshot = load_snapshot(ticker_symbol)
+    changes = [
+        diff_statement(snapshot[statement_type], df, statement_type)
+        for statement_type, df in financial_data.items()
+        if statement_type in snapshot
+    ]
+    changes = [frame for frame in changes if not frame.empty]
+    log = pd.concat(changes, ignore_index=True) if changes else pd.DataFrame(columns=CHANGE_LOG_COLUMNS[2:])
+    log.insert(0, 'Ticker', ticker_symbol or 'DEFAULT')
+    log.insert(0, 'Pulled At', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    return log[CHANGE_LOG_COLUMNS], bool(snapshot)
+
+def is_material(changes, threshold=0.01):
+    """
+    True when the pull brings new periods or restates any value by more than
+    `threshold` (relative). Removed cells alone are not material.
+    """
+    if changes.empty:
+        return False
+    if (changes['Change'] == 'Added').any():
+        return True
+    restated = changes[changes['Change'] == 'Restated']
+    relative = restated['Relative Change'].abs().fillna(np.inf)
+    return bool((relative > threshold).any())
+
+def change_log_path(ticker_symbol=None):
+    """Per-ticker change log (raw/[<TICKER>/]change_log.csv); only that ticker's ingest task writes it."""
+    raw_data_dir, _ = get_data_paths(ticker_symbol)
+    return os.path.join(raw_data_dir, 'change_log.csv')
+
+def append_change_log(changes, log_path):
+    """Appends changed cells to a change log."""
+    if changes.empty:
+        return
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    changes.to_csv(log_path, mode='a', index=False, header=not os.path.isfile(log_path))
+
+def load_change_logs():
+    """Every ticker's change log in one frame."""
+    raw_data_dir, _ = get_data_paths()
+    paths = [os.path.join(raw_data_dir, 'change_log.csv')] + [
+        os.path.join(raw_data_dir, entry, 'change_log.csv') for entry in sorted(os.listdir(raw_data_dir))
+    ] if os.path.isdir(raw_data_dir) else []
+    frames = [pd.read_csv(path) for path in paths if os.path.isfile(path)]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=CHANGE_LOG_COLUMNS)
+
+def record_pull(financial_data, ticker_symbol=None, threshold=0.01, log_path=None):
+    """
+    Logs the restatements of a fresh pull against the last committed snapshot and
+    decides whether downstream stages need to run. See commit_snapshot.
+
+    Returns:
+        bool: True for a first pull or a material change.
+    """
+    changes, had_snapshot = detect_changes(financial_data, ticker_symbol)
+    append_change_log(changes, log_path or change_log_path(ticker_symbol))
+    restated = int((changes['Change'] == 'Restated').sum())
+    if not had_snapshot:
+        logger.info("No committed snapshot for %s; running the full pipeline.", ticker_symbol)
+        return True
+    material = is_material(changes, threshold)
+    logger.info(
+        "Pull for %s: %d restated, %d added, %d removed cells (%s).",
+        ticker_symbol, restated, int((changes['Change'] == 'Added').sum()),
+        int((changes['Change'] == 'Removed').sum()), 'material' if material else 'not material'
+    )
+    return material
@@ -0,0 +1,196 @@
+# scripts/data_ingestion/workbook_ingestion.py
+
+import os
+import re
+import glob
+from datetime import date, datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.utils.cell import range_boundaries
+
+from scripts.utilities.data_transformation_utils import (
+    get_data_paths,
+    standardize_labels,
+    logger
+)
+
+HARVEST_COLUMNS = ['Workbook', 'Sheet', 'Row Label', 'Kind', 'Category', 'Period', 'Projected', 'Amount']
+
+# Period labels such as 2009, "FY 2009", "FY2010E" or "2011A"
+_PERIOD_PATTERN = re.compile(r'^(?:FY\s*)?((?:19|20)\d{2})\s*([AE])?$', re.IGNORECASE)
+
+# Row labels that describe drivers rather than statement line items
+_ASSUMPTION_PATTERN = re.compile(r'%|/|\b(days|rate|growth|multiple|margin)\b', re.IGNORECASE)
+
+def parse_period(value):
+    """
+    Interprets a header cell as a fiscal period.
+
+    Returns:
+        tuple or None: (period label, projected flag), or None if the cell is not a period.
+    """
+    if isinstance(value, (datetime, date)):
+        return value.strftime('%Y-%m-%d'), False
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and float(value).is_integer() and 1900 <= value <= 2100:
+        return str(int(value)), False
+    if isinstance(value, str):
+        match = _PERIOD_PATTERN.match(value.strip())
+        if match:
+            return match.group(1), (match.group(2) or '').upper() == 'E'
+    return None
+
+def _clean_label(value):
+    return value.strip().rstrip(':').strip() if isinstance(value, str) else None
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _header_periods(row, min_periods=2):
+    """
+    Maps column positions to periods when a row looks like a period header, i.e. it holds
+    at least `min_periods` period cells and they outnumber the other non-empty cells.
+    """
+    periods = {i: parse_period(value) for i, value in enumerate(row)}
+    periods = {i: period for i, period in periods.items() if period is not None}
+    others = sum(1 for value in row if value not in (None, '')) - len(periods)
+    return periods if len(periods) >= min_periods and len(periods) > others else None
+
+def parse_sheet_rows(rows):
+    """
+    Extracts (label, period, projected, amount) records from the cell rows read from one sheet.
+
+    Handles the two layouts used by analyst models: periods across a header row with
+    line items down the rows (3-statement models), and line items across the first row
+    with periods down the first column (simple model outputs).
+    """
+    records = []
+    header = None
+    for row in rows:
+        periods = _header_periods(row)
+        if periods:
+            header = periods
+            continue
+        if header is None:
+            continue
+        first_period_column = min(header)
+        label = next((_clean_label(v) for v in row[:first_period_column] if _clean_label(v)), None)
+        if not label:
+            continue
+        for column, (period, projected) in header.items():
+            if column < len(row) and _is_number(row[column]):
+                records.append((label, period, projected, float(row[column])))
+
+    if records or not rows:
+        return records
+
+    # Transposed layout: line item labels in the first row, periods down the first column
+    labels = [_clean_label(value) for value in rows[0]]
+    for row in rows[1:]:
+        period = parse_period(row[0]) if row else None
+        if period is None:
+            continue
+        for column, label in enumerate(labels[1:], start=1):
+            if label and column < len(row) and _is_number(row[column]):
+                records.append((label, period[0], period[1], float(row[column])))
+    return records
+
+def read_workbook(path, sheets=None, cell_ranges=None):
+    """
+    Reads one workbook in read-only streaming mode and maps its line item rows to standard
+    categories by exact name or alias (standardize_labels); other rows keep their label.
+
+    Args:
+        path (str): Workbook path.
+        sheets (list[str], optional): Sheets to read; all sheets when omitted.
+        cell_ranges (dict, optional): Sheet name -> range such as "B22:M120" to restrict reading to.
+
+    Returns:
+        pd.DataFrame: Long records in the HARVEST_COLUMNS layout.
+    """
+    cell_ranges = cell_ranges or {}
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    frames = []
+    try:
+        for sheet_name in sheets or workbook.sheetnames:
+            if sheet_name not in workbook.sheetnames:
+                logger.warning("Sheet %s not found in %s", sheet_name, path)
+                continue
+            bounds = {}
+            if sheet_name in cell_ranges:
+                min_col, min_row, max_col, max_row = range_boundaries(cell_ranges[sheet_name])
+                bounds = {'min_col': min_col, 'min_row': min_row, 'max_col': max_col, 'max_row': max_row}
+            rows = [tuple(row) for row in workbook[sheet_name].iter_rows(values_only=True, **bounds)]
+            records = parse_sheet_rows(rows)
+            if not records:
+                continue
+
+            frame = pd.DataFrame(records, columns=['Row Label', 'Period', 'Projected', 'Amount'])
+            labels = frame['Row Label'].unique()
+            kinds = {label: 'Assumption' if _ASSUMPTION_PATTERN.search(label) else 'Line Item' for label in labels}
+            line_items = [label for label in labels if kinds[label] == 'Line Item']
+            mapping = dict(zip(labels, labels))
+            mapping.update(zip(line_items, standardize_labels(line_items)))
+            frame['Kind'] = frame['Row Label'].map(kinds)
+            frame['Category'] = frame['Row Label'].map(mapping)
+            frame['Workbook'] = os.path.basename(path)
+            frame['Sheet'] = sheet_name
+            frames.append(frame[HARVEST_COLUMNS])
+    finally:
+        workbook.close()
+
+    if not frames:
+        return pd.DataFrame(columns=HARVEST_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+def _read_workbook_safely(args):
+    path, sheets, cell_ranges = args
+    try:
+        return read_workbook(path, sheets, cell_ranges)
+    except Exception as e:
+        logger.error("Error reading workbook %s: %s", path, e)
+        return pd.DataFrame(columns=HARVEST_COLUMNS)
+
+def harvest_workbooks(paths, sheets=None, cell_ranges=None, max_workers=None):
+    """
+    Reads many workbooks in parallel worker processes.
+
+    Args:
+        paths (list[str] or str): Workbook paths, or a glob pattern such as "models/**/*.xlsx".
+
+    Returns:
+        pd.DataFrame: Records from every readable workbook.
+    """
+    if isinstance(paths, str):
+        paths = sorted(glob.glob(paths, recursive=True))
+    paths = [path for path in paths if not os.path.basename(path).startswith('~$')]
+    if not paths:
+        logger.warning("No workbooks to harvest.")
+        return pd.DataFrame(columns=HARVEST_COLUMNS)
+
+    tasks = [(path, sheets, cell_ranges) for path in paths]
+    if len(paths) == 1 or max_workers == 1:
+        frames = [_read_workbook_safely(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(_read_workbook_safely, tasks))
+
+    harvest = pd.concat(frames, ignore_index=True)
+    logger.info("Harvested %s records from %s workbooks.", len(harvest), len(paths))
+    return harvest
+
+def main(pattern=None):
+    """Harvests every workbook matching the pattern into processed/workbook_harvest.csv."""
+    _, processed_data_dir = get_data_paths()
+    if pattern is None:
+        project_root = os.path.dirname(os.path.dirname(processed_data_dir))
+        pattern = os.path.join(project_root, '**', '*.xlsx')
+    harvest = harvest_workbooks(pattern)
+    os.makedirs(processed_data_dir, exist_ok=True)
+    output_path = os.path.join(processed_data_dir, 'workbook_harvest.csv')
+    harvest.to_csv(output_path, index=False)
+    logger.info("Workbook harvest saved to %s", output_path)
+
+if __name__ == "__main__":
+    main()
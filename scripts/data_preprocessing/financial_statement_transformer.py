@@ -1,23 +1,27 @@
 import os
 import pandas as pd
+from scripts.data_preprocessing.transform_plans import DEFAULT_PROVIDER, plan_for, tag_labels
 from scripts.utilities.data_transformation_utils import (
     get_data_paths,
-    tag_line_item_indices,
     line_item_dict,
     logger
 )
+from scripts.utilities.logging_config import Lazy
 
 class FinancialStatementTransformer:
     """Base class for transforming financial statements with validation and testing entry points."""
 
-    def __init__(self, statement_type: str):
+    def __init__(self, statement_type: str, ticker: str = None, provider: str = DEFAULT_PROVIDER):
         self.statement_type = statement_type  # e.g., 'balance_sheet', 'income_statement', or 'cash_flow'
+        self.ticker = ticker  # Per-ticker data subfolders when set, shared data folders otherwise
+        self.provider = provider  # Selects the transform plan hooks (see transform_plans.py)
+        self.plan = None  # Compiled transform plan of the loaded file's layout
         self.raw_file, self.processed_file, self.tagged_file = self.get_file_paths()
         self.df = None  # Placeholder for the loaded DataFrame
 
     def get_file_paths(self):
         """Constructs file paths for raw, processed, and tagged files."""
-        raw_dir, processed_dir = get_data_paths()
+        raw_dir, processed_dir = get_data_paths(self.ticker)
         raw_file = os.path.join(raw_dir, f'{self.statement_type}.csv')
         processed_file = os.path.join(processed_dir, f'processed_{self.statement_type}.csv')
         tagged_file = os.path.join(processed_dir, f'tagged_{self.statement_type}.csv')
@@ -28,7 +32,8 @@ class FinancialStatementTransformer:
         if not os.path.exists(self.raw_file):
             raise FileNotFoundError(f"Raw file not found: {self.raw_file}")
         self.df = pd.read_csv(self.raw_file)
-        logger.info(f"Loaded {self.statement_type} data:\n{self.df.head()}")
+        logger.info("Loaded %s data (%d rows).", self.statement_type, len(self.df))
+        logger.debug("Loaded %s data:\n%s", self.statement_type, Lazy(self.df.head))
 
     def validate_data(self):
         """
@@ -48,7 +53,7 @@ class FinancialStatementTransformer:
         if numeric_cols.empty:
             raise ValueError(f"No numeric columns found in {self.statement_type} data for calculations.")
 
-        logger.info(f"{self.statement_type} data passed validation checks.")
+        logger.info("%s data passed validation checks.", self.statement_type)
 
     def transform_data(self):
         """Applies necessary transformations to the financial statement."""
@@ -59,61 +64,41 @@ class FinancialStatementTransformer:
             if self.df.index.name:
                 self.df.reset_index(inplace=True)
 
-            # Step 2: Set the first column as 'Category' if it's unnamed
-            if 'Unnamed: 0' in self.df.columns:
-                self.df.rename(columns={'Unnamed: 0': 'Category'}, inplace=True)
-            elif self.df.columns[0] != 'Category':
-                self.df.rename(columns={self.df.columns[0]: 'Category'}, inplace=True)
-
-            # Step 3: Sort columns (dates) in chronological order
-            date_columns = [col for col in self.df.columns if col != 'Category']
-            date_columns = sorted(date_columns, reverse=True)  # Sort dates in descending order
-            column_order = ['Category'] + date_columns
-            self.df = self.df[column_order]
-
-            # Step 4: Remove any rows where Category is NaN or empty
-            self.df = self.df[self.df['Category'].notna()]
-            self.df = self.df[self.df['Category'] != '']
-
-            # Step 5: Apply statement-specific transformations
-            if self.statement_type == 'income_statement':
-                # For income statement, keep natural order (Revenue at top, Net Income at bottom)
-                self.df = self.df.iloc[::-1]
-            elif self.statement_type == 'cash_flow':
-                # For cash flow, maintain operating/investing/financing sections
-                self.df = self.df.iloc[::-1]
-            elif self.statement_type == 'balance_sheet':
-                # For balance sheet, maintain Assets -> Liabilities -> Equity order
-                self.df = self.df.iloc[::-1]  # Reverse to get Assets at top
+            # Steps 2-5: Label column, date columns newest first, blank rows dropped and the
+            # statement's row order, all from the plan compiled for this header layout
+            self.plan = plan_for(self.df, self.statement_type, self.provider)
+            self.df = self.plan.apply(self.df)
 
             # Step 6: Replace any NaN values with empty string
             self.df = self.df.fillna('')
 
-            logger.info(f"Transformed {self.statement_type} data:\n{self.df.head()}")
+            logger.debug("Transformed %s data:\n%s", self.statement_type, Lazy(self.df.head))
 
         except Exception as e:
-            logger.error(f"Error during transformation of {self.statement_type}: {e}")
+            logger.error("Error during transformation of %s: %s", self.statement_type, e)
             raise
 
     def tag_data(self):
         """Tags line items using the predefined dictionary."""
-        if 'LineItem' not in self.df.columns:
-            logger.warning(f"Column 'LineItem' not found in {self.statement_type} data.")
+        if 'Category' not in self.df.columns:
+            logger.warning("Column 'Category' not found in %s data.", self.statement_type)
             return
-        self.df = tag_line_item_indices(self.df, line_item_dict)
-        logger.info(f"Tagged {self.statement_type} data:\n{self.df.head()}")
+        self.df = tag_labels(self.df, line_item_dict)
+        logger.debug("Tagged %s data:\n%s", self.statement_type, Lazy(self.df.head))
 
     def save_data(self, filename: str, data: pd.DataFrame):
         """Saves DataFrame to a specified file."""
-        _, processed_dir = get_data_paths()
+        _, processed_dir = get_data_paths(self.ticker)
+        os.makedirs(processed_dir, exist_ok=True)
         output_path = os.path.join(processed_dir, filename)
         data.to_csv(output_path, index=False)
-        logger.info(f"Saved data to {output_path}")
+        logger.info("Saved data to %s", output_path)
 
-    def transform(self):
+    def transform(self, raise_errors=False):
         """
         Executes the full transformation pipeline.
         Can be stopped or rerun from specific steps during testing.
+        Errors are logged, and re-raised when `raise_errors` is set (e.g. for batch retries).
         """
         try:
             self.load_data()
@@ -127,20 +112,22 @@ class FinancialStatementTransformer:
             self.save_data(f'tagged_{self.statement_type}.csv', self.df)
 
         except Exception as e:
-            logger.error(f"Error transforming {self.statement_type}: {e}")
+            logger.error("Error transforming %s: %s", self.statement_type, e)
+            if raise_errors:
+                raise
 
 # Child classes for specific financial statements
 class BalanceSheetTransformer(FinancialStatementTransformer):
-    def __init__(self):
-        super().__init__('balance_sheet')
+    def __init__(self, ticker=None):
+        super().__init__('balance_sheet', ticker)
 
 class IncomeStatementTransformer(FinancialStatementTransformer):
-    def __init__(self):
-        super().__init__('income_statement')
+    def __init__(self, ticker=None):
+        super().__init__('income_statement', ticker)
 
 class CashFlowTransformer(FinancialStatementTransformer):
-    def __init__(self):
-        super().__init__('cash_flow')
+    def __init__(self, ticker=None):
+        super().__init__('cash_flow', ticker)
 
 if __name__ == "__main__":
     # Entry points for testing transformations
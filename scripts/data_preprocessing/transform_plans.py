@@ -0,0 +1,89 @@
+# scripts/data_preprocessing/transform_plans.py
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from scripts.utilities.data_transformation_utils import line_item_dict, logger, standardize_labels
+from scripts.utilities.periods import sort_period_labels
+
+DEFAULT_PROVIDER = 'yfinance'
+
+# (provider, statement_type) -> row order hook: n_rows -> permutation of range(n_rows)
+ROW_ORDER_HOOKS = {}
+
+def register_row_order(provider, statement_types):
+    """
+    Registers the row order hook of a provider's statements, e.g.
+
+        @register_row_order('sec', ['balance_sheet'])
+        def keep_filed_order(n_rows):
+            return np.arange(n_rows)
+
+    Compiled plans are dropped so the next transform picks the hook up.
+    """
+    def decorator(hook):
+        for statement_type in statement_types:
+            ROW_ORDER_HOOKS[(provider, statement_type)] = hook
+        compile_plan.cache_clear()
+        return hook
+    return decorator
+
+class TransformPlan:
+    """
+    Everything transform_data derives from a raw file's header, computed once per layout:
+    which column holds the line item labels, the output column order as source positions,
+    and the row order hook. Row permutations are memoized on the plan, so files sharing a
+    layout reuse them.
+    """
+
+    def __init__(self, provider, statement_type, columns):
+        self.provider = provider
+        self.statement_type = statement_type
+        label_column = 'Unnamed: 0' if 'Unnamed: 0' in columns else columns[0]
+        period_columns = sort_period_labels([column for column in columns if column != label_column], descending=True)
+        self.output_columns = ['Category'] + period_columns
+        self.column_positions = np.array([columns.index(label_column)] + [columns.index(c) for c in period_columns])
+        self._row_order_hook = ROW_ORDER_HOOKS.get((provider, statement_type), keep_rows)
+        self._row_orders = {}
+
+    def row_order(self, n_rows):
+        if n_rows not in self._row_orders:
+            self._row_orders[n_rows] = self._row_order_hook(n_rows)
+        return self._row_orders[n_rows]
+
+    def apply(self, df):
+        """Reorders and renames columns, drops rows without a label and applies the row order in one take."""
+        labels = df.iloc[:, self.column_positions[0]]
+        kept = np.flatnonzero((labels.notna() & (labels != '')).to_numpy())
+        result = df.iloc[kept[self.row_order(len(kept))], self.column_positions]
+        result.columns = self.output_columns
+        return result
+
+@lru_cache(maxsize=1024)
+def compile_plan(provider, statement_type, columns):
+    """Compiles the plan of one header signature; `columns` is the raw header as a tuple."""
+    logger.debug("Compiling %s %s transform plan for %d columns.", provider, statement_type, len(columns))
+    return TransformPlan(provider, statement_type, list(columns))
+
+def plan_for(df, statement_type, provider=DEFAULT_PROVIDER):
+    """The compiled plan for a raw frame, keyed by provider, statement type and header."""
+    return compile_plan(provider, statement_type, tuple(df.columns))
+
+def tag_labels(df, dictionary=line_item_dict):
+    """tag_line_item_indices over the distinct labels of one statement; tagging does not depend on the plan."""
+    df['Category'] = df['Category'].fillna('Unknown')
+    codes, labels = pd.factorize(df['Category'])
+    df['Standardized Category'] = standardize_labels(labels, dictionary)[codes]
+    return df
+
+# Default provider hooks
+
+@register_row_order(DEFAULT_PROVIDER, ['balance_sheet', 'income_statement', 'cash_flow'])
+def reverse_rows(n_rows):
+    """yfinance lists line items bottom-up; reversing puts Revenue, Assets and operating cash flow first."""
+    return np.arange(n_rows)[::-1]
+
+def keep_rows(n_rows):
+    return np.arange(n_rows)
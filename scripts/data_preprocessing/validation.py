@@ -0,0 +1,216 @@
+# scripts/data_preprocessing/validation.py
+
+import os
+import numpy as np
+import pandas as pd
+from scripts.utilities.data_transformation_utils import get_data_paths, logger
+from scripts.utilities.line_item_taxonomy import check_subtotals
+
+VIOLATION_COLUMNS = ['Ticker', 'Statement Type', 'Period', 'Rule', 'Category', 'Value', 'Expected', 'Severity']
+
+# Accounting identities: rule name -> (total category, [(component category, sign), ...], relative tolerance)
+IDENTITY_RULES = {
+    'Balance Sheet Identity': (
+        'Total Assets',
+        [('Total Liabilities', 1), ('Total Equity', 1)],
+        0.01
+    ),
+    'Gross Profit Identity': (
+        'Gross Profit',
+        [('Revenue', 1), ('Cost of Goods Sold', -1)],
+        0.01
+    ),
+    'Free Cash Flow Identity': (
+        'Free Cash Flow',
+        [('Net Cash Provided by Operating Activities', 1), ('Capital Expenditure', 1)],
+        0.01
+    ),
+    'Net Change in Cash Identity': (
+        'Net Change in Cash',
+        [
+            ('Net Cash Provided by Operating Activities', 1),
+            ('Net Cash Used in Investing Activities', 1),
+            ('Net Cash Provided by Financing Activities', 1),
+        ],
+        0.05  # Leaves room for the effect of exchange rate changes
+    ),
+}
+
+# Expected sign of individual line items (yfinance reports cash outflows as negatives)
+SIGN_RULES = {
+    'Revenue': 'positive',
+    'Total Assets': 'positive',
+    'Cost of Goods Sold': 'non_negative',
+    'Cash and Cash Equivalents': 'non_negative',
+    'Accounts Receivable': 'non_negative',
+    'Inventory': 'non_negative',
+    'Accounts Payable': 'non_negative',
+    'Capital Expenditure': 'non_positive',
+    'Dividends Paid': 'non_positive',
+}
+
+_SIGN_CHECKS = {
+    'positive': lambda values: values > 0,
+    'non_negative': lambda values: values >= 0,
+    'non_positive': lambda values: values <= 0,
+}
+
+def _with_ticker(panel):
+    """Adds a default Ticker column to single-company frames such as combine_statements output."""
+    if 'Ticker' in panel.columns:
+        return panel
+    return panel.assign(Ticker='DEFAULT')
+
+def _violations(frame, rule, severity):
+    """Shapes a frame of failing rows into the violations layout."""
+    frame = frame.assign(Rule=rule, Severity=severity)
+    for column in VIOLATION_COLUMNS:
+        if column not in frame.columns:
+            frame[column] = np.nan
+    return frame[VIOLATION_COLUMNS]
+
+def check_identities(wide):
+    """Checks the accounting identities on a (Ticker, Period) x Category frame."""
+    results = []
+    for rule, (total, components, tolerance) in IDENTITY_RULES.items():
+        categories = [total] + [category for category, _ in components]
+        if not set(categories).issubset(wide.columns):
+            continue
+        values = wide[categories]
+        present = values.notna().all(axis=1)
+        expected = sum(values[category] * sign for category, sign in components)
+        actual = values[total]
+        failing = present & ((actual - expected).abs() > tolerance * np.maximum(actual.abs(), 1.0))
+        if failing.any():
+            frame = pd.DataFrame({
+                'Category': total,
+                'Value': actual[failing],
+                'Expected': expected[failing],
+            }).reset_index()
+            results.append(_violations(frame, rule, 'error'))
+    return results
+
+def check_taxonomy_subtotals(panel):
+    """
+    Flags provider subtotals that disagree with the rollup of their children in the line item taxonomy.
+    The taxonomy does not list every line item a provider may roll into a subtotal, so a mismatch
+    is a warning rather than an error and does not quarantine the ticker on its own.
+    """
+    identity_totals = {total for total, _, _ in IDENTITY_RULES.values()}
+    mismatches = check_subtotals(panel)
+    mismatches = mismatches[~mismatches['Category'].isin(identity_totals)]
+    if mismatches.empty:
+        return []
+    return [_violations(mismatches, 'Subtotal Mismatch', 'warning')]
+
+def check_signs(panel):
+    """Flags line items whose sign contradicts the reporting convention."""
+    results = []
+    for category, convention in SIGN_RULES.items():
+        rows = panel[panel['Category'] == category]
+        failing = rows[~_SIGN_CHECKS[convention](rows['Amount'])]
+        if not failing.empty:
+            results.append(_violations(failing.rename(columns={'Amount': 'Value'}), f'Sign Convention ({convention})', 'error'))
+    return results
+
+def check_period_gaps(panel, gap_factor=1.5):
+    """Flags periods that follow a gap wider than `gap_factor` times the ticker's usual reporting interval."""
+    periods = (
+        panel[['Ticker', 'Statement Type', 'Period Date']]
+        .dropna()
+        .drop_duplicates()
+        .sort_values(['Ticker', 'Statement Type', 'Period Date'])
+    )
+    groups = periods.groupby(['Ticker', 'Statement Type'])['Period Date']
+    step = groups.diff().dt.days
+    usual = step.groupby([periods['Ticker'], periods['Statement Type']]).transform('median')
+    failing = periods[step > gap_factor * usual]
+    if failing.empty:
+        return []
+    frame = failing.assign(
+        Period=failing['Period Date'].dt.strftime('%Y-%m-%d'),
+        Value=step[failing.index],
+        Expected=usual[failing.index]
+    )
+    return [_violations(frame, 'Period Gap (days)', 'warning')]
+
+def check_jumps(panel, z_threshold=3.5, min_periods=4, scale_floor=0.01):
+    """
+    Flags period-over-period changes whose robust z-score within the ticker's own history
+    exceeds the threshold. The score is 0.6745 * (change - median) / MAD, so a single jump
+    cannot inflate its own yardstick the way it does a mean and standard deviation; where
+    most changes are identical and the MAD is zero, 1.2533 * mean absolute deviation stands in.
+    The scale never drops below `scale_floor` times the line item's median absolute amount,
+    so rounding-sized wobbles in a steady series are not flagged.
+    """
+    rows = panel.dropna(subset=['Period Date']).sort_values(['Ticker', 'Statement Type', 'Category', 'Period Date'])
+    keys = [rows['Ticker'], rows['Statement Type'], rows['Category']]
+    change = rows.groupby(keys)['Amount'].diff()
+    grouped = change.groupby(keys)
+    median, count = grouped.transform('median'), grouped.transform('count')
+    deviation = (change - median).abs().groupby(keys)
+    scale = deviation.transform('median') / 0.6745
+    scale = scale.where(scale > 0, 1.2533 * deviation.transform('mean'))
+    scale = np.maximum(scale, scale_floor * rows['Amount'].abs().groupby(keys).transform('median'))
+    z_scores = (change - median) / scale.replace(0, np.nan)
+    failing = (count >= min_periods) & (z_scores.abs() > z_threshold)
+    if not failing.any():
+        return []
+    frame = rows[failing].assign(
+        Value=change[failing],
+        Expected=median[failing]
+    )
+    return [_violations(frame, 'Robust Z-Score Jump', 'warning')]
+
+def validate_panel(panel, z_threshold=3.5, gap_factor=1.5):
+    """
+    Runs every validation rule across all tickers and periods of a long statement panel.
+
+    Args:
+        panel (pd.DataFrame): Long rows with Category, Statement Type, Period, Amount and optionally Ticker.
+        z_threshold (float): Robust z-score above which a period-over-period change is flagged.
+        gap_factor (float): Multiple of the usual reporting interval treated as a gap.
+
+    Returns:
+        pd.DataFrame: One row per violation with the rule, the offending value and the expected value.
+    """
+    panel = _with_ticker(panel).copy()
+    panel['Amount'] = pd.to_numeric(panel['Amount'], errors='coerce')
+    panel = panel.dropna(subset=['Amount'])
+    panel['Period Date'] = pd.to_datetime(panel['Period'], errors='coerce')
+
+    # Identities can span statements (e.g. Free Cash Flow vs Capital Expenditure), so pivot per ticker-period
+    wide = panel.pivot_table(index=['Ticker', 'Period'], columns='Category', values='Amount', aggfunc='last')
+
+    results = check_identities(wide) + check_taxonomy_subtotals(panel) + check_signs(panel)
+    results += check_period_gaps(panel, gap_factor) + check_jumps(panel, z_threshold)
+    if not results:
+        return pd.DataFrame(columns=VIOLATION_COLUMNS)
+
+    violations = pd.concat(results, ignore_index=True)
+    logger.info("Validation found %s violations across %s tickers.", len(violations), violations['Ticker'].nunique())
+    return violations
+
+def quarantine(panel, violations, severity='error', max_violations=0):
+    """
+    Splits failing tickers out of the panel so the batch can continue with the rest.
+
+    Returns:
+        tuple[pd.DataFrame, list[str]]: The panel without quarantined tickers and the quarantined tickers.
+    """
+    panel = _with_ticker(panel)
+    failing = violations[violations['Severity'] == severity]
+    counts = failing.groupby('Ticker').size()
+    quarantined = sorted(counts[counts > max_violations].index)
+    if quarantined:
+        logger.warning("Quarantined %s tickers with %s violations: %s", len(quarantined), severity, quarantined)
+    return panel[~panel['Ticker'].isin(quarantined)], quarantined
+
+def save_violations(violations, output_path=None):
+    """Saves the violations table next to the processed statements."""
+    if output_path is None:
+        _, processed_data_dir = get_data_paths()
+        output_path = os.path.join(processed_data_dir, 'validation_violations.csv')
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    violations.to_csv(output_path, index=False)
+    logger.info("Validation violations saved to %s", output_path)
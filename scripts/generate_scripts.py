@@ -8,28 +8,61 @@ from scripts.utilities.data_transformation_utils import (
     prune_archives,
     logger
 )
-
-def load_historical_data():
+from scripts.data_preprocessing.validation import quarantine, validate_panel, save_violations
+from scripts.utilities.line_item_taxonomy import fill_subtotals
+from scripts.utilities.logging_config import Lazy
+from scripts.utilities.periods import latest_period_label
+from scripts.utilities.currency import BASE_CURRENCY, FxTable, convert_panel, load_reporting_currency
+
+# Line items used for baseline values, by statement type
+SELECTED_LINE_ITEMS = {
+    'Income Statement': [
+        'Revenue', 'Cost of Goods Sold', 'Gross Profit',
+        'Operating Expenses', 'Operating Income', 'Net Income'
+    ],
+    'Cash Flow Statement': [
+        'Net Cash Provided by Operating Activities',
+        'Net Cash Used in Investing Activities',
+        'Net Cash Used in Financing Activities',
+        'Free Cash Flow'
+    ],
+    'Balance Sheet': [
+        'Total Assets', 'Total Liabilities', 'Total Equity',
+        'Cash and Cash Equivalents', 'Accounts Receivable',
+        'Inventory', 'Accounts Payable',
+        'Allowance for Doubtful Accounts',
+        'Deferred Tax Assets', 'Deferred Tax Liabilities'
+    ]
+}
+
+def read_tagged_statement_file(path):
+    """Reads a tagged statement indexed by category, preferring the standardized category when tagged."""
+    df = pd.read_csv(path)
+    if 'Standardized Category' in df.columns:
+        df = df.drop(columns='Category').rename(columns={'Standardized Category': 'Category'})
+    return df.set_index('Category')
+
+def load_historical_data(ticker=None):
     """Loads the transformed and tagged financial statements."""
     try:
-        _, processed_data_dir = get_data_paths()
+        _, processed_data_dir = get_data_paths(ticker)
         balance_sheet_path = os.path.join(processed_data_dir, 'tagged_balance_sheet.csv')
         income_statement_path = os.path.join(processed_data_dir, 'tagged_income_statement.csv')
         cash_flow_path = os.path.join(processed_data_dir, 'tagged_cash_flow.csv')
 
         logger.info("Loading processed financial statements...")
 
-        balance_sheet = pd.read_csv(balance_sheet_path, index_col='Category')
-        income_statement = pd.read_csv(income_statement_path, index_col='Category')
-        cash_flow = pd.read_csv(cash_flow_path, index_col='Category')
+        balance_sheet = read_tagged_statement_file(balance_sheet_path)
+        income_statement = read_tagged_statement_file(income_statement_path)
+        cash_flow = read_tagged_statement_file(cash_flow_path)
 
         logger.info("Financial statements loaded successfully.")
         return balance_sheet, income_statement, cash_flow
     except FileNotFoundError as e:
-        logger.error(f"File not found: {e}")
+        logger.error("File not found: %s", e)
         raise
     except Exception as e:
-        logger.error(f"An error occurred while loading data: {e}")
+        logger.error("An error occurred while loading data: %s", e)
         raise
 
 def combine_statements(balance_sheet, income_statement, cash_flow):
@@ -67,46 +100,26 @@ def combine_statements(balance_sheet, income_statement, cash_flow):
         logger.info("Financial statements combined successfully.")
         return combined_df
     except Exception as e:
-        logger.error(f"An error occurred while combining statements: {e}")
+        logger.error("An error occurred while combining statements: %s", e)
         raise
 
 def calculate_baseline(dataframe):
     """Calculates baseline values for selected line items."""
     logger.info("Calculating baseline values for selected line items...")
     try:
-        selected_line_items = {
-            'Income Statement': [
-                'Revenue', 'Cost of Goods Sold', 'Gross Profit',
-                'Operating Expenses', 'Operating Income', 'Net Income'
-            ],
-            'Cash Flow Statement': [
-                'Net Cash Provided by Operating Activities',
-                'Net Cash Used in Investing Activities',
-                'Net Cash Used in Financing Activities',
-                'Free Cash Flow'
-            ],
-            'Balance Sheet': [
-                'Total Assets', 'Total Liabilities', 'Total Equity',
-                'Cash and Cash Equivalents', 'Accounts Receivable',
-                'Inventory', 'Accounts Payable',
-                'Allowance for Doubtful Accounts',
-                'Deferred Tax Assets', 'Deferred Tax Liabilities'
-            ]
-        }
-
         dataframe['Amount'] = pd.to_numeric(dataframe['Amount'], errors='coerce')
         dataframe = dataframe.dropna(subset=['Amount'])
 
         baseline_list = []
 
-        for statement_type, line_items in selected_line_items.items():
+        for statement_type, line_items in SELECTED_LINE_ITEMS.items():
             df_statement = dataframe[dataframe['Statement Type'] == statement_type]
             df_selected = df_statement[df_statement['Category'].isin(line_items)]
 
             if statement_type in ['Income Statement', 'Cash Flow Statement']:
                 baseline = df_selected.groupby(['Category'])['Amount'].mean().reset_index()
             elif statement_type == 'Balance Sheet':
-                latest_period = df_selected['Period'].max()
+                latest_period = latest_period_label(df_selected['Period'])
                 baseline = df_selected[df_selected['Period'] == latest_period][['Category', 'Amount']]
             else:
                 continue
@@ -117,10 +130,11 @@ def calculate_baseline(dataframe):
         baseline_combined = pd.concat(baseline_list, ignore_index=True)
         baseline_combined = baseline_combined[['Category', 'Statement Type', 'Amount']]
 
-        logger.info(f"Baseline calculated successfully:\n{baseline_combined.head()}")
+        logger.info("Baseline calculated successfully (%d line items).", len(baseline_combined))
+        logger.debug("Baseline values:\n%s", Lazy(baseline_combined.head))
         return baseline_combined
     except Exception as e:
-        logger.error(f"Error while calculating baseline: {e}")
+        logger.error("Error while calculating baseline: %s", e)
         raise
 
 def save_baseline_to_csv(baseline, output_path):
@@ -128,38 +142,73 @@ def save_baseline_to_csv(baseline, output_path):
     try:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         baseline.to_csv(output_path, index=False)
-        logger.info(f"Baseline saved to {output_path}")
+        logger.info("Baseline saved to %s", output_path)
     except Exception as e:
-        logger.error(f"Error while saving baseline: {e}")
+        logger.error("Error while saving baseline: %s", e)
         raise
 
-def main():
+def main(ticker=None):
+    """
+    Combines, converts and validates one ticker's tagged statements and saves its baseline.
+
+    Returns:
+        bool: False when error-severity violations quarantined the ticker; its baseline is
+        then not computed and any baseline from an earlier run is removed.
+    """
     try:
-        _, processed_data_dir = get_data_paths()
+        _, processed_data_dir = get_data_paths(ticker)
         archive_dir = os.path.join(processed_data_dir, 'archive')
 
         # Load the transformed and tagged financial statements before archiving
-        balance_sheet, income_statement, cash_flow = load_historical_data()
+        balance_sheet, income_statement, cash_flow = load_historical_data(ticker)
 
         # Archive old files after loading
         archive_files(processed_data_dir, archive_dir)
 
         # Combine the statements
         combined_df = combine_statements(balance_sheet, income_statement, cash_flow)
+
+        # Convert foreign filers to USD before anything is saved, validated or averaged
+        currency = load_reporting_currency(ticker)
+        if currency != BASE_CURRENCY:
+            try:
+                combined_df = convert_panel(combined_df, FxTable.from_csv(), currency=currency)
+                logger.info("Converted %s statements from %s to %s.", ticker, currency, BASE_CURRENCY)
+            except (FileNotFoundError, KeyError) as e:
+                logger.warning("Statements for %s stay in %s; no FX rates available: %s", ticker, currency, e)
+
+        # Fill subtotals the provider left out (e.g. Gross Profit) from their components
+        rows = len(combined_df)
+        combined_df = fill_subtotals(combined_df)
+        if len(combined_df) > rows:
+            logger.info("Filled %d missing subtotals for %s.", len(combined_df) - rows, ticker or 'DEFAULT')
+
         combined_filepath = os.path.join(processed_data_dir, 'combined_statements.csv')
         combined_df.to_csv(combined_filepath, index=False)
-        logger.info(f"Combined statements saved to {combined_filepath}")
+        logger.info("Combined statements saved to %s", combined_filepath)
+
+        # Validate the combined statements before they feed the baseline
+        violations = validate_panel(combined_df)
+        save_violations(violations, os.path.join(processed_data_dir, 'validation_violations.csv'))
+        _, quarantined = quarantine(combined_df, violations)
 
-        # Calculate the baseline
-        baseline_values = calculate_baseline(combined_df)
         baseline_filepath = os.path.join(processed_data_dir, 'baseline_values.csv')
-        save_baseline_to_csv(baseline_values, baseline_filepath)
+        if quarantined:
+            # Statements that break an accounting identity must not reach the model
+            logger.warning("Skipping the baseline for %s; see validation_violations.csv.", ticker or 'DEFAULT')
+            if os.path.isfile(baseline_filepath):
+                os.remove(baseline_filepath)
+        else:
+            # Calculate the baseline
+            baseline_values = calculate_baseline(combined_df)
+            save_baseline_to_csv(baseline_values, baseline_filepath)
 
         # Prune archives
-        prune_archives(archive_dir, retention_days=30, max_versions=5)
+        prune_archives(archive_dir, retention_days=30)
+        return not quarantined
 
     except Exception as e:
-        logger.error(f"An error occurred in the script: {e}")
+        logger.error("An error occurred in the script: %s", e)
         raise
 
 if __name__ == "__main__":
@@ -0,0 +1,204 @@
+# scripts/models/debt_schedule.py
+
+import numpy as np
+import pandas as pd
+from scripts.utilities.data_transformation_utils import logger
+from scripts.utilities.periods import sort_period_labels
+
+def tranche_schedule(opening_balances, amortization, rates):
+    """
+    Rolls the term tranches forward for every ticker and period at once.
+
+    Args:
+        opening_balances (np.ndarray): (tickers, tranches) balances at the start of the forecast.
+        amortization (np.ndarray): (tickers, tranches, periods) scheduled repayments.
+        rates (np.ndarray): (tickers, tranches) annual interest rates.
+
+    Returns:
+        tuple: (closing balances, repayments, interest on average balances), each (tickers, tranches, periods).
+    """
+    scheduled = np.cumsum(amortization, axis=2)
+    closing = np.maximum(opening_balances[:, :, None] - scheduled, 0.0)
+    opening = np.concatenate([opening_balances[:, :, None], closing[:, :, :-1]], axis=2)
+    repayments = opening - closing
+    interest = rates[:, :, None] * (opening + closing) / 2
+    return closing, repayments, interest
+
+def solve_debt_schedule(
+    cash_flow,
+    opening_cash,
+    minimum_cash,
+    tranche_balances,
+    tranche_amortization,
+    tranche_rates,
+    revolver_balance,
+    revolver_rate,
+    revolver_capacity,
+    cash_rate=0.0,
+    tax_rate=0.21,
+    tolerance=1e-6,
+    max_iterations=100
+):
+    """
+    Solves the interest <-> cash <-> revolver circularity for all tickers simultaneously.
+
+    Interest depends on average revolver and cash balances, which depend on the cash left
+    after interest. Starting from zero interest, every iteration rolls cash and the revolver
+    forward for all tickers at once (the only Python loop is over forecast periods) and
+    recomputes interest, until the largest change is below `tolerance`.
+
+    Args:
+        cash_flow (np.ndarray): (tickers, periods) cash flow before interest and debt service.
+        opening_cash, minimum_cash (np.ndarray): (tickers,) opening cash and minimum cash target.
+        tranche_balances, tranche_amortization, tranche_rates: See tranche_schedule.
+        revolver_balance, revolver_rate, revolver_capacity (np.ndarray): (tickers,) revolver terms.
+        cash_rate (float or np.ndarray): Interest earned on average cash.
+        tax_rate (float or np.ndarray): Tax rate applied to net interest for the cash impact.
+
+    Returns:
+        tuple[dict, pd.DataFrame]: (tickers, periods) result arrays and a per-ticker convergence report.
+    """
+    cash_flow = np.asarray(cash_flow, dtype=float)
+    n_tickers, n_periods = cash_flow.shape
+    as_vector = lambda value: np.broadcast_to(np.asarray(value, dtype=float), (n_tickers,))
+    opening_cash, minimum_cash = as_vector(opening_cash), as_vector(minimum_cash)
+    revolver_balance, revolver_rate = as_vector(revolver_balance), as_vector(revolver_rate)
+    revolver_capacity, cash_rate, tax_rate = as_vector(revolver_capacity), as_vector(cash_rate), as_vector(tax_rate)
+
+    tranche_closing, repayments, tranche_interest = tranche_schedule(
+        np.asarray(tranche_balances, dtype=float),
+        np.asarray(tranche_amortization, dtype=float),
+        np.asarray(tranche_rates, dtype=float)
+    )
+    mandatory_repayments = repayments.sum(axis=1)
+    term_interest = tranche_interest.sum(axis=1)
+
+    net_interest = np.zeros((n_tickers, n_periods))
+    iterations = np.zeros(n_tickers, dtype=int)
+    converged = np.zeros(n_tickers, dtype=bool)
+    delta = np.full(n_tickers, np.inf)
+
+    for iteration in range(1, max_iterations + 1):
+        cash = np.empty((n_tickers, n_periods))
+        revolver = np.empty((n_tickers, n_periods))
+        draws = np.empty((n_tickers, n_periods))
+        cash_open, revolver_open = opening_cash, revolver_balance
+        for period in range(n_periods):
+            cash_before = (
+                cash_open + cash_flow[:, period]
+                - net_interest[:, period] * (1 - tax_rate)
+                - mandatory_repayments[:, period]
+            )
+            draw = np.clip(minimum_cash - cash_before, -revolver_open, revolver_capacity - revolver_open)
+            draws[:, period] = draw
+            revolver[:, period] = revolver_open + draw
+            cash[:, period] = cash_before + draw
+            cash_open, revolver_open = cash[:, period], revolver[:, period]
+
+        revolver_opening = np.column_stack([revolver_balance, revolver[:, :-1]])
+        cash_opening = np.column_stack([opening_cash, cash[:, :-1]])
+        updated = (
+            term_interest
+            + revolver_rate[:, None] * (revolver_opening + revolver) / 2
+            - cash_rate[:, None] * (cash_opening + cash) / 2
+        )
+        delta = np.abs(updated - net_interest).max(axis=1)
+        net_interest = updated
+        iterations[~converged] = iteration
+        converged |= delta < tolerance
+        if converged.all():
+            break
+
+    if not converged.all():
+        logger.warning("Debt schedule did not converge for %s of %s tickers.", (~converged).sum(), n_tickers)
+
+    results = {
+        'Term Debt': tranche_closing.sum(axis=1),
+        'Mandatory Repayments': mandatory_repayments,
+        'Revolver Draw': draws,
+        'Revolver Balance': revolver,
+        'Cash': cash,
+        'Interest Expense': term_interest + revolver_rate[:, None] * (revolver_opening + revolver) / 2,
+        'Net Interest Expense': net_interest,
+    }
+    report = pd.DataFrame({'Iterations': iterations, 'Max Delta': delta, 'Converged': converged})
+    return results, report
+
+def debt_inputs_from_panel(panel, forecast_periods=5, long_term_years=5, default_rate=0.05, tax_rate=0.21,
+                           minimum_cash_ratio=0.5, revolver_capacity_ratio=0.25, working_capital=None):
+    """
+    Derives debt schedule inputs for every ticker from the tagged panel.
+
+    Short-Term Debt is repaid in the first forecast period, Long-Term Debt amortizes straight-line
+    over `long_term_years`, and both carry the implied rate (latest Interest Expense over total debt).
+    Cash flow before financing is the mean historical Free Cash Flow plus after-tax interest.
+    The minimum cash target and revolver capacity are set relative to the latest cash balance and total debt.
+    When `working_capital` (Ticker x forecast period Change in Working Capital, see working_capital.py)
+    is given, the historical mean Change in Working Capital inside Free Cash Flow is replaced by the projection.
+
+    Returns:
+        tuple[list[str], dict]: Ticker order and keyword arguments for solve_debt_schedule.
+    """
+    categories = ['Short-Term Debt', 'Long-Term Debt', 'Interest Expense', 'Cash and Cash Equivalents', 'Free Cash Flow']
+    rows = panel[panel['Category'].isin(categories)]
+    # Latest balances by chronological period, not by label text
+    order = {period: i for i, period in enumerate(sort_period_labels(rows['Period'].unique()))}
+    ordered = rows.iloc[np.argsort(rows['Period'].map(order).to_numpy(), kind='stable')]
+    latest = ordered.pivot_table(index='Ticker', columns='Category', values='Amount', aggfunc='last')
+    latest = latest.reindex(columns=categories).fillna(0.0)
+    mean_fcf = rows[rows['Category'] == 'Free Cash Flow'].groupby('Ticker')['Amount'].mean()
+
+    tickers = list(latest.index)
+    short_term = latest['Short-Term Debt'].to_numpy()
+    long_term = latest['Long-Term Debt'].to_numpy()
+    total_debt = short_term + long_term
+    interest = latest['Interest Expense'].abs().to_numpy()
+    rates = np.where(total_debt > 0, interest / np.where(total_debt > 0, total_debt, 1.0), default_rate)
+
+    amortization = np.zeros((len(tickers), 2, forecast_periods))
+    amortization[:, 0, 0] = short_term
+    amortization[:, 1, :min(long_term_years, forecast_periods)] = (long_term / long_term_years)[:, None]
+
+    cash = latest['Cash and Cash Equivalents'].to_numpy()
+    cash_flow = mean_fcf.reindex(tickers).fillna(0.0).to_numpy() + interest * (1 - tax_rate)
+    cash_flow = np.repeat(cash_flow[:, None], forecast_periods, axis=1)
+    if working_capital is not None:
+        historical = panel[panel['Category'] == 'Change in Working Capital'].groupby('Ticker')['Amount'].mean()
+        projected = working_capital.reindex(index=tickers).to_numpy(dtype=float)[:, :forecast_periods]
+        cash_flow[:, :projected.shape[1]] += np.nan_to_num(projected) - historical.reindex(tickers).fillna(0.0).to_numpy()[:, None]
+    inputs = {
+        'cash_flow': cash_flow,
+        'opening_cash': cash,
+        'minimum_cash': cash * minimum_cash_ratio,
+        'tranche_balances': np.column_stack([short_term, long_term]),
+        'tranche_amortization': amortization,
+        'tranche_rates': np.column_stack([rates, rates]),
+        'revolver_balance': np.zeros(len(tickers)),
+        'revolver_rate': rates + 0.01,
+        'revolver_capacity': total_debt * revolver_capacity_ratio,
+        'tax_rate': tax_rate,
+    }
+    return tickers, inputs
+
+def debt_schedule_frame(tickers, results, period_labels=None):
+    """Flattens the (tickers, periods) result arrays into a long Ticker/Period/Line Item frame."""
+    n_periods = next(iter(results.values())).shape[1]
+    period_labels = period_labels or [f'Year {i + 1}' for i in range(n_periods)]
+    frames = [
+        pd.DataFrame({
+            'Ticker': np.repeat(tickers, n_periods),
+            'Period': np.tile(period_labels, len(tickers)),
+            'Line Item': name,
+            'Amount': values.ravel(),
+        })
+        for name, values in results.items()
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+def generate_debt_schedule(panel, forecast_periods=5, **kwargs):
+    """Builds and solves the debt schedule for every ticker in the panel."""
+    tickers, inputs = debt_inputs_from_panel(panel, forecast_periods, **kwargs)
+    results, report = solve_debt_schedule(**inputs)
+    report.insert(0, 'Ticker', tickers)
+    logger.info("Debt schedule solved for %s tickers in at most %s iterations.", len(tickers), report['Iterations'].max())
+    return debt_schedule_frame(tickers, results), report
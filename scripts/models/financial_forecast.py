@@ -1,11 +1,30 @@
 import pandas as pd
+from scripts.models.time_series_forecast import METHODS, forecast_auto, forecast_series, infer_season_length
 
-def generate_forecast(financial_data, forecast_years=3):
+def generate_forecast(financial_data, forecast_years=3, method='mean'):
+    """
+    Projects every column of each statement frame (periods x line items, oldest first).
+
+    `method` is 'mean' (flat historical mean), 'linear', 'holt', 'seasonal' or 'auto'
+    (per line item choice by holdout error); all columns of a statement are fitted in one batch.
+    The season length is inferred from each frame's period index, and 'auto' only considers
+    'seasonal' for quarterly or monthly statements.
+    """
     forecast = {}
     for key, df in financial_data.items():
-        # Calculate mean values of each column to use for forecasts
-        forecast_values = df.mean(axis=0)
-        # Repeat the forecast values for the given number of forecast years
-        forecast[key] = pd.DataFrame([forecast_values] * forecast_years)
+        if method == 'mean':
+            # Calculate mean values of each column to use for forecasts
+            forecast_values = df.mean(axis=0)
+            # Repeat the forecast values for the given number of forecast years
+            forecast[key] = pd.DataFrame([forecast_values] * forecast_years)
+        else:
+            values = df.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float).T
+            season_length = infer_season_length(df.index)
+            if method == 'auto':
+                methods = [m for m in METHODS if m != 'seasonal' or season_length > 1]
+                projected, _ = forecast_auto(values, forecast_years, methods=methods, season_length=season_length)
+            else:
+                projected = forecast_series(values, forecast_years, method, season_length)
+            forecast[key] = pd.DataFrame(projected.T)
         forecast[key].columns = df.columns  # Ensure forecast DataFrame has the same columns as the original
     return forecast
@@ -0,0 +1,191 @@
+# scripts/models/scenario_graph.py
+
+from collections import deque
+
+import pandas as pd
+
+from scripts.generate_scripts import calculate_baseline
+from scripts.utilities.data_transformation_utils import logger
+from scripts.utilities.dynamic_assumptions import DEFAULT_THRESHOLDS, generate_scenarios
+
+# Named drivers of DEFAULT_THRESHOLDS and the baseline category each one scales
+THRESHOLD_CATEGORIES = {
+    "Revenue Growth Rate": "Revenue",
+    "COGS % Revenue": "Cost of Goods Sold",
+    "CapEx Growth Rate": "Capital Expenditure",
+}
+
+class ModelGraph:
+    """
+    Dependency graph of model nodes with memoized outputs.
+
+    Input nodes hold values; computed nodes hold a function of their dependencies'
+    values. Outputs are computed on first access and cached. Changing an input
+    invalidates only the nodes downstream of it, which are recomputed the next time
+    they are read.
+    """
+
+    def __init__(self):
+        self._inputs = {}
+        self._functions = {}
+        self._dependencies = {}
+        self._dependents = {}
+        self._cache = {}
+        self.computations = 0
+
+    def add_input(self, name, value):
+        self._inputs[name] = value
+        self._dependencies[name] = ()
+        self._dependents.setdefault(name, set())
+        return name
+
+    def add_node(self, name, func, dependencies):
+        """Adds a node computed as func(*values of dependencies)."""
+        for dependency in dependencies:
+            if dependency not in self._dependencies:
+                raise KeyError(f"Unknown dependency {dependency!r} for node {name!r}")
+            self._dependents[dependency].add(name)
+        self._functions[name] = func
+        self._dependencies[name] = tuple(dependencies)
+        self._dependents.setdefault(name, set())
+        return name
+
+    def __contains__(self, name):
+        return name in self._dependencies
+
+    def nodes(self, kind=None):
+        """Node names, optionally only tuple names whose first element is `kind`."""
+        return [name for name in self._dependencies if kind is None or (isinstance(name, tuple) and name[0] == kind)]
+
+    def downstream(self, name):
+        """Every node that depends on `name`, directly or transitively."""
+        seen, pending = set(), deque([name])
+        while pending:
+            for dependent in self._dependents[pending.popleft()]:
+                if dependent not in seen:
+                    seen.add(dependent)
+                    pending.append(dependent)
+        return seen
+
+    def set_input(self, name, value):
+        """Changes an input and invalidates its downstream cone; returns the invalidated nodes."""
+        if name not in self._inputs:
+            raise KeyError(f"{name!r} is not an input node")
+        self._inputs[name] = value
+        stale = self.downstream(name)
+        for node in stale:
+            self._cache.pop(node, None)
+        return stale
+
+    def get(self, name):
+        """Returns a node's value, computing any stale dependencies first."""
+        if name in self._inputs:
+            return self._inputs[name]
+        if name in self._cache:
+            return self._cache[name]
+
+        # Iterative post-order evaluation so deep graphs do not hit the recursion limit
+        stack = [(name, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node in self._inputs or node in self._cache:
+                continue
+            if expanded:
+                values = [self._inputs[d] if d in self._inputs else self._cache[d] for d in self._dependencies[node]]
+                self._cache[node] = self._functions[node](*values)
+                self.computations += 1
+                continue
+            stack.append((node, True))
+            stack.extend((d, False) for d in self._dependencies[node] if d not in self._inputs and d not in self._cache)
+        return self._cache[name]
+
+def _scenario(baseline, category, threshold):
+    amount = baseline.loc[baseline['Category'] == category, 'Amount']
+    if amount.empty:
+        return None
+    return generate_scenarios({category: float(amount.iloc[0])}, {category: threshold}).iloc[0].to_dict()
+
+def _forecast(baseline, growth, forecast_years):
+    """Grows the income statement and cash flow baselines at the ticker's growth rate."""
+    flows = baseline[baseline['Statement Type'] != 'Balance Sheet']
+    years = range(1, forecast_years + 1)
+    return pd.DataFrame(
+        {f'Year {year}': flows['Amount'].to_numpy() * (1 + growth) ** year for year in years},
+        index=flows['Category'].to_numpy()
+    )
+
+def _valuation(forecast, discount_rate):
+    """Present value of forecast Net Income."""
+    if 'Net Income' not in forecast.index:
+        return None
+    income = forecast.loc['Net Income']
+    income = income.iloc[0] if isinstance(income, pd.DataFrame) else income
+    return float(sum(value / (1 + discount_rate) ** (i + 1) for i, value in enumerate(income)))
+
+def build_scenario_graph(panel, thresholds=None, growth=None, discount_rate=0.1, forecast_years=3):
+    """
+    Builds the what-if graph for every ticker of a long panel:
+
+        assumptions ('threshold', category), ('growth', ticker), ('discount_rate',), ('forecast_years',)
+        -> drivers ('baseline', ticker)
+        -> forecast lines ('forecast', ticker)
+        -> statements ('scenario', ticker, category) and ('scenarios', ticker)
+        -> valuation ('valuation', ticker)
+
+    A threshold is shared by every ticker, so changing one recomputes that category's
+    scenario rows and nothing else; baselines are only recomputed if the panel changes.
+
+    Valid threshold keys are every key of DEFAULT_THRESHOLDS and `thresholds`, plus
+    every baseline category. A category named in THRESHOLD_CATEGORIES takes its
+    threshold from its driver (e.g. ('threshold', 'Revenue Growth Rate') for Revenue);
+    any other category has its own ('threshold', category) input, defaulting to 5%.
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    growth = growth or {}
+    graph = ModelGraph()
+    graph.add_input(('discount_rate',), discount_rate)
+    graph.add_input(('forecast_years',), forecast_years)
+
+    tickers = sorted(panel['Ticker'].unique()) if 'Ticker' in panel.columns else ['DEFAULT']
+    for ticker in tickers:
+        rows = panel[panel['Ticker'] == ticker] if 'Ticker' in panel.columns else panel
+        graph.add_input(('panel', ticker), rows.drop(columns='Ticker', errors='ignore'))
+        graph.add_input(('growth', ticker), growth.get(ticker, 0.0))
+        graph.add_node(('baseline', ticker), lambda frame: calculate_baseline(frame.copy()), [('panel', ticker)])
+        graph.add_node(('forecast', ticker), _forecast, [('baseline', ticker), ('growth', ticker), ('forecast_years',)])
+        graph.add_node(('valuation', ticker), _valuation, [('forecast', ticker), ('discount_rate',)])
+
+    baselines = {ticker: graph.get(('baseline', ticker)) for ticker in tickers}
+    categories = sorted({category for baseline in baselines.values() for category in baseline['Category']})
+    drivers = {category: driver for driver, category in THRESHOLD_CATEGORIES.items() if driver in thresholds}
+    for key in sorted({*thresholds, *(c for c in categories if c not in drivers)}):
+        graph.add_input(('threshold', key), thresholds.get(key, 0.05))
+    for ticker, baseline in baselines.items():
+        scenario_nodes = []
+        for category in baseline['Category'].unique():
+            node = graph.add_node(
+                ('scenario', ticker, category),
+                lambda base, threshold, category=category: _scenario(base, category, threshold),
+                [('baseline', ticker), ('threshold', drivers.get(category, category))]
+            )
+            scenario_nodes.append(node)
+        graph.add_node(
+            ('scenarios', ticker),
+            lambda *rows: pd.DataFrame([row for row in rows if row is not None]),
+            scenario_nodes
+        )
+    logger.info("Scenario graph built for %d tickers and %d categories.", len(tickers), len(categories))
+    return graph
+
+def what_if(graph, changes, outputs=('scenarios', 'valuation')):
+    """
+    Applies input changes (node name -> value) and returns the refreshed outputs of the
+    affected tickers only.
+
+    Returns:
+        dict: Output node name -> value for every invalidated output node.
+    """
+    stale = set()
+    for name, value in changes.items():
+        stale |= graph.set_input(name, value)
+    return {node: graph.get(node) for node in sorted(stale, key=str) if node[0] in outputs}
@@ -0,0 +1,199 @@
+# scripts/models/segment_model.py
+
+import os
+import numpy as np
+import pandas as pd
+
+from scripts.models.time_series_forecast import forecast_series
+from scripts.utilities.data_transformation_utils import get_data_paths, logger
+from scripts.utilities.periods import align_panel, normalize_periods
+
+SEGMENT_COLUMNS = ['Ticker', 'Segment Type', 'Segment', 'Period', 'Amount']
+SEGMENT_KEYS = ['Ticker', 'Segment Type', 'Segment']
+RECONCILING_SEGMENT = 'Unallocated'
+
+def default_segments_path():
+    raw_data_dir, _ = get_data_paths()
+    return os.path.join(os.path.dirname(raw_data_dir), 'segments.csv')
+
+def load_segments(path=None):
+    """
+    Reads segment revenue in the long SEGMENT_COLUMNS layout, e.g.
+    AAPL, Product, iPhone, 2023-09-30, 200583000000. Segment Type separates breakdowns
+    of the same revenue (Product, Geography) so each reconciles to Revenue on its own.
+    """
+    segments = pd.read_csv(path or default_segments_path())
+    segments['Amount'] = pd.to_numeric(segments['Amount'], errors='coerce')
+    return segments.dropna(subset=['Amount'])[SEGMENT_COLUMNS]
+
+def segments_from_harvest(harvest, ticker_symbol, labels, segment_type='Product'):
+    """
+    Picks segment rows out of a workbook harvest (see workbook_ingestion.harvest_workbooks).
+
+    Args:
+        labels (dict or list): Workbook row labels to keep, optionally mapped to segment names.
+    """
+    labels = labels if isinstance(labels, dict) else {label: label for label in labels}
+    rows = harvest[harvest['Row Label'].isin(labels) & ~harvest['Projected']]
+    return pd.DataFrame({
+        'Ticker': ticker_symbol,
+        'Segment Type': segment_type,
+        'Segment': rows['Row Label'].map(labels).to_numpy(),
+        'Period': rows['Period'].to_numpy(),
+        'Amount': rows['Amount'].to_numpy(),
+    })
+
+def revenue_from_panel(panel):
+    """Consolidated Revenue rows of a tagged panel, in the shape forecast_segments reconciles to."""
+    rows = panel[panel['Category'] == 'Revenue']
+    return rows.assign(Amount=pd.to_numeric(rows['Amount'], errors='coerce'))[['Ticker', 'Period', 'Amount']]
+
+def historical_growth(values, periods=3):
+    """Compound growth over the last `periods` steps of every row (0 where it cannot be computed)."""
+    observed = ~np.isnan(values)
+    last_index = values.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1)
+    first_index = np.maximum(last_index - periods, np.argmax(observed, axis=1))
+    rows = np.arange(len(values))
+    last, first = values[rows, last_index], values[rows, first_index]
+    steps = last_index - first_index
+    with np.errstate(all='ignore'):
+        growth = (last / first) ** (1.0 / steps) - 1
+    return np.where((steps > 0) & (first > 0) & (last > 0) & np.isfinite(growth), growth, 0.0)
+
+def forecast_segment_matrix(values, horizon, growth=None, method='growth'):
+    """
+    Forecasts every segment row at once.
+
+    method='growth' compounds each row's last value at its own driver (`growth`, one rate
+    per row, defaulting to historical CAGR); any time_series_forecast method is also accepted.
+    """
+    if method != 'growth':
+        return forecast_series(values, horizon, method)
+    growth = historical_growth(values) if growth is None else np.asarray(growth, dtype=float)
+    observed = ~np.isnan(values)
+    last_index = values.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1)
+    last = values[np.arange(len(values)), last_index]
+    return last[:, None] * (1 + growth[:, None]) ** np.arange(1, horizon + 1)
+
+def forecast_labels(values, periods, tickers, horizon):
+    """
+    (rows, horizon) forecast period labels, e.g. '2025E', counted from each ticker's own last
+    reported period so tickers with different fiscal calendars or stale data stay aligned.
+    Rows of a ticker without a parseable period fall back to 'Forecast <step>'.
+    """
+    observed = ~np.isnan(values)
+    last_index = values.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1)
+    last_period = pd.to_datetime(pd.Series(np.asarray(periods, dtype=object)[last_index]), errors='coerce')
+    last_year = last_period.dt.year.where(observed.any(axis=1)).groupby(np.asarray(tickers)).transform('max')
+    return np.array([
+        [f'{int(year) + step}E' if pd.notna(year) else f'Forecast {step}' for step in range(1, horizon + 1)]
+        for year in last_year
+    ], dtype=object)
+
+def _to_long(wide, projected):
+    long = wide.rename_axis(columns='Period').stack().rename('Amount').reset_index()
+    return long.dropna(subset=['Amount']).assign(Projected=projected)
+
+def _group_sums(values, codes, n_groups):
+    sums = np.zeros((n_groups, values.shape[1]))
+    np.add.at(sums, codes, np.nan_to_num(values))
+    return sums
+
+def revenue_forecast_targets(revenue_forecast, tickers, horizon):
+    """
+    (len(tickers), horizon) consolidated Revenue targets by forecast step.
+
+    `revenue_forecast` is a forecast_panel result (Ticker, Step, Forecast; only its Revenue
+    rows are used when it has a Category column). Missing tickers or steps are NaN.
+    """
+    rows = revenue_forecast
+    if 'Category' in rows.columns:
+        rows = rows[rows['Category'] == 'Revenue']
+    if rows.duplicated(['Ticker', 'Step']).any():
+        raise ValueError("revenue_forecast must hold one Revenue forecast per Ticker and Step")
+    targets = rows.pivot(index='Ticker', columns='Step', values='Forecast')
+    return targets.reindex(index=tickers, columns=range(1, horizon + 1)).to_numpy(dtype=float)
+
+def forecast_segments(segments, horizon=3, growth=None, method='growth', revenue=None, reconcile='bottom_up',
+                      revenue_forecast=None):
+    """
+    Forecasts all segments of all tickers in one segment x fiscal year matrix and reconciles
+    every (Ticker, Segment Type) breakdown to consolidated Revenue. Periods are aligned on
+    the canonical fiscal year grid (periods.align_panel), so historical rows carry
+    canonical labels such as '2023' whatever each ticker's year-end.
+
+    Args:
+        segments (pd.DataFrame): Long segment table (SEGMENT_COLUMNS).
+        horizon (int): Forecast periods.
+        growth (dict, optional): (ticker, segment type, segment) -> growth rate overriding the
+            historical CAGR.
+        method (str): 'growth' or a time_series_forecast method.
+        revenue (pd.DataFrame, optional): Consolidated Revenue with Ticker, Period, Amount; historical
+            periods gain an 'Unallocated' row for the gap between reported Revenue and the segment sum.
+        reconcile (str): 'bottom_up' (consolidated = sum of segments) or 'top_down'.
+        revenue_forecast (pd.DataFrame, optional): Consolidated forecast by step (forecast_panel
+            output); required for reconcile='top_down', which scales each breakdown's step-n
+            forecast to the ticker's step-n Revenue forecast.
+
+    Returns:
+        pd.DataFrame: SEGMENT_COLUMNS plus a Projected flag.
+    """
+    if reconcile == 'top_down' and revenue_forecast is None:
+        raise ValueError("reconcile='top_down' needs the consolidated revenue_forecast")
+
+    # Fiscal years on the canonical grid, so staggered year-ends share a column
+    segments = normalize_periods(segments, quarterly=False, keys=SEGMENT_KEYS)
+    series, grid, values = align_panel(segments, SEGMENT_KEYS)
+    periods = list(grid.periods)
+    keys = series.to_frame(index=False)
+
+    rates = None
+    if growth is not None:
+        default = historical_growth(values)
+        rates = np.array([growth.get(key, default[i]) for i, key in enumerate(series)])
+    projected = forecast_segment_matrix(values, horizon, rates, method)
+
+    labels = forecast_labels(values, periods, keys['Ticker'], horizon)
+
+    # One group per (Ticker, Segment Type); each breakdown must add up to Revenue separately
+    group_codes, groups = pd.MultiIndex.from_frame(keys[['Ticker', 'Segment Type']]).factorize()
+    groups = pd.MultiIndex.from_tuples(groups, names=['Ticker', 'Segment Type'])
+    tickers = groups.get_level_values('Ticker')
+    reconciling = []
+    if revenue is not None:
+        revenue = normalize_periods(revenue, quarterly=False, keys=('Ticker',))
+        consolidated = revenue.pivot_table(index='Ticker', columns='Canonical Period', values='Amount', aggfunc='last')
+        reported = consolidated.reindex(index=tickers, columns=periods).to_numpy(dtype=float)
+        gap = reported - _group_sums(values, group_codes, len(groups))
+        reconciling.append(pd.DataFrame(gap, index=groups, columns=periods))
+
+    if reconcile == 'top_down':
+        target = revenue_forecast_targets(revenue_forecast, tickers, horizon)
+        totals = _group_sums(projected, group_codes, len(groups))
+        with np.errstate(all='ignore'):
+            scale = np.where(np.isnan(target) | (totals == 0), 1.0, target / totals)
+        projected = projected * scale[group_codes]
+
+    frames = [
+        _to_long(pd.DataFrame(values, index=series, columns=periods), projected=False),
+        keys.loc[keys.index.repeat(horizon)].assign(
+            Period=labels.ravel(), Amount=projected.ravel(), Projected=True
+        ),
+    ]
+    for gap in reconciling:
+        unallocated = _to_long(gap, projected=False)
+        frames.append(unallocated[unallocated['Amount'].abs() > 0.5].assign(Segment=RECONCILING_SEGMENT))
+
+    result = pd.concat(frames, ignore_index=True)
+    logger.info("Forecast %d segments across %d breakdowns.", len(values), len(groups))
+    return result[SEGMENT_COLUMNS + ['Projected']]
+
+def consolidated_revenue(segment_forecast, segment_type=None):
+    """Revenue per ticker and period as the sum of one breakdown's segments (bottom-up)."""
+    rows = segment_forecast
+    if segment_type is not None:
+        rows = rows[rows['Segment Type'] == segment_type]
+    else:
+        first_type = rows.groupby('Ticker')['Segment Type'].transform('first')
+        rows = rows[rows['Segment Type'] == first_type]
+    return rows.groupby(['Ticker', 'Period', 'Projected'], as_index=False)['Amount'].sum()
@@ -0,0 +1,266 @@
+# scripts/models/time_series_forecast.py
+
+import warnings
+import numpy as np
+import pandas as pd
+from scripts.utilities.data_transformation_utils import logger
+from scripts.utilities.periods import align_panel, normalize_periods
+
+# Every series is one row of a (series, periods) matrix; NaN marks a missing observation.
+# The smoothing fits search these grids for all series at once.
+ALPHAS = np.array([0.1, 0.3, 0.5, 0.7, 0.9])
+BETAS = np.array([0.05, 0.1, 0.2, 0.4])
+GAMMAS = np.array([0.05, 0.15, 0.3])
+
+METHODS = ['mean', 'linear', 'holt', 'seasonal']
+
+def nanmean(values, axis):
+    """np.nanmean without the all-NaN slice warnings; empty rows stay NaN."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        return np.nanmean(values, axis=axis)
+
+def _grid(*axes):
+    """Cartesian product of parameter axes as (grid size, 1) columns that broadcast over series."""
+    mesh = np.meshgrid(*axes, indexing='ij')
+    return [axis.reshape(-1, 1) for axis in mesh]
+
+def forecast_mean(values, horizon):
+    """The historical mean of every row, repeated over the horizon."""
+    return np.repeat(nanmean(values, axis=1)[:, None], horizon, axis=1)
+
+def forecast_linear(values, horizon):
+    """Least-squares linear trend per row, fitted in closed form on the observed points only."""
+    n_periods = values.shape[1]
+    observed = ~np.isnan(values)
+    t = np.where(observed, np.arange(n_periods), 0.0)
+    y = np.where(observed, values, 0.0)
+    n = observed.sum(axis=1)
+    sum_t, sum_y = t.sum(axis=1), y.sum(axis=1)
+    denominator = n * (t * t).sum(axis=1) - sum_t ** 2
+    with np.errstate(all='ignore'):
+        slope = np.where(denominator > 0, (n * (t * y).sum(axis=1) - sum_t * sum_y) / denominator, 0.0)
+        intercept = (sum_y - slope * sum_t) / n
+    steps = np.arange(n_periods, n_periods + horizon)
+    return intercept[:, None] + slope[:, None] * steps
+
+def _smooth(values, alphas, betas, gammas=None, season_length=None):
+    """
+    Runs additive Holt (or Holt-Winters when `gammas` is given) recursions for every
+    parameter combination and every row in one pass over the periods.
+
+    Level starts at a row's first observation and trend at its first difference; missing
+    observations carry the one-step prediction forward. Seasonal indices are keyed by the
+    column's position in the season, so rows on a shared period grid stay in phase.
+
+    Returns:
+        tuple: (level, trend, season, sse) with a leading parameter-grid axis.
+    """
+    n_grid, (n_series, n_periods) = len(alphas), values.shape
+    level = np.full((n_grid, n_series), np.nan)
+    trend = np.full((n_grid, n_series), np.nan)
+    sse = np.zeros((n_grid, n_series))
+
+    seasonal = gammas is not None
+    if seasonal:
+        overall = nanmean(values, axis=1)
+        phases = [nanmean(values[:, p::season_length], axis=1) - overall for p in range(season_length)]
+        season = np.repeat(np.nan_to_num(np.column_stack(phases))[None], n_grid, axis=0)
+    else:
+        season = np.zeros((n_grid, n_series, 1))
+
+    for t in range(n_periods):
+        phase = t % season_length if seasonal else 0
+        s = season[:, :, phase]
+        y = values[:, t]
+        observed = ~np.isnan(y)
+        adjusted = y - s
+
+        started = ~np.isnan(level)
+        trending = ~np.isnan(trend)
+        prediction = level + np.where(trending, trend, 0.0)
+        error = y - (prediction + s)
+
+        scored = started & trending & observed
+        sse += np.where(scored, error ** 2, 0.0)
+
+        smoothed_level = alphas * adjusted + (1 - alphas) * prediction
+        smoothed_trend = betas * (smoothed_level - level) + (1 - betas) * np.where(trending, trend, 0.0)
+        new_level = np.where(
+            ~started | ~trending, np.where(observed, adjusted, level),
+            np.where(observed, smoothed_level, prediction)
+        )
+        new_trend = np.where(
+            started & ~trending, np.where(observed, adjusted - level, np.nan),
+            np.where(started & observed, smoothed_trend, trend)
+        )
+        if seasonal:
+            updated = gammas * (y - new_level) + (1 - gammas) * s
+            season[:, :, phase] = np.where(started & observed, updated, s)
+        level, trend = new_level, new_trend
+
+    return level, np.nan_to_num(trend), season, sse
+
+def _best_fit(sse):
+    """Index of the parameter combination with the lowest in-sample error, per row."""
+    return np.argmin(np.where(np.isnan(sse), np.inf, sse), axis=0)
+
+def forecast_holt(values, horizon, alphas=ALPHAS, betas=BETAS):
+    """Holt linear exponential smoothing, with parameters chosen per row by one-step SSE."""
+    alpha, beta = _grid(alphas, betas)
+    level, trend, _, sse = _smooth(values, alpha, beta)
+    best = _best_fit(sse)
+    rows = np.arange(values.shape[0])
+    level, trend = level[best, rows], trend[best, rows]
+    return level[:, None] + trend[:, None] * np.arange(1, horizon + 1)
+
+def forecast_seasonal(values, horizon, season_length=4, alphas=ALPHAS, betas=BETAS, gammas=GAMMAS):
+    """
+    Additive Holt-Winters (seasonal ETS) for quarterly data. Rows with fewer than two full
+    seasons of observations fall back to Holt.
+    """
+    alpha, beta, gamma = _grid(alphas, betas, gammas)
+    level, trend, season, sse = _smooth(values, alpha, beta, gamma, season_length)
+    best = _best_fit(sse)
+    rows = np.arange(values.shape[0])
+    level, trend, season = level[best, rows], trend[best, rows], season[best, rows]
+
+    n_periods = values.shape[1]
+    steps = np.arange(1, horizon + 1)
+    phases = (n_periods - 1 + steps) % season_length
+    forecast = level[:, None] + trend[:, None] * steps + season[:, phases]
+
+    short = (~np.isnan(values)).sum(axis=1) < 2 * season_length
+    if short.any():
+        forecast[short] = forecast_holt(values[short], horizon)
+    return forecast
+
+def forecast_series(values, horizon, method='linear', season_length=4):
+    """
+    Forecasts every row of a (series, periods) matrix with one method.
+
+    Args:
+        values (np.ndarray): Historical values, oldest period first; NaN where missing.
+        horizon (int): Number of periods to project.
+        method (str): One of METHODS.
+        season_length (int): Periods per year for the seasonal method.
+
+    Returns:
+        np.ndarray: (series, horizon) forecasts.
+    """
+    values = np.asarray(values, dtype=float)
+    if method == 'mean':
+        return forecast_mean(values, horizon)
+    if method == 'linear':
+        return forecast_linear(values, horizon)
+    if method == 'holt':
+        return forecast_holt(values, horizon)
+    if method == 'seasonal':
+        return forecast_seasonal(values, horizon, season_length)
+    raise ValueError(f"Unknown forecast method: {method}")
+
+def select_models(values, holdout=2, methods=None, season_length=4):
+    """
+    Chooses a method per row by mean absolute percentage error on the last `holdout` periods.
+
+    Every candidate is fitted on the truncated matrix in one batched call, so selection costs
+    one fit per method regardless of the number of series. Rows without observations in the
+    holdout keep the first candidate.
+
+    Returns:
+        tuple[np.ndarray, pd.DataFrame]: Chosen method per row and the (series x method) holdout errors.
+    """
+    methods = methods or METHODS
+    values = np.asarray(values, dtype=float)
+    train, actual = values[:, :-holdout], values[:, -holdout:]
+    errors = np.empty((values.shape[0], len(methods)))
+    for i, method in enumerate(methods):
+        predicted = forecast_series(train, holdout, method, season_length)
+        with np.errstate(all='ignore'):
+            ape = np.abs(predicted - actual) / np.abs(actual)
+        errors[:, i] = nanmean(np.where(np.isfinite(ape), ape, np.nan), axis=1)
+    choice = np.argmin(np.where(np.isnan(errors), np.inf, errors), axis=1)
+    return np.array(methods, dtype=object)[choice], pd.DataFrame(errors, columns=methods)
+
+def forecast_auto(values, horizon, holdout=2, methods=None, season_length=4):
+    """Forecasts every row with the method that scored best on the holdout."""
+    methods = methods or METHODS
+    values = np.asarray(values, dtype=float)
+    if values.shape[1] <= holdout + 2:
+        return forecast_mean(values, horizon), np.full(values.shape[0], 'mean', dtype=object)
+    chosen, _ = select_models(values, holdout, methods, season_length)
+    forecast = np.empty((values.shape[0], horizon))
+    for method in methods:
+        rows = chosen == method
+        if rows.any():
+            forecast[rows] = forecast_series(values[rows], horizon, method, season_length)
+    return forecast, chosen
+
+def infer_season_length(periods):
+    """4 for quarterly period labels, 12 for monthly, otherwise 1 (annual)."""
+    dates = pd.to_datetime(pd.Series(periods), errors='coerce').dropna().sort_values()
+    if len(dates) < 2:
+        return 1
+    spacing = dates.diff().dt.days.median()
+    return 12 if spacing < 45 else 4 if spacing < 135 else 1
+
+def align_to_last_observation(values):
+    """
+    Shifts every row right so its last observation sits in the last column. Column -k is
+    then each series' own k-th latest period, whatever calendar its company reports on.
+    """
+    values = np.asarray(values, dtype=float)
+    n_periods = values.shape[1]
+    # Trailing gap of every row; all-NaN rows stay where they are
+    shift = np.argmax(~np.isnan(values[:, ::-1]), axis=1)
+    source = np.arange(n_periods) - shift[:, None]
+    rows = np.arange(len(values))[:, None]
+    return np.where(source >= 0, values[rows, np.maximum(source, 0)], np.nan)
+
+def aligned_panel_groups(panel, keys=('Ticker', 'Statement Type', 'Category')):
+    """
+    Splits a long panel by each ticker's reporting frequency and aligns every group on its
+    canonical period grid (periods.align_panel), so staggered fiscal year-ends share columns.
+
+    Yields:
+        tuple[int, pd.MultiIndex, PeriodGrid, np.ndarray]: Season length, series keys,
+        period grid and (series x period) values of one frequency group.
+    """
+    panel = normalize_periods(panel)
+    # Every category repeats the ticker's period ends; only the distinct dates are spaced
+    season_lengths = panel.groupby('Ticker')['Period End'].transform(lambda ends: infer_season_length(ends.unique()))
+    for season_length, rows in panel.groupby(season_lengths):
+        series, grid, values = align_panel(rows, keys)
+        yield int(season_length), series, grid, values
+
+def forecast_panel(panel, horizon=3, method='auto', holdout=2):
+    """
+    Forecasts every Ticker x Category series of a long panel, one batched fit per reporting
+    frequency. Series are aligned on the canonical period grid and then on their own last
+    observation, so Step 1 is each series' next period and the holdout always holds data.
+
+    Returns:
+        pd.DataFrame: Ticker, Statement Type, Category, Step, Method and Forecast columns.
+    """
+    keys = ['Ticker', 'Statement Type', 'Category']
+    frames = []
+    for season_length, series, _, values in aligned_panel_groups(panel, keys):
+        values = align_to_last_observation(values)
+        methods = [m for m in METHODS if m != 'seasonal' or season_length > 1]
+        if method == 'auto':
+            forecast, chosen = forecast_auto(values, horizon, holdout, methods, season_length)
+        else:
+            forecast = forecast_series(values, horizon, method, season_length)
+            chosen = np.full(len(values), method, dtype=object)
+
+        result = pd.DataFrame(np.repeat(series.to_frame(index=False).to_numpy(), horizon, axis=0), columns=keys)
+        result['Step'] = np.tile(np.arange(1, horizon + 1), len(values))
+        result['Method'] = np.repeat(chosen, horizon)
+        result['Forecast'] = forecast.ravel()
+        frames.append(result)
+
+    if not frames:
+        return pd.DataFrame(columns=keys + ['Step', 'Method', 'Forecast'])
+    result = pd.concat(frames, ignore_index=True)
+    logger.info("Forecast %d series over %d periods (%s).", len(result) // horizon, horizon, method)
+    return result
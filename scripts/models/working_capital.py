@@ -0,0 +1,151 @@
+# scripts/models/working_capital.py
+
+import numpy as np
+import pandas as pd
+
+from scripts.models.debt_schedule import debt_schedule_frame
+from scripts.models.time_series_forecast import aligned_panel_groups, forecast_series, nanmean
+from scripts.utilities.data_transformation_utils import logger
+
+WORKING_CAPITAL_CATEGORIES = ['Revenue', 'Cost of Goods Sold', 'Accounts Receivable', 'Inventory', 'Accounts Payable']
+DRIVER_COLUMNS = ['Ticker', 'DSO', 'DIO', 'DPO', 'Cash Conversion Cycle']
+
+def working_capital_cubes(panel):
+    """
+    Scatters the working-capital categories of every ticker into one
+    (tickers, categories, periods) array per reporting frequency, oldest period first.
+
+    Periods are aligned on the canonical grid and each ticker's slab is then shifted so its
+    latest reported period is the last column: column -k is every ticker's own k-th latest
+    period, whatever its fiscal year-end and however stale its data.
+
+    Yields:
+        tuple[int, list[str], np.ndarray]: Season length, tickers and the values
+        (NaN where a ticker does not report a category or period).
+    """
+    rows = panel[panel['Category'].isin(WORKING_CAPITAL_CATEGORIES)]
+    for season_length, series, grid, values in aligned_panel_groups(rows, keys=('Ticker', 'Category')):
+        tickers = sorted(series.get_level_values('Ticker').unique())
+        ticker_codes = pd.Index(tickers).get_indexer(series.get_level_values('Ticker'))
+        category_codes = pd.Index(WORKING_CAPITAL_CATEGORIES).get_indexer(series.get_level_values('Category'))
+
+        cube = np.full((len(tickers), len(WORKING_CAPITAL_CATEGORIES), len(grid)), np.nan)
+        cube[ticker_codes, category_codes] = values
+
+        # Shift whole slabs so a ticker's categories stay aligned with each other
+        shift = np.argmax(~np.isnan(cube).all(axis=1)[:, ::-1], axis=1)
+        source = np.arange(len(grid)) - shift[:, None]
+        shifted = np.take_along_axis(cube, np.broadcast_to(np.maximum(source, 0)[:, None, :], cube.shape), axis=2)
+        yield season_length, tickers, np.where((source >= 0)[:, None, :], shifted, np.nan)
+
+def days_drivers(receivables, inventory, payables, revenue, cogs, days_in_period=365.0):
+    """
+    DSO, DIO and DPO from period-end balances for every ticker and period at once;
+    inputs are broadcastable arrays and periods without a positive flow give NaN.
+    """
+    with np.errstate(all='ignore'):
+        revenue = np.where(revenue > 0, revenue, np.nan)
+        cogs = np.where(np.abs(cogs) > 0, np.abs(cogs), np.nan)
+        dso = receivables / revenue * days_in_period
+        dio = inventory / cogs * days_in_period
+        dpo = payables / cogs * days_in_period
+    return dso, dio, dpo
+
+def project_balances(dso, dio, dpo, revenue, cogs, days_in_period=365.0):
+    """
+    Projects receivables, inventory and payables from forecast flows.
+
+    Args:
+        dso, dio, dpo (np.ndarray): (tickers,) or (tickers, periods) day drivers.
+        revenue, cogs (np.ndarray): (tickers, periods) forecast flows.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: (tickers, periods) balances.
+    """
+    as_matrix = lambda driver: np.asarray(driver, dtype=float).reshape(len(revenue), -1)
+    cogs = np.abs(cogs)
+    return (
+        as_matrix(dso) * revenue / days_in_period,
+        as_matrix(dio) * cogs / days_in_period,
+        as_matrix(dpo) * cogs / days_in_period,
+    )
+
+def working_capital_change(opening_net_working_capital, receivables, inventory, payables):
+    """
+    Cash flow effect of working capital per period: the negated change in
+    receivables + inventory - payables, following the cash flow statement's sign
+    (an increase in working capital uses cash).
+    """
+    net_working_capital = receivables + inventory - payables
+    previous = np.concatenate([opening_net_working_capital[:, None], net_working_capital[:, :-1]], axis=1)
+    return previous - net_working_capital
+
+def generate_working_capital(panel, horizon=3, method='linear', lookback=3, revenue=None, cogs=None):
+    """
+    Derives DSO/DIO/DPO for every ticker in the panel, projects the balances from
+    forecast Revenue and Cost of Goods Sold, and computes Change in Working Capital.
+
+    Drivers are the mean of each ticker's last `lookback` periods' days. Flows are forecast
+    in one batch per reporting frequency with time_series_forecast `method` unless `revenue`
+    and `cogs` frames (Ticker index, forecast steps 1..horizon as columns) are supplied.
+    Missing balances are treated as zero so a ticker without inventory still projects.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: (long Ticker/Period/Line Item/Amount schedule, drivers per ticker).
+    """
+    schedules, driver_frames = [], []
+    for season_length, tickers, cube in working_capital_cubes(panel):
+        flows_revenue, flows_cogs, receivables, inventory, payables = (cube[:, i] for i in range(cube.shape[1]))
+        days_in_period = 365.0 / season_length
+
+        dso, dio, dpo = days_drivers(receivables, inventory, payables, flows_revenue, flows_cogs, days_in_period)
+        recent = slice(max(cube.shape[2] - lookback, 0), None)
+        drivers = np.nan_to_num(np.stack([nanmean(d[:, recent], axis=1) for d in (dso, dio, dpo)]))
+
+        steps = range(1, horizon + 1)
+        if revenue is None:
+            group_revenue = forecast_series(flows_revenue, horizon, method, season_length)
+        else:
+            group_revenue = revenue.reindex(index=tickers, columns=steps).to_numpy(dtype=float)
+        if cogs is None:
+            group_cogs = forecast_series(np.abs(flows_cogs), horizon, method, season_length)
+        else:
+            group_cogs = cogs.reindex(index=tickers, columns=steps).to_numpy(dtype=float)
+        group_revenue, group_cogs = np.nan_to_num(group_revenue), np.nan_to_num(group_cogs)
+        projected = project_balances(*drivers, group_revenue, group_cogs, days_in_period)
+
+        # Opening position is the latest reported balance of each item
+        observed = ~np.isnan(cube[:, 2:])
+        last_index = cube.shape[2] - 1 - np.argmax(observed[:, :, ::-1], axis=2)
+        latest = np.take_along_axis(cube[:, 2:], last_index[:, :, None], axis=2)[:, :, 0]
+        opening = np.where(observed.any(axis=2), latest, 0.0)
+        change = working_capital_change(opening[:, 0] + opening[:, 1] - opening[:, 2], *projected)
+
+        results = {
+            'Revenue': group_revenue,
+            'Cost of Goods Sold': group_cogs,
+            'Accounts Receivable': projected[0],
+            'Inventory': projected[1],
+            'Accounts Payable': projected[2],
+            'Change in Working Capital': change,
+        }
+        unit = 'Year' if season_length == 1 else 'Quarter' if season_length == 4 else 'Month'
+        schedules.append(debt_schedule_frame(tickers, results, [f'{unit} {step}' for step in steps]))
+        driver_frames.append(pd.DataFrame({
+            'Ticker': tickers,
+            'DSO': drivers[0],
+            'DIO': drivers[1],
+            'DPO': drivers[2],
+            'Cash Conversion Cycle': drivers[0] + drivers[1] - drivers[2],
+        })[DRIVER_COLUMNS])
+
+    if not schedules:
+        return pd.DataFrame(columns=['Ticker', 'Period', 'Line Item', 'Amount']), pd.DataFrame(columns=DRIVER_COLUMNS)
+    drivers_frame = pd.concat(driver_frames, ignore_index=True)
+    logger.info("Working capital projected for %d tickers over %d periods.", len(drivers_frame), horizon)
+    return pd.concat(schedules, ignore_index=True), drivers_frame
+
+def working_capital_by_period(schedule):
+    """Ticker x period Change in Working Capital, as debt_schedule.debt_inputs_from_panel expects."""
+    rows = schedule[schedule['Line Item'] == 'Change in Working Capital']
+    return rows.pivot(index='Ticker', columns='Period', values='Amount').reindex(columns=rows['Period'].unique())
@@ -0,0 +1,323 @@
+# scripts/outputs/analytical_store.py
+
+import os
+import time
+import sqlite3
+from contextlib import contextmanager
+
+import pandas as pd
+
+from scripts.models.time_series_forecast import forecast_panel
+from scripts.utilities.data_transformation_utils import get_data_paths, logger
+from scripts.utilities.dynamic_assumptions import DEFAULT_THRESHOLDS, generate_scenarios
+from scripts.utilities.panel import PANEL_COLUMNS, STATEMENT_LABELS, find_archived_tagged_files, find_tagged_files
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS statements (
+    ticker TEXT NOT NULL,
+    statement TEXT NOT NULL,
+    category TEXT NOT NULL,
+    period TEXT NOT NULL,
+    amount REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (ticker, statement, category, period)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_statements_category ON statements (category, period);
+CREATE INDEX IF NOT EXISTS idx_statements_period ON statements (period);
+
+CREATE TABLE IF NOT EXISTS tags (
+    ticker TEXT NOT NULL,
+    statement TEXT NOT NULL,
+    label TEXT NOT NULL,
+    category TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (ticker, statement, label)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_tags_category ON tags (category);
+
+CREATE TABLE IF NOT EXISTS baselines (
+    ticker TEXT NOT NULL,
+    statement TEXT NOT NULL,
+    category TEXT NOT NULL,
+    amount REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (ticker, statement, category)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_baselines_category ON baselines (category);
+
+CREATE TABLE IF NOT EXISTS scenarios (
+    ticker TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    weak REAL,
+    base REAL,
+    strong REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (ticker, metric)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS forecasts (
+    ticker TEXT NOT NULL,
+    statement TEXT NOT NULL,
+    category TEXT NOT NULL,
+    step INTEGER NOT NULL,
+    method TEXT,
+    amount REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (ticker, statement, category, step)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_forecasts_category ON forecasts (category, step);
+"""
+
+# table -> (key columns, value columns)
+TABLES = {
+    'statements': (['ticker', 'statement', 'category', 'period'], ['amount']),
+    'tags': (['ticker', 'statement', 'label'], ['category']),
+    'baselines': (['ticker', 'statement', 'category'], ['amount']),
+    'scenarios': (['ticker', 'metric'], ['weak', 'base', 'strong']),
+    'forecasts': (['ticker', 'statement', 'category', 'step'], ['method', 'amount']),
+}
+
+BASELINE_COLUMNS = ['Category', 'Statement Type', 'Amount']
+
+def default_store_path():
+    _, processed_data_dir = get_data_paths()
+    return os.path.join(os.path.dirname(processed_data_dir), 'analytics.sqlite')
+
+def _upsert_sql(table):
+    keys, values = TABLES[table]
+    columns = keys + values + ['updated_at']
+    changed = ' OR '.join(f"{table}.{column} IS NOT excluded.{column}" for column in values)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET "
+        + ', '.join(f"{column} = excluded.{column}" for column in values + ['updated_at'])
+        + f" WHERE {changed}"
+    )
+
+class AnalyticalStore:
+    """
+    Local SQLite database holding statements, tags, baselines, scenarios and forecasts
+    for the whole universe, for ad-hoc SQL from notebooks.
+
+    Every write is an upsert on the table's natural key, so re-running the pipeline for a
+    ticker is idempotent: unchanged rows are left alone (their updated_at is kept) and
+    only new or changed rows are written.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or default_store_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Connection that commits on success and is closed on exit; WAL keeps readers unblocked."""
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def upsert(self, table, rows):
+        """
+        Upserts a frame whose columns are the table's key and value columns.
+
+        Repeated rows are written once. Keys that repeat with different values are skipped
+        with a warning: ON CONFLICT would otherwise keep whichever row came last.
+
+        Returns:
+            int: Number of rows inserted or changed.
+        """
+        keys, values = TABLES[table]
+        rows = rows.dropna(subset=keys).drop_duplicates(keys + values)
+        clashes = rows.duplicated(keys, keep=False)
+        if clashes.any():
+            logger.warning(
+                "Skipping %d %s rows whose key repeats with different values, e.g. %s.",
+                clashes.sum(), table, dict(zip(keys, rows.loc[clashes, keys].iloc[0]))
+            )
+            rows = rows[~clashes]
+        if rows.empty:
+            return 0
+        now = time.time()
+        records = rows[keys + values].astype(object).where(rows[keys + values].notna(), None)
+        params = [(*record, now) for record in records.itertuples(index=False, name=None)]
+        with self._connect() as connection:
+            before = connection.total_changes
+            connection.executemany(_upsert_sql(table), params)
+            changed = connection.total_changes - before
+        logger.info("Upserted %s: %d of %d rows changed.", table, changed, len(params))
+        return changed
+
+    def upsert_statements(self, panel):
+        """Upserts a long panel (Ticker, Statement Type, Category, Period, Amount)."""
+        return self.upsert('statements', pd.DataFrame({
+            'ticker': panel['Ticker'],
+            'statement': panel['Statement Type'],
+            'category': panel['Category'],
+            'period': panel['Period'].astype(str).str[:10],
+            'amount': pd.to_numeric(panel['Amount'], errors='coerce'),
+        }))
+
+    def upsert_tags(self, tags):
+        """Upserts raw label -> standard category mappings (Ticker, Statement Type, Label, Category)."""
+        return self.upsert('tags', pd.DataFrame({
+            'ticker': tags['Ticker'],
+            'statement': tags['Statement Type'],
+            'label': tags['Label'],
+            'category': tags['Category'],
+        }))
+
+    def upsert_baselines(self, baseline, ticker):
+        """Upserts one ticker's baseline (Category, Statement Type, Amount)."""
+        return self.upsert('baselines', pd.DataFrame({
+            'ticker': ticker,
+            'statement': baseline['Statement Type'],
+            'category': baseline['Category'],
+            'amount': pd.to_numeric(baseline['Amount'], errors='coerce'),
+        }))
+
+    def upsert_scenarios(self, scenarios, ticker):
+        """Upserts one ticker's generate_scenarios output (Metric, Weak, Base, Strong)."""
+        return self.upsert('scenarios', pd.DataFrame({
+            'ticker': ticker,
+            'metric': scenarios['Metric'],
+            'weak': scenarios['Weak'],
+            'base': scenarios['Base'],
+            'strong': scenarios['Strong'],
+        }))
+
+    def upsert_forecasts(self, forecast):
+        """Upserts time_series_forecast.forecast_panel output."""
+        return self.upsert('forecasts', pd.DataFrame({
+            'ticker': forecast['Ticker'],
+            'statement': forecast['Statement Type'],
+            'category': forecast['Category'],
+            'step': forecast['Step'].astype(int),
+            'method': forecast['Method'],
+            'amount': forecast['Forecast'],
+        }))
+
+    def query(self, sql, params=()):
+        """Runs a read-only query and returns the result as a DataFrame."""
+        with self._connect() as connection:
+            return pd.read_sql_query(sql, connection, params=params)
+
+def read_combined_statements(path, ticker='DEFAULT'):
+    """
+    Reads a combined statements file into the long panel layout.
+
+    Accepts both the long layout written by generate_scripts (Category, Statement Type,
+    Period, Amount) and the older wide layout: one row per period and statement, the
+    period in the unnamed first column and one column per line item.
+    """
+    combined = pd.read_csv(path)
+    if {'Category', 'Period', 'Amount'}.issubset(combined.columns):
+        long_df = combined
+    else:
+        unnamed = [column for column in combined.columns if str(column).startswith('Unnamed')]
+        # The last unnamed column holds the period; earlier ones are saved indexes
+        period_column = unnamed[-1]
+        long_df = combined.drop(columns=unnamed[:-1]).melt(
+            id_vars=[period_column, 'Statement Type'], var_name='Category', value_name='Amount'
+        ).rename(columns={period_column: 'Period'})
+
+    long_df = long_df.assign(Amount=pd.to_numeric(long_df['Amount'], errors='coerce')).dropna(subset=['Amount'])
+    if 'Ticker' not in long_df.columns:
+        long_df['Ticker'] = ticker
+    return long_df[PANEL_COLUMNS].reset_index(drop=True)
+
+def read_baseline_values(path):
+    """
+    Reads a baseline_values.csv defensively.
+
+    Well-formed files have Category, Statement Type and Amount columns. Files written by
+    older runs saved an empty Series, so the real header ended up as data down the first
+    column (",0" / "Category," / "2020-12-31," ...); those carry no values and yield an
+    empty frame. A header row repeated as the first data row is dropped.
+    """
+    baseline = pd.read_csv(path, dtype=str, keep_default_na=False)
+    if set(BASELINE_COLUMNS).issubset(baseline.columns):
+        baseline = baseline[baseline['Category'] != 'Category']
+        baseline = baseline.assign(Amount=pd.to_numeric(baseline['Amount'], errors='coerce'))
+        return baseline.dropna(subset=['Amount'])[BASELINE_COLUMNS].reset_index(drop=True)
+
+    logger.warning("Baseline file %s has no Category/Statement Type/Amount header; skipping it.", path)
+    return pd.DataFrame(columns=BASELINE_COLUMNS)
+
+def read_tags(tagged_files):
+    """Label -> category mappings from (ticker, statement_type, file_path) tagged statement files."""
+    frames = []
+    for ticker, statement_type, file_path in tagged_files:
+        tagged = pd.read_csv(file_path, usecols=lambda column: column in ('Category', 'Standardized Category'))
+        if 'Standardized Category' not in tagged.columns:
+            continue
+        frames.append(pd.DataFrame({
+            'Ticker': ticker,
+            'Statement Type': STATEMENT_LABELS[statement_type],
+            'Label': tagged['Category'],
+            'Category': tagged['Standardized Category'],
+        }))
+    if not frames:
+        return pd.DataFrame(columns=['Ticker', 'Statement Type', 'Label', 'Category'])
+    return pd.concat(frames, ignore_index=True).drop_duplicates(['Ticker', 'Statement Type', 'Label'], keep='last')
+
+def sync_ticker(ticker=None, store=None, forecast_years=3):
+    """
+    Loads one ticker's pipeline outputs (combined statements, tags, baseline, and the
+    scenarios and forecasts derived from them) into the analytical store.
+    """
+    store = store or AnalyticalStore()
+    _, processed_data_dir = get_data_paths(ticker)
+    name = ticker or 'DEFAULT'
+
+    combined_path = os.path.join(processed_data_dir, 'combined_statements.csv')
+    if os.path.isfile(combined_path):
+        panel = read_combined_statements(combined_path, name)
+        store.upsert_statements(panel)
+        if not panel.empty:
+            store.upsert_forecasts(forecast_panel(panel, horizon=forecast_years))
+
+    # generate_scripts archives the tagged files before this runs; fall back to the newest archived copies
+    tagged_files = [entry for entry in find_tagged_files(processed_data_dir, name) if entry[0] == name]
+    store.upsert_tags(read_tags(tagged_files or find_archived_tagged_files(processed_data_dir, name)))
+
+    baseline_path = os.path.join(processed_data_dir, 'baseline_values.csv')
+    if os.path.isfile(baseline_path):
+        baseline = read_baseline_values(baseline_path)
+        store.upsert_baselines(baseline, name)
+        if not baseline.empty:
+            values = dict(zip(baseline['Category'], baseline['Amount']))
+            store.upsert_scenarios(generate_scenarios(values, DEFAULT_THRESHOLDS), name)
+    return store
+
+def sync_shared_outputs(store):
+    """Loads the shared data/combined_statements.csv and data/outputs/baseline_values.csv, if present."""
+    data_dir = os.path.dirname(get_data_paths()[1])
+    combined_path = os.path.join(data_dir, 'combined_statements.csv')
+    if os.path.isfile(combined_path):
+        store.upsert_statements(read_combined_statements(combined_path))
+    baseline_path = os.path.join(data_dir, 'outputs', 'baseline_values.csv')
+    if os.path.isfile(baseline_path):
+        store.upsert_baselines(read_baseline_values(baseline_path), 'DEFAULT')
+
+def main(tickers=None):
+    """Syncs the shared outputs and every per-ticker output directory into the store."""
+    store = AnalyticalStore()
+    sync_shared_outputs(store)
+    if tickers is None:
+        _, processed_data_dir = get_data_paths()
+        tickers = [
+            entry for entry in os.listdir(processed_data_dir)
+            if entry != 'archive' and os.path.isdir(os.path.join(processed_data_dir, entry))
+        ] if os.path.isdir(processed_data_dir) else []
+    for ticker in [None, *sorted(set(tickers))]:
+        sync_ticker(ticker, store)
+    logger.info("Analytical store at %s is up to date.", store.db_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# scripts/outputs/formula_model.py
+
+import os
+from io import BytesIO
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from scripts.utilities.data_transformation_utils import logger
+from scripts.utilities.line_item_taxonomy import TAXONOMY
+from scripts.utilities.periods import sort_period_labels
+
+# Line items written to the model sheet, in display order
+MODEL_LINE_ITEMS = [
+    'Revenue',
+    'Cost of Goods Sold',
+    'Gross Profit',
+    'Selling General and Administrative',
+    'Research and Development',
+    'Operating Expenses',
+    'Operating Income',
+    'Net Income',
+    'Property Plant and Equipment',
+]
+
+MODEL_SHEET = 'Model'
+DEPRECIATION_SHEET = 'Depreciation Schedule'
+FIRST_ITEM_ROW = 5
+FIRST_PERIOD_COLUMN = 3  # A: line item, B: growth assumption
+
+_HEADER_FONT = Font(bold=True, color='FFFFFF')
+_HEADER_FILL = PatternFill('solid', fgColor='1F4E78')
+_INPUT_FONT = Font(color='0000FF')  # Blue inputs, black formulas
+_FORECAST_FILL = PatternFill('solid', fgColor='F2F2F2')
+_TOP_BORDER = Border(top=Side(style='thin'))
+_NUMBER_FORMAT = '#,##0;(#,##0)'
+_PERCENT_FORMAT = '0.0%'
+
+# Compiled templates keyed by (line items, historical periods, forecast periods)
+_TEMPLATE_CACHE = {}
+
+def _subtotal_formulas(line_items):
+    """Subtotals whose children are all in the model are forecast as formulas of those children."""
+    hierarchy = {parent: children for statement in TAXONOMY.values() for parent, children in statement.items()}
+    return {
+        parent: children
+        for parent, children in hierarchy.items()
+        if parent in line_items and all(child in line_items for child, _ in children)
+    }
+
+def _build_template(line_items, historical_periods, forecast_periods):
+    """Lays out styles, labels and every formula once; returns the workbook as bytes."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = MODEL_SHEET
+    rows = {item: FIRST_ITEM_ROW + i for i, item in enumerate(line_items)}
+    last_historical = FIRST_PERIOD_COLUMN + historical_periods - 1
+    total_columns = historical_periods + forecast_periods
+
+    sheet['A1'].font = Font(bold=True, size=14)
+    sheet['A2'] = 'Blue cells are inputs; forecast columns are formulas driven by the growth assumptions.'
+    sheet['A2'].font = Font(italic=True, size=9)
+
+    header_row = FIRST_ITEM_ROW - 1
+    sheet.cell(header_row, 1, 'Line Item')
+    sheet.cell(header_row, 2, 'Growth')
+    for offset in range(total_columns):
+        column = FIRST_PERIOD_COLUMN + offset
+        sheet.cell(header_row - 1, column, 'Historical' if offset < historical_periods else 'Forecast')
+    for column in range(1, FIRST_PERIOD_COLUMN + total_columns):
+        cell = sheet.cell(header_row, column)
+        cell.font, cell.fill = _HEADER_FONT, _HEADER_FILL
+        cell.alignment = Alignment(horizontal='center')
+
+    subtotals = _subtotal_formulas(line_items)
+    for item, row in rows.items():
+        sheet.cell(row, 1, item)
+        growth = sheet.cell(row, 2)
+        growth.number_format, growth.font = _PERCENT_FORMAT, _INPUT_FONT
+        for offset in range(total_columns):
+            column = FIRST_PERIOD_COLUMN + offset
+            cell = sheet.cell(row, column)
+            cell.number_format = _NUMBER_FORMAT
+            if column <= last_historical:
+                cell.font = _INPUT_FONT
+                continue
+            letter = get_column_letter(column)
+            if item in subtotals:
+                terms = ''.join(
+                    f"{'+' if sign > 0 else '-'}{letter}{rows[child]}" for child, sign in subtotals[item]
+                )
+                cell.value = '=' + terms.lstrip('+')
+                cell.border = _TOP_BORDER
+            else:
+                previous = get_column_letter(column - 1)
+                cell.value = f'={previous}{row}*(1+$B${row})'
+            cell.fill = _FORECAST_FILL
+
+    sheet.column_dimensions['A'].width = 38
+    sheet.column_dimensions['B'].width = 10
+    for offset in range(total_columns):
+        sheet.column_dimensions[get_column_letter(FIRST_PERIOD_COLUMN + offset)].width = 14
+    sheet.freeze_panes = sheet.cell(FIRST_ITEM_ROW, FIRST_PERIOD_COLUMN)
+
+    # Depreciation schedule linked to the forecast PP&E row
+    schedule = workbook.create_sheet(DEPRECIATION_SHEET)
+    schedule['A1'], schedule['A2'] = 'Useful Life (years)', 'Period'
+    schedule['B1'].font = _INPUT_FONT
+    schedule['A3'], schedule['A4'] = 'Property Plant and Equipment', 'Depreciation Expense'
+    for cell in (schedule['A2'], schedule['A3'], schedule['A4']):
+        cell.font = Font(bold=True)
+    if 'Property Plant and Equipment' in rows:
+        ppe_row = rows['Property Plant and Equipment']
+        for offset in range(forecast_periods):
+            model_letter = get_column_letter(last_historical + 1 + offset)
+            letter = get_column_letter(2 + offset)
+            schedule[f'{letter}2'] = f"='{MODEL_SHEET}'!{model_letter}{header_row}"
+            schedule[f'{letter}3'] = f"='{MODEL_SHEET}'!{model_letter}{ppe_row}"
+            schedule[f'{letter}4'] = f'={letter}3/$B$1'
+            schedule[f'{letter}3'].number_format = schedule[f'{letter}4'].number_format = _NUMBER_FORMAT
+    schedule.column_dimensions['A'].width = 30
+
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+def get_template(line_items, historical_periods, forecast_periods):
+    """Returns the compiled template bytes for a layout, building it on first use."""
+    key = (tuple(line_items), historical_periods, forecast_periods)
+    if key not in _TEMPLATE_CACHE:
+        _TEMPLATE_CACHE[key] = _build_template(line_items, historical_periods, forecast_periods)
+        logger.info("Compiled formula model template for %s+%s periods.", historical_periods, forecast_periods)
+    return _TEMPLATE_CACHE[key]
+
+def default_growth_assumptions(historical):
+    """Mean historical growth per line item, used when no explicit assumption is given."""
+    growth = historical.T.pct_change(fill_method=None).mean()
+    return growth.replace([float('inf'), float('-inf')], 0).fillna(0)
+
+def write_formula_model(ticker_symbol, historical, forecast_years=3, growth=None, useful_life=5, output_dir="."):
+    """
+    Writes a live-formula model workbook by filling the cached template's data cells.
+
+    Args:
+        ticker_symbol (str): Ticker used for the title and file name.
+        historical (pd.DataFrame): Line items (index) x periods (columns, oldest first).
+        forecast_years (int): Number of forecast columns.
+        growth (dict, optional): Line item -> growth rate; defaults to mean historical growth.
+        useful_life (int): Useful life feeding the depreciation schedule.
+        output_dir (str): Directory for the workbook.
+
+    Returns:
+        str: Path of the written workbook.
+    """
+    line_items = [item for item in MODEL_LINE_ITEMS if item in historical.index]
+    historical = historical.loc[line_items]
+    growth_values = default_growth_assumptions(historical)
+    if growth:
+        growth_values.update(pd.Series(growth))
+    periods = [str(period) for period in historical.columns]
+
+    workbook = load_workbook(BytesIO(get_template(line_items, len(periods), forecast_years)))
+    sheet = workbook[MODEL_SHEET]
+    sheet['A1'] = f'{ticker_symbol} Financial Model'
+
+    header_row = FIRST_ITEM_ROW - 1
+    last_year = pd.to_datetime(periods[-1], errors='coerce')
+    for offset, period in enumerate(periods):
+        sheet.cell(header_row, FIRST_PERIOD_COLUMN + offset, period)
+    for offset in range(forecast_years):
+        label = f'{last_year.year + offset + 1}E' if pd.notna(last_year) else f'Forecast {offset + 1}'
+        sheet.cell(header_row, FIRST_PERIOD_COLUMN + len(periods) + offset, label)
+
+    subtotals = _subtotal_formulas(line_items)
+    for i, item in enumerate(line_items):
+        row = FIRST_ITEM_ROW + i
+        if item not in subtotals:
+            sheet.cell(row, 2, float(growth_values.get(item, 0.0)))
+        for offset, value in enumerate(historical.loc[item]):
+            if pd.notna(value):
+                sheet.cell(row, FIRST_PERIOD_COLUMN + offset, float(value))
+    workbook[DEPRECIATION_SHEET]['B1'] = useful_life
+
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, f'{ticker_symbol}_formula_model.xlsx')
+    workbook.save(output_path)
+    logger.info("%s has been created successfully.", output_path)
+    return output_path
+
+def historical_from_panel(panel, ticker):
+    """Builds the line item x period frame expected by write_formula_model from the long panel."""
+    rows = panel[(panel['Ticker'] == ticker) & panel['Category'].isin(MODEL_LINE_ITEMS)]
+    historical = rows.pivot_table(index='Category', columns='Period', values='Amount', aggfunc='last')
+    return historical.reindex(columns=sort_period_labels(historical.columns))
+
+def write_formula_models(panel, forecast_years=3, output_dir=".", **kwargs):
+    """Writes a formula model for every ticker in the panel, reusing the compiled templates."""
+    return [
+        write_formula_model(ticker, historical_from_panel(panel, ticker), forecast_years, output_dir=output_dir, **kwargs)
+        for ticker in sorted(panel['Ticker'].unique())
+    ]
@@ -0,0 +1,180 @@
+# scripts/outputs/tear_sheets.py
+
+import os
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')  # Headless backend; must be selected before pyplot is imported
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from scripts.utilities.data_transformation_utils import get_data_paths, logger
+from scripts.utilities.dynamic_assumptions import DEFAULT_THRESHOLDS, generate_scenarios
+from scripts.utilities.panel import load_tagged_panel
+from scripts.utilities.periods import sort_period_labels
+
+# Categories a tear sheet reads; only these feed the input hash
+TEAR_SHEET_CATEGORIES = [
+    'Revenue', 'Gross Profit', 'Operating Income', 'Net Income',
+    'Free Cash Flow', 'Property Plant and Equipment',
+]
+SCENARIO_CATEGORIES = ['Revenue', 'Operating Income', 'Net Income', 'Free Cash Flow']
+MANIFEST_NAME = 'tear_sheet_manifest.json'
+
+# Bump when the layout changes so every tear sheet is re-rendered once
+RENDER_VERSION = 1
+
+# Figure reused by every render in a worker process
+_FIGURE = None
+
+def ticker_inputs(panel, ticker):
+    """The tear sheet inputs for one ticker as a Category x Period frame, oldest period first."""
+    rows = panel[(panel['Ticker'] == ticker) & panel['Category'].isin(TEAR_SHEET_CATEGORIES)]
+    wide = rows.pivot_table(index='Category', columns='Period', values='Amount', aggfunc='last')
+    return wide.reindex(columns=sort_period_labels(wide.columns))
+
+def input_hash(inputs, formats, useful_life):
+    """Fingerprint of everything a tear sheet depends on."""
+    digest = hashlib.sha256(inputs.to_csv().encode())
+    digest.update(json.dumps([RENDER_VERSION, list(formats), useful_life]).encode())
+    return digest.hexdigest()
+
+def _init_worker():
+    """Creates the worker's figure once; renders only clear and redraw its axes."""
+    global _FIGURE
+    _FIGURE, _ = plt.subplots(2, 2, figsize=(11, 8.5))
+    _FIGURE.axes[0].twinx()
+
+def _row(inputs, category):
+    return inputs.loc[category] if category in inputs.index else pd.Series(np.nan, index=inputs.columns)
+
+def _draw(figure, ticker, inputs, useful_life):
+    trend, fcf, bands, depreciation, margins = figure.axes
+    for axis in figure.axes:
+        axis.clear()
+    periods = [str(period)[:10] for period in inputs.columns]
+    x = np.arange(len(periods))
+
+    revenue = _row(inputs, 'Revenue')
+    trend.bar(x, revenue.to_numpy(dtype=float), color='#1F4E78')
+    trend.set_title('Revenue and margins')
+    trend.set_xticks(x, periods, rotation=30, fontsize=8)
+    with np.errstate(all='ignore'):
+        for category, color in [('Gross Profit', '#70AD47'), ('Operating Income', '#ED7D31'), ('Net Income', '#A5A5A5')]:
+            margins.plot(x, (_row(inputs, category) / revenue).to_numpy(dtype=float), marker='o', color=color, label=category)
+    margins.yaxis.set_major_formatter(matplotlib.ticker.PercentFormatter(1.0))
+    margins.legend(fontsize=7, loc='upper left')
+
+    fcf_values = _row(inputs, 'Free Cash Flow').to_numpy(dtype=float)
+    fcf.bar(x, fcf_values, color=np.where(fcf_values < 0, '#C00000', '#70AD47'))
+    fcf.set_title('Free cash flow')
+    fcf.set_xticks(x, periods, rotation=30, fontsize=8)
+
+    baselines = {c: float(_row(inputs, c).mean()) for c in SCENARIO_CATEGORIES if c in inputs.index}
+    scenarios = generate_scenarios(baselines, DEFAULT_THRESHOLDS)
+    if not scenarios.empty:
+        y = np.arange(len(scenarios))
+        low = scenarios[['Weak', 'Strong']].min(axis=1)
+        high = scenarios[['Weak', 'Strong']].max(axis=1)
+        bands.barh(y, high - low, left=low, color='#BDD7EE')
+        bands.scatter(scenarios['Base'], y, color='#1F4E78', zorder=3)
+        bands.set_yticks(y, scenarios['Metric'], fontsize=8)
+    bands.set_title('Scenario bands (Weak - Strong)')
+
+    ppe = _row(inputs, 'Property Plant and Equipment').dropna()
+    if not ppe.empty:
+        annual = float(ppe.iloc[-1]) / useful_life
+        years = np.arange(1, useful_life + 1)
+        depreciation.bar(years, np.full(useful_life, annual), color='#7F7F7F')
+        depreciation.plot(years, float(ppe.iloc[-1]) - annual * years, color='#1F4E78', marker='o', label='Net book value')
+        depreciation.legend(fontsize=7)
+    depreciation.set_title(f'Straight-line depreciation ({useful_life} years)')
+
+    figure.suptitle(f'{ticker} tear sheet', fontsize=14)
+    figure.tight_layout()
+
+def render_tear_sheet(args):
+    """Renders one ticker in the worker's reused figure; returns (ticker, hash, error)."""
+    ticker, inputs, digest, output_dir, formats, useful_life = args
+    if _FIGURE is None:
+        _init_worker()
+    try:
+        _draw(_FIGURE, ticker, inputs, useful_life)
+        for extension in formats:
+            _FIGURE.savefig(os.path.join(output_dir, f'{ticker}_tear_sheet.{extension}'), format=extension)
+        return ticker, digest, None
+    except Exception as e:
+        return ticker, digest, str(e)
+
+def _load_manifest(path):
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def render_tear_sheets(panel, output_dir=None, formats=('png', 'pdf'), useful_life=5, max_workers=None, force=False):
+    """
+    Renders tear sheets for every ticker of the panel in a process pool.
+
+    Tickers whose inputs hash matches the manifest from the previous run (and whose files
+    exist) are skipped unless `force` is set.
+
+    Returns:
+        dict: Counts of rendered, skipped and failed tickers.
+    """
+    if output_dir is None:
+        _, processed_data_dir = get_data_paths()
+        output_dir = os.path.join(os.path.dirname(processed_data_dir), 'outputs', 'tear_sheets')
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    manifest = _load_manifest(manifest_path)
+
+    tasks, skipped = [], 0
+    for ticker in sorted(panel['Ticker'].unique()):
+        inputs = ticker_inputs(panel, ticker)
+        digest = input_hash(inputs, formats, useful_life)
+        outputs_exist = all(
+            os.path.isfile(os.path.join(output_dir, f'{ticker}_tear_sheet.{extension}')) for extension in formats
+        )
+        if not force and manifest.get(ticker) == digest and outputs_exist:
+            skipped += 1
+            continue
+        tasks.append((ticker, inputs, digest, output_dir, tuple(formats), useful_life))
+
+    if len(tasks) <= 1 or max_workers == 1:
+        results = [render_tear_sheet(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+            results = list(executor.map(render_tear_sheet, tasks, chunksize=max(1, len(tasks) // 32)))
+
+    failed = 0
+    for ticker, digest, error in results:
+        if error:
+            failed += 1
+            manifest.pop(ticker, None)
+            logger.error("Could not render tear sheet for %s: %s", ticker, error)
+        else:
+            manifest[ticker] = digest
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    summary = {'rendered': len(results) - failed, 'skipped': skipped, 'failed': failed}
+    logger.info("Tear sheets: %(rendered)d rendered, %(skipped)d skipped, %(failed)d failed.", summary)
+    return summary
+
+def main(processed_dir=None, output_dir=None):
+    """
+    Renders tear sheets for every tagged ticker, reading the newest archived statements
+    of tickers whose live tagged files a pipeline run has already archived.
+    """
+    panel = load_tagged_panel(processed_dir)
+    if panel.empty:
+        logger.warning("No tagged statements to report on.")
+        return None
+    return render_tear_sheets(panel, output_dir)
+
+if __name__ == "__main__":
+    main()
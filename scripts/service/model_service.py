@@ -0,0 +1,245 @@
+# scripts/service/model_service.py
+
+import os
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+
+from scripts.generate_scripts import calculate_baseline
+from scripts.models.financial_forecast import generate_forecast
+from scripts.utilities.data_transformation_utils import match_line_item, logger
+from scripts.utilities.dynamic_assumptions import generate_scenarios, DEFAULT_THRESHOLDS
+from scripts.utilities.panel import STATEMENT_LABELS, find_tagged_files, load_tagged_panel
+
+def to_records(df):
+    """Converts a DataFrame to JSON-safe records (NaN becomes null)."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+class ModelState:
+    """
+    In-process state shared by every request: the tagged panel, per-ticker
+    baselines and a response cache. The panel is reloaded only when a tagged
+    file changes, which also clears the derived caches. Statements the pipeline
+    has archived are served from their newest archived copy, and each run's
+    new archive names count as a change.
+    """
+
+    def __init__(self, processed_dir=None, default_ticker='DEFAULT', refresh_interval=5.0):
+        self.processed_dir = processed_dir
+        self.default_ticker = default_ticker
+        self.refresh_interval = refresh_interval
+        self.panel = None
+        self.generation = 0
+        self._file_mtimes = None
+        self._last_check = 0.0
+        self._ticker_rows = {}
+        self._baselines = {}
+        self._responses = {}
+        self._lock = threading.RLock()
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        """Reloads the panel if any tagged file (live or newest archived) changed. Returns True when a reload happened."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_check < self.refresh_interval:
+                return False
+            self._last_check = now
+            mtimes = {
+                file_path: os.path.getmtime(file_path)
+                for _, _, file_path in find_tagged_files(self.processed_dir, self.default_ticker)
+            }
+            if not force and mtimes == self._file_mtimes:
+                return False
+
+            self.panel = load_tagged_panel(self.processed_dir, self.default_ticker)
+            self._ticker_rows = {ticker: rows for ticker, rows in self.panel.groupby('Ticker')}
+            self._file_mtimes = mtimes
+            self._baselines = {}
+            self._responses = {}
+            self.generation += 1
+            logger.info("Model service state loaded (generation %s).", self.generation)
+            return True
+
+    def tickers(self):
+        return sorted(self._ticker_rows)
+
+    def ticker_rows(self, ticker):
+        if ticker not in self._ticker_rows:
+            raise KeyError(f"Unknown ticker: {ticker}")
+        return self._ticker_rows[ticker]
+
+    def baselines(self, ticker):
+        """Baseline values for a ticker, computed once per panel generation."""
+        if ticker not in self._baselines:
+            self._baselines[ticker] = calculate_baseline(self.ticker_rows(ticker).copy())
+        return self._baselines[ticker]
+
+    def cached(self, key, compute):
+        """Returns the cached response for `key`, computing it on first request."""
+        self.refresh()
+        entry = self._responses.get(key)
+        if entry is not None and entry[0] == self.generation:
+            return entry[1]
+        generation = self.generation
+        value = compute()
+        with self._lock:
+            if generation == self.generation:
+                self._responses[key] = (generation, value)
+        return value
+
+    def warm(self):
+        """Precomputes baselines for every ticker so first requests are served from memory."""
+        for ticker in self.tickers():
+            try:
+                self.baselines(ticker)
+            except Exception as e:
+                logger.error("Could not warm baselines for %s: %s", ticker, e)
+
+    # Endpoint payloads
+
+    def statements(self, ticker, statement=None):
+        rows = self.ticker_rows(ticker)
+        if statement is not None:
+            label = STATEMENT_LABELS.get(statement, statement)
+            rows = rows[rows['Statement Type'] == label]
+        return to_records(rows.drop(columns='Ticker'))
+
+    def baseline_payload(self, ticker):
+        return to_records(self.baselines(ticker))
+
+    def forecasts(self, ticker, years=3):
+        rows = self.ticker_rows(ticker)
+        financial_data = {
+            label: rows[rows['Statement Type'] == label].pivot_table(
+                index='Period', columns='Category', values='Amount', aggfunc='last'
+            )
+            for label in rows['Statement Type'].unique()
+        }
+        forecast = generate_forecast(financial_data, forecast_years=years)
+        return {label: to_records(df.reset_index(drop=True)) for label, df in forecast.items()}
+
+    def scenarios(self, ticker, thresholds=None):
+        baseline = self.baselines(ticker)
+        baseline_values = dict(zip(baseline['Category'], baseline['Amount']))
+        return to_records(generate_scenarios(baseline_values, thresholds or DEFAULT_THRESHOLDS))
+
+    def status(self):
+        return {
+            'generation': self.generation,
+            'tickers': len(self._ticker_rows),
+            'rows': 0 if self.panel is None else len(self.panel),
+            'cached_responses': len(self._responses),
+            'tag_memo': match_line_item.cache_info()._asdict(),
+        }
+
+class ModelRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+        GET  /status
+        GET  /tickers
+        GET  /statements/<ticker>[?statement=income_statement]
+        GET  /baselines/<ticker>
+        GET  /forecasts/<ticker>[?years=3]
+        GET  /scenarios/<ticker>[?<metric>=<threshold>...]
+        POST /refresh
+    """
+
+    state = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            payload = self.route(parts, params)
+        except KeyError as e:
+            return self.send_json(404, {'error': str(e).strip("'")})
+        except ValueError as e:
+            return self.send_json(400, {'error': str(e)})
+        except Exception as e:
+            logger.exception("Model service error for %s: %s", self.path, e)
+            return self.send_json(500, {'error': str(e)})
+        self.send_json(200, payload)
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip('/') != '/refresh':
+            return self.send_json(404, {'error': 'Not found'})
+        reloaded = self.state.refresh(force=True)
+        self.send_json(200, {'reloaded': reloaded, 'generation': self.state.generation})
+
+    def route(self, parts, params):
+        state = self.state
+        if parts == ['status']:
+            return state.status()
+        if parts == ['tickers']:
+            return state.cached(('tickers',), state.tickers)
+        if len(parts) != 2:
+            raise KeyError('Not found')
+
+        endpoint, ticker = parts[0], parts[1].upper()
+        if endpoint == 'statements':
+            statement = params.get('statement')
+            return state.cached((endpoint, ticker, statement), lambda: state.statements(ticker, statement))
+        if endpoint == 'baselines':
+            return state.cached((endpoint, ticker), lambda: state.baseline_payload(ticker))
+        if endpoint == 'forecasts':
+            years = int(params.get('years', 3))
+            return state.cached((endpoint, ticker, years), lambda: state.forecasts(ticker, years))
+        if endpoint == 'scenarios':
+            thresholds = {**DEFAULT_THRESHOLDS, **{key: float(value) for key, value in params.items()}}
+            key = (endpoint, ticker, tuple(sorted(thresholds.items())))
+            return state.cached(key, lambda: state.scenarios(ticker, thresholds))
+        raise KeyError('Not found')
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, default=self.json_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def json_default(value):
+        if isinstance(value, (np.integer, np.floating)):
+            return value.item()
+        if isinstance(value, pd.Timestamp):
+            return value.isoformat()
+        return str(value)
+
+    def log_message(self, format, *args):
+        logger.debug("Model service %s - %s", self.address_string(), format % args)
+
+def create_server(host='127.0.0.1', port=8000, processed_dir=None, warm=True):
+    """Builds the threaded HTTP server with a warmed model state."""
+    state = ModelState(processed_dir)
+    if warm:
+        state.warm()
+    handler = type('BoundModelRequestHandler', (ModelRequestHandler,), {'state': state})
+    return ThreadingHTTPServer((host, port), handler)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve statements, baselines, forecasts and scenarios over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--processed-dir', default=None)
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.processed_dir)
+    logger.info("Model service listening on http://%s:%s", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Model service stopped.")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# scripts/utilities/currency.py
+
+import os
+import numpy as np
+import pandas as pd
+from scripts.utilities.data_transformation_utils import get_data_paths, logger
+from scripts.utilities.periods import is_quarterly, reported_period_end
+
+BASE_CURRENCY = 'USD'
+
+# Balance sheet items are stocks (converted at the period-end rate); income and
+# cash flow items are flows (converted at the average rate over the period).
+STOCK_STATEMENTS = {'Balance Sheet'}
+
+def _data_dir():
+    raw_data_dir, _ = get_data_paths()
+    return os.path.dirname(raw_data_dir)
+
+def default_rates_path():
+    return os.path.join(_data_dir(), 'fx_rates.csv')
+
+def currency_path(ticker_symbol=None):
+    """raw/[<TICKER>/]currency: the ticker's reporting currency, written only by its own ingest task."""
+    raw_data_dir, _ = get_data_paths(ticker_symbol)
+    return os.path.join(raw_data_dir, 'currency')
+
+class FxTable:
+    """
+    FX rates loaded from a local file with Date, Currency and Rate columns, where Rate is
+    units of the base currency (USD) per unit of Currency. Rates may be daily or monthly.
+
+    Closing rates are the last observation on or before a date; average rates are the
+    mean of the observations inside a period, answered from cumulative sums. Rate vectors
+    for a currency and a calendar of period ends are cached in memory.
+    """
+
+    def __init__(self, rates):
+        rates = rates.assign(Date=pd.to_datetime(rates['Date']), Rate=pd.to_numeric(rates['Rate'], errors='coerce'))
+        rates = rates.dropna(subset=['Date', 'Rate']).sort_values('Date')
+        self._series = {}
+        for currency, group in rates.groupby(rates['Currency'].str.upper()):
+            dates = group['Date'].to_numpy(dtype='datetime64[ns]')
+            values = group['Rate'].to_numpy(dtype=float)
+            self._series[currency] = (dates, values, np.concatenate([[0.0], np.cumsum(values)]))
+        self._cache = {}
+
+    @classmethod
+    def from_csv(cls, path=None):
+        path = path or default_rates_path()
+        return cls(pd.read_csv(path))
+
+    @property
+    def currencies(self):
+        return sorted(self._series) + [BASE_CURRENCY]
+
+    def _lookup(self, currency):
+        currency = currency.upper()
+        if currency not in self._series:
+            raise KeyError(f"No FX rates for {currency}")
+        return self._series[currency]
+
+    def closing_rates(self, currency, period_ends):
+        """Rate on or before every period end (NaN before the first observation)."""
+        if currency.upper() == BASE_CURRENCY:
+            return np.ones(len(period_ends))
+        dates, values, _ = self._lookup(currency)
+        ends = pd.DatetimeIndex(period_ends)
+        positions = np.searchsorted(dates, ends.to_numpy(dtype='datetime64[ns]'), side='right') - 1
+        return np.where((positions >= 0) & ~ends.isna(), values[np.maximum(positions, 0)], np.nan)
+
+    def average_rates(self, currency, period_ends, months=12):
+        """Mean rate over the `months` ending at every period end (NaN when no observation falls inside)."""
+        if currency.upper() == BASE_CURRENCY:
+            return np.ones(len(period_ends))
+        dates, _, cumulative = self._lookup(currency)
+        ends = pd.DatetimeIndex(period_ends)
+        starts = ends - pd.DateOffset(months=months)
+        upper = np.searchsorted(dates, ends.to_numpy(dtype='datetime64[ns]'), side='right')
+        lower = np.searchsorted(dates, starts.to_numpy(dtype='datetime64[ns]'), side='right')
+        counts = np.where(ends.isna(), 0, upper - lower)
+        with np.errstate(all='ignore'):
+            return np.where(counts > 0, (cumulative[upper] - cumulative[lower]) / counts, np.nan)
+
+    def rate_vector(self, currency, period_ends, kind='closing', months=12):
+        """Closing or average rates for a calendar of period ends, cached by (currency, calendar)."""
+        key = (currency.upper(), tuple(pd.DatetimeIndex(period_ends)), kind, months)
+        if key not in self._cache:
+            if kind == 'closing':
+                self._cache[key] = self.closing_rates(currency, period_ends)
+            else:
+                self._cache[key] = self.average_rates(currency, period_ends, months)
+        return self._cache[key]
+
+def load_reporting_currency(ticker_symbol=None):
+    """The reporting currency recorded at ingestion; USD when none was recorded."""
+    path = currency_path(ticker_symbol)
+    if not os.path.isfile(path):
+        return BASE_CURRENCY
+    with open(path) as f:
+        return f.read().strip().upper() or BASE_CURRENCY
+
+def load_reporting_currencies():
+    """Ticker -> reporting currency for every ticker directory under raw/."""
+    raw_data_dir, _ = get_data_paths()
+    if not os.path.isdir(raw_data_dir):
+        return {}
+    return {
+        entry: load_reporting_currency(entry) for entry in sorted(os.listdir(raw_data_dir))
+        if os.path.isfile(currency_path(entry))
+    }
+
+def record_reporting_currency(ticker_symbol, currency):
+    """Stores a ticker's reporting currency in its own raw/<TICKER>/currency file (atomic replace)."""
+    path = currency_path(ticker_symbol)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    staging = f'{path}.tmp'
+    with open(staging, 'w') as f:
+        f.write((currency or BASE_CURRENCY).upper() + '\n')
+    os.replace(staging, path)
+
+def convert_panel(panel, fx, currencies=None, currency=None):
+    """
+    Converts a long panel to USD: stock statements at closing rates, flow statements at
+    average rates over each period (3 months for quarterly tickers, 12 otherwise). Both
+    are taken as of the reported period end, so 52/53-week years use no later rates.
+
+    Args:
+        panel (pd.DataFrame): Long panel with Statement Type, Period and Amount (and Ticker).
+        fx (FxTable): Rate table.
+        currencies (dict, optional): Ticker -> reporting currency.
+        currency (str, optional): Reporting currency for a panel without a Ticker column.
+
+    Returns:
+        pd.DataFrame: The panel with converted amounts, the original amount in
+        'Reported Amount' and its currency in 'Reporting Currency'. Rows without a
+        rate keep NaN amounts.
+    """
+    result = panel.copy()
+    if currency is not None or 'Ticker' not in result.columns:
+        result['Reporting Currency'] = (currency or BASE_CURRENCY).upper()
+    else:
+        result['Reporting Currency'] = result['Ticker'].map(currencies or {}).fillna(BASE_CURRENCY)
+    result['Reported Amount'] = pd.to_numeric(result['Amount'], errors='coerce')
+
+    rates = np.ones(len(result))
+    ticker_keys = result['Ticker'] if 'Ticker' in result.columns else pd.Series('', index=result.index)
+    statement_types = result['Statement Type'].to_numpy()
+    for (code, _), positions in result.groupby([result['Reporting Currency'], ticker_keys]).indices.items():
+        if code == BASE_CURRENCY:
+            continue
+        labels = result['Period'].to_numpy()[positions]
+        unique_labels = pd.unique(labels)
+        months = 3 if is_quarterly(unique_labels) else 12
+        reported = [reported_period_end(label) for label in unique_labels]
+        ends = pd.DatetimeIndex([end if end is not None else pd.NaT for end in reported])
+        closing = fx.rate_vector(code, ends, 'closing', months)
+        average = fx.rate_vector(code, ends, 'average', months)
+        lookup = pd.Index(unique_labels).get_indexer(labels)
+        is_stock = np.isin(statement_types[positions], list(STOCK_STATEMENTS))
+        rates[positions] = np.where(is_stock, closing[lookup], average[lookup])
+
+    result['Amount'] = result['Reported Amount'] * rates
+    missing = result['Amount'].isna() & result['Reported Amount'].notna()
+    if missing.any():
+        logger.warning("No FX rate for %d rows; their amounts are left empty.", int(missing.sum()))
+    return result
@@ -1,27 +1,27 @@
 import os
-import logging
+import re
 from datetime import datetime, timedelta
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 from fuzzywuzzy import process
+from scripts.utilities.logging_config import configure_logging
 
-# Configure logger at the module level
-logger = logging.getLogger("FinancialModeling")
-logger.setLevel(logging.INFO)
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    handler.setLevel(logging.INFO)
-    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+# Shared "FinancialModeling" logger, configured once per process
+logger = configure_logging()
 
 # Get project paths
-def get_data_paths():
+def get_data_paths(ticker=None):
+    """Returns the raw and processed data directories, or a ticker's subdirectories of them."""
     current_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.abspath(os.path.join(current_dir, "..", ".."))
     data_dir = os.path.join(project_root, "data")
     raw_data_dir = os.path.join(data_dir, "raw")
     processed_data_dir = os.path.join(data_dir, "processed")
+    if ticker:
+        raw_data_dir = os.path.join(raw_data_dir, ticker)
+        processed_data_dir = os.path.join(processed_data_dir, ticker)
     return raw_data_dir, processed_data_dir
 
 # Disable scientific notation globally for Pandas
@@ -126,17 +126,60 @@ def tag_line_item_indices(df, line_item_dict):
     # Handle NaN values in 'Category' column
     df['Category'] = df['Category'].fillna('Unknown')
 
-    def match_line_item(item):
-        if item == 'Unknown':
-            return item
-        match, score = process.extractOne(item, [key for key in line_item_dict.keys()])
-        if score >= 80:
-            return match
-        return item
-
-    df['Standardized Category'] = df['Category'].apply(match_line_item)
+    codes, labels = pd.factorize(df['Category'])
+    df['Standardized Category'] = standardize_labels(labels, line_item_dict)[codes]
     return df
 
+def alias_lookup(dictionary):
+    """Lower-cased category names and aliases -> (standard category, rank); the category name ranks first."""
+    lookup = {}
+    for key, aliases in dictionary.items():
+        for rank, alias in enumerate([key, *aliases]):
+            lookup.setdefault(alias.strip().lower(), (key, rank))
+    return lookup
+
+def standardize_labels(labels, dictionary=line_item_dict):
+    """
+    Standard category of each distinct raw label of one statement, by case-insensitive
+    exact match of the category name or one of its aliases.
+
+    Fuzzy matching merged different lines (Cost Of Revenue into Revenue, Investing Cash Flow
+    into operating cash flow), so labels without an exact match stay as they are. When
+    several labels match one category, only the best ranked one is tagged with it.
+
+    Returns:
+        np.ndarray: Tags aligned with `labels`.
+    """
+    lookup = alias_lookup(dictionary)
+    matches = [None if label == 'Unknown' else lookup.get(str(label).strip().lower()) for label in labels]
+    best = {}
+    for i, match in enumerate(matches):
+        if match is not None and (match[0] not in best or match[1] < matches[best[match[0]]][1]):
+            best[match[0]] = i
+    return np.array([
+        match[0] if match is not None and best[match[0]] == i else label
+        for i, (label, match) in enumerate(zip(labels, matches))
+    ], dtype=object)
+
+# Memoized fuzzy match shared by every tagging call in the process (the tag memo)
+@lru_cache(maxsize=None)
+def match_line_item(item, categories, threshold=80):
+    """
+    Matches a raw line item label against the standard categories.
+
+    Args:
+        item (str): Raw line item label.
+        categories (tuple): Standard category names to match against.
+        threshold (int): Minimum fuzzy score required to accept a match.
+
+    Returns:
+        str: The matched standard category, or the label itself when no match clears the threshold.
+    """
+    match, score = process.extractOne(item, categories)
+    if score >= threshold:
+        return match
+    return item
+
 # Archiving files
 def archive_files(source_dir, archive_dir):
     """
@@ -150,27 +193,38 @@ def archive_files(source_dir, archive_dir):
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 archived_file = f"{os.path.splitext(file)[0]}_{timestamp}.csv"
                 os.rename(file_path, os.path.join(archive_dir, archived_file))
-                logger.info(f"Archived: {file}")
+                logger.info("Archived: %s", file)
     except Exception as e:
-        logger.error(f"Error archiving files: {e}")
+        logger.error("Error archiving files: %s", e)
         
+# Archived names are <stem>_YYYYmmdd_HHMMSS.csv
+_ARCHIVED_NAME = re.compile(r'^(.*)_\d{8}_\d{6}\.csv$')
+
 # Pruning old archives
 def prune_archives(archive_dir, retention_days=30):
     """
-    Deletes files older than `retention_days` in the archive directory.
+    Deletes files older than `retention_days` in the archive directory. The newest copy
+    of every archived file is kept, since readers fall back to it once the live file is gone.
     """
     try:
         if not os.path.exists(archive_dir):
-            logger.warning(f"Archive directory does not exist: {archive_dir}")
+            logger.warning("Archive directory does not exist: %s", archive_dir)
             return
 
         cutoff_time = datetime.now() - timedelta(days=retention_days)
+        newest = {}
+        for file in sorted(os.listdir(archive_dir)):
+            match = _ARCHIVED_NAME.match(file)
+            newest[match.group(1) if match else file] = file
+        keep = set(newest.values())
         for file in os.listdir(archive_dir):
             file_path = os.path.join(archive_dir, file)
+            if file in keep:
+                continue
             if os.path.isfile(file_path) and datetime.fromtimestamp(os.path.getmtime(file_path)) < cutoff_time:
                 os.remove(file_path)
-                logger.info(f"Pruned archive file: {file}")
+                logger.info("Pruned archive file: %s", file)
     except Exception as e:
-        logger.error(f"Error pruning archives: {e}")
+        logger.error("Error pruning archives: %s", e)
 
 
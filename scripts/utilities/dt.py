@@ -1,27 +1,14 @@
 import os
-import logging
 import pandas as pd
 from fuzzywuzzy import process
 from datetime import datetime
+from scripts.utilities.logging_config import configure_logging
 from scripts.utilities.data_transformation_utils import (
-    configure_logging,
     get_data_paths,
     tag_line_item_indices,
     line_item_dict,
 )
 
-# Configure logging
-def configure_logging():
-    logger = logging.getLogger("FinancialModeling")
-    logger.setLevel(logging.INFO)
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        handler.setLevel(logging.INFO)
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-    return logger
-
 logger = configure_logging()
 
 def get_data_paths():
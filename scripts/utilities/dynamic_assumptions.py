@@ -1,11 +1,13 @@
 import pandas as pd
 import os
-import logging
-from scripts.utilities.data_transformation_utils import get_data_paths, line_item_dict
+from scripts.utilities.data_transformation_utils import get_data_paths, line_item_dict, logger
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
+# Scenario thresholds for metrics that should not use the default 5% band
+DEFAULT_THRESHOLDS = {
+    "Revenue Growth Rate": 0.02,
+    "COGS % Revenue": 0.05,
+    "CapEx Growth Rate": 0.01
+}
 
 def calculate_baselines(tagged_data_dir):
     """
@@ -17,7 +19,7 @@ def calculate_baselines(tagged_data_dir):
     for file_name in ["tagged_balance_sheet.csv", "tagged_income_statement.csv", "tagged_cash_flow.csv"]:
         file_path = os.path.join(tagged_data_dir, file_name)
         if os.path.exists(file_path):
-            logger.info(f"Processing file: {file_name}")
+            logger.info("Processing file: %s", file_name)
             data = pd.read_csv(file_path, index_col=0)
 
             # Calculate baselines for numeric columns
@@ -27,7 +29,7 @@ def calculate_baselines(tagged_data_dir):
                         baseline_value = data[column].mean()
                         baselines[column] = baseline_value
                 except Exception as e:
-                    logger.error(f"Error calculating baseline for column {column}: {e}")
+                    logger.error("Error calculating baseline for column %s: %s", column, e)
 
     return baselines
 
@@ -53,7 +55,7 @@ def save_scenarios(scenarios):
     output_file = "./data/outputs/dynamic_scenarios.csv"
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     scenarios.to_csv(output_file, index=False)
-    logger.info(f"Scenarios saved to {output_file}")
+    logger.info("Scenarios saved to %s", output_file)
 
 def main():
     """
@@ -63,15 +65,10 @@ def main():
 
     # Step 1: Calculate baselines
     baselines = calculate_baselines(tagged_data_dir)
-    logger.info(f"Baselines calculated: {baselines}")
+    logger.info("Baselines calculated: %s", baselines)
 
     # Step 2: Generate scenarios
-    thresholds = {
-        "Revenue Growth Rate": 0.02,
-        "COGS % Revenue": 0.05,
-        "CapEx Growth Rate": 0.01
-    }
-    scenarios = generate_scenarios(baselines, thresholds)
+    scenarios = generate_scenarios(baselines, DEFAULT_THRESHOLDS)
 
     # Step 3: Save scenarios
     save_scenarios(scenarios)
@@ -0,0 +1,202 @@
+# scripts/utilities/line_item_taxonomy.py
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Parent -> [(child, sign), ...] per statement, using the standard categories of line_item_dict.
+# yfinance reports costs and expenses as positives and cash outflows (CapEx, dividends) as negatives.
+TAXONOMY = {
+    'Income Statement': {
+        'Gross Profit': [('Revenue', 1), ('Cost of Goods Sold', -1)],
+        'Operating Expenses': [('Selling General and Administrative', 1), ('Research and Development', 1)],
+        'Operating Income': [('Gross Profit', 1), ('Operating Expenses', -1)],
+        'EBIT': [('Operating Income', 1), ('Other Income/Expense', 1)],
+        'Pretax Income': [('EBIT', 1), ('Interest Expense', -1)],
+        'Net Income': [('Pretax Income', 1), ('Income Tax Expense', -1)],
+    },
+    'Balance Sheet': {
+        'Total Current Assets': [
+            ('Cash and Cash Equivalents', 1), ('Short-Term Investments', 1),
+            ('Accounts Receivable', 1), ('Inventory', 1), ('Other Current Assets', 1),
+        ],
+        'Total Non-Current Assets': [
+            ('Long-Term Investments', 1), ('Property Plant and Equipment', 1), ('Goodwill', 1),
+            ('Intangible Assets', 1), ('Deferred Tax Assets', 1), ('Other Assets', 1),
+        ],
+        'Total Assets': [('Total Current Assets', 1), ('Total Non-Current Assets', 1)],
+        'Total Current Liabilities': [
+            ('Accounts Payable', 1), ('Short-Term Debt', 1), ('Other Current Liabilities', 1),
+        ],
+        'Total Non-Current Liabilities': [
+            ('Long-Term Debt', 1), ('Deferred Tax Liabilities', 1), ('Other Liabilities', 1),
+        ],
+        'Total Liabilities': [('Total Current Liabilities', 1), ('Total Non-Current Liabilities', 1)],
+        'Total Equity': [
+            ('Common Stock', 1), ('Retained Earnings', 1),
+            ('Accumulated Other Comprehensive Income', 1), ('Treasury Stock', -1),
+        ],
+        'Total Liabilities and Equity': [('Total Liabilities', 1), ('Total Equity', 1)],
+    },
+    'Cash Flow Statement': {
+        'Free Cash Flow': [('Net Cash Provided by Operating Activities', 1), ('Capital Expenditure', 1)],
+        'Net Change in Cash': [
+            ('Net Cash Provided by Operating Activities', 1),
+            ('Net Cash Used in Investing Activities', 1),
+            ('Net Cash Provided by Financing Activities', 1),
+        ],
+    },
+}
+
+def _flatten(taxonomy=None):
+    """Merges the per-statement hierarchies into one parent -> children map."""
+    taxonomy = taxonomy or TAXONOMY
+    return {parent: children for hierarchy in taxonomy.values() for parent, children in hierarchy.items()}
+
+def _expand(node, hierarchy, sign=1, path=()):
+    """Expands a node into its leaf categories with the product of signs along the path."""
+    if node in path:
+        raise ValueError(f"Cycle in line item taxonomy at {node}")
+    if node not in hierarchy:
+        return {node: sign}
+    leaves = {}
+    for child, child_sign in hierarchy[node]:
+        for leaf, leaf_sign in _expand(child, hierarchy, sign * child_sign, path + (node,)).items():
+            leaves[leaf] = leaves.get(leaf, 0) + leaf_sign
+    return leaves
+
+def taxonomy_categories(taxonomy=None):
+    """All categories referenced by the taxonomy, children before their parents."""
+    hierarchy = _flatten(taxonomy)
+    ordered = []
+
+    def visit(node):
+        for child, _ in hierarchy.get(node, []):
+            visit(child)
+        if node not in ordered:
+            ordered.append(node)
+
+    for parent in hierarchy:
+        visit(parent)
+    return ordered
+
+def aggregation_matrices(taxonomy=None):
+    """
+    Builds the sparse aggregation matrices over taxonomy_categories().
+
+    Returns:
+        tuple: (nodes, categories, direct, expanded) where `direct` maps each node to its
+        immediate children and `expanded` maps it to its leaf categories, both as
+        (nodes x categories) CSR matrices of signs.
+    """
+    hierarchy = _flatten(taxonomy)
+    categories = taxonomy_categories(taxonomy)
+    positions = {category: i for i, category in enumerate(categories)}
+    nodes = list(hierarchy)
+
+    def build(entries):
+        rows, cols, signs = [], [], []
+        for row, node in enumerate(nodes):
+            for category, sign in entries(node):
+                rows.append(row)
+                cols.append(positions[category])
+                signs.append(sign)
+        return sparse.csr_matrix((signs, (rows, cols)), shape=(len(nodes), len(categories)), dtype=float)
+
+    direct = build(lambda node: hierarchy[node])
+    expanded = build(lambda node: [(leaf, sign) for leaf, sign in _expand(node, hierarchy).items() if sign != 0])
+    return nodes, categories, direct, expanded
+
+def _rollup(values, present, matrix):
+    """Applies an aggregation matrix to every row; rows missing any required input become NaN."""
+    totals = (matrix @ np.where(present, values, 0.0).T).T
+    required = np.asarray(abs(matrix).sign().sum(axis=1)).ravel()
+    covered = (abs(matrix).sign() @ present.T.astype(float)).T
+    return np.where(covered == required, totals, np.nan)
+
+def panel_to_wide(panel, categories):
+    """Pivots a long panel into a (Ticker, Period) x category frame restricted to `categories`."""
+    if 'Ticker' not in panel.columns:
+        panel = panel.assign(Ticker='DEFAULT')
+    amounts = pd.to_numeric(panel['Amount'], errors='coerce')
+    wide = panel.assign(Amount=amounts).pivot_table(
+        index=['Ticker', 'Period'], columns='Category', values='Amount', aggfunc='last'
+    )
+    return wide.reindex(columns=categories)
+
+def compute_subtotals(panel, taxonomy=None):
+    """
+    Recomputes every subtotal and derived item (Gross Profit, EBIT, Free Cash Flow, ...)
+    for every ticker and period as sparse aggregation-matrix products.
+
+    Leaf-level rollups are preferred; when a leaf is missing the node falls back to its
+    immediate children as reported by the provider.
+
+    Returns:
+        pd.DataFrame: (Ticker, Period) x node frame of recomputed values.
+    """
+    nodes, categories, direct, expanded = aggregation_matrices(taxonomy)
+    wide = panel_to_wide(panel, categories)
+    values = wide.to_numpy(dtype=float)
+    present = ~np.isnan(values)
+
+    from_leaves = _rollup(values, present, expanded)
+    from_children = _rollup(values, present, direct)
+    recomputed = np.where(np.isnan(from_leaves), from_children, from_leaves)
+    return pd.DataFrame(recomputed, index=wide.index, columns=nodes)
+
+def check_subtotals(panel, tolerance=0.01, taxonomy=None):
+    """
+    Compares provider-reported subtotals with the subtotals recomputed from their children.
+
+    Returns:
+        pd.DataFrame: Ticker, Period, Category, Value (reported) and Expected (recomputed)
+        for every subtotal that differs by more than `tolerance` (relative).
+    """
+    nodes, categories, direct, _ = aggregation_matrices(taxonomy)
+    wide = panel_to_wide(panel, categories)
+    values = wide.to_numpy(dtype=float)
+    recomputed = _rollup(values, ~np.isnan(values), direct)
+    reported = wide[nodes].to_numpy(dtype=float)
+
+    mismatch = np.abs(reported - recomputed) > tolerance * np.maximum(np.abs(reported), 1.0)
+    rows, cols = np.nonzero(mismatch & ~np.isnan(reported) & ~np.isnan(recomputed))
+    index = wide.index[rows]
+    return pd.DataFrame({
+        'Ticker': index.get_level_values('Ticker'),
+        'Period': index.get_level_values('Period'),
+        'Category': np.array(nodes, dtype=object)[cols],
+        'Value': reported[rows, cols],
+        'Expected': recomputed[rows, cols],
+    })
+
+def fill_subtotals(panel, taxonomy=None):
+    """
+    Adds the subtotals a provider did not report, recomputed with compute_subtotals, so
+    every (Ticker, Period) carries e.g. Gross Profit when Revenue and COGS are known.
+    Reported values are never replaced.
+
+    Returns:
+        pd.DataFrame: The panel with one appended row per filled subtotal.
+    """
+    taxonomy = taxonomy or TAXONOMY
+    recomputed = compute_subtotals(panel, taxonomy)
+    reported = panel_to_wide(panel, list(recomputed.columns)).reindex(recomputed.index)
+    values = recomputed.to_numpy(dtype=float)
+    rows, cols = np.nonzero(np.isnan(reported.to_numpy(dtype=float)) & ~np.isnan(values))
+    if not len(rows):
+        return panel
+
+    statements = {parent: statement for statement, hierarchy in taxonomy.items() for parent in hierarchy}
+    nodes = np.array(recomputed.columns, dtype=object)[cols]
+    index = recomputed.index[rows]
+    filled = pd.DataFrame({
+        'Ticker': index.get_level_values('Ticker'),
+        'Statement Type': [statements[node] for node in nodes],
+        'Category': nodes,
+        'Period': index.get_level_values('Period'),
+        'Amount': values[rows, cols],
+    })
+    if 'Ticker' not in panel.columns:
+        filled = filled.drop(columns='Ticker')
+    return pd.concat([panel, filled], ignore_index=True)
@@ -0,0 +1,203 @@
+# scripts/utilities/logging_config.py
+
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+LOGGER_NAME = "FinancialModeling"
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Structured fields (ticker, stage, ...) attached to every record logged in the current context
+_log_context = contextvars.ContextVar('log_context', default={})
+_listener = None
+_lock = threading.Lock()
+
+class Lazy:
+    """Defers an expensive log argument (e.g. a DataFrame preview) until a handler formats the record."""
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __str__(self):
+        return str(self.func(*self.args))
+
+@contextmanager
+def log_context(**fields):
+    """Adds structured fields such as ticker=... to every record logged inside the block."""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+class ContextFilter(logging.Filter):
+    """Copies the current log context onto the record in the thread that logged it."""
+
+    def filter(self, record):
+        record.context = _log_context.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limits repeated messages. Records sharing a message template may pass `burst`
+    times per `window` seconds; after that only every `sample_every`-th one passes and
+    carries the number of records it stands for. Errors are never dropped.
+
+    Templates whose window has expired are evicted once more than `max_keys` are tracked.
+    """
+
+    def __init__(self, burst=20, window=60.0, sample_every=100, max_keys=10000):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.sample_every = sample_every
+        self.max_keys = max_keys
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def _evict(self, now):
+        self._counts = {
+            key: (started, count) for key, (started, count) in self._counts.items() if now - started <= self.window
+        }
+        if len(self._counts) > self.max_keys:
+            # Every tracked template is still inside its window; start over rather than grow
+            self._counts.clear()
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR:
+            return True
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            started, count = self._counts.get(key, (now, 0))
+            if now - started > self.window:
+                started, count = now, 0
+            count += 1
+            self._counts[key] = (started, count)
+            if len(self._counts) > self.max_keys:
+                self._evict(now)
+        if count <= self.burst:
+            return True
+        if (count - self.burst) % self.sample_every == 0:
+            record.sampled = self.sample_every
+            return True
+        return False
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        payload.update(getattr(record, 'context', {}))
+        if getattr(record, 'sampled', None):
+            payload['sampled'] = record.sampled
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+class ContextTextFormatter(logging.Formatter):
+    """The classic text format with any context fields appended."""
+
+    def format(self, record):
+        message = super().format(record)
+        context = getattr(record, 'context', {})
+        if context:
+            message += ' | ' + ' '.join(f'{key}={value}' for key, value in context.items())
+        return message
+
+def _output_handler(log_format):
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if log_format == 'json' else ContextTextFormatter(TEXT_FORMAT))
+    return handler
+
+def _queue_handler(log_queue, sampling):
+    handler = QueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    if sampling:
+        handler.addFilter(SamplingFilter())
+    return handler
+
+def configure_logging(level=logging.INFO, log_format=None, sampling=True):
+    """
+    Configures the shared "FinancialModeling" logger once per process and returns it.
+
+    Records are filtered (context, sampling) in the calling thread and handed to a
+    QueueHandler; a QueueListener thread formats and writes them, so callers never block
+    on I/O. The format is JSON unless FINANCIAL_MODELING_LOG_FORMAT=text.
+    """
+    global _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    with _lock:
+        if logger.handlers:
+            return logger
+        log_format = log_format or os.environ.get('FINANCIAL_MODELING_LOG_FORMAT', 'json')
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, _output_handler(log_format), respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        logger.addHandler(_queue_handler(log_queue, sampling))
+        logger.setLevel(level)
+        logger.propagate = False
+    return logger
+
+def _reset_after_fork():
+    """
+    Forked children (process pool workers) inherit the QueueHandler but not the listener
+    thread draining its queue, and exit without running atexit hooks. Their records are
+    written directly to the inherited stream instead.
+    """
+    global _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    if _listener is None or not any(isinstance(handler, QueueHandler) for handler in logger.handlers):
+        return
+    sampling = any(
+        isinstance(log_filter, SamplingFilter) for handler in logger.handlers for log_filter in handler.filters
+    )
+    output = _listener.handlers[0]
+    _listener = None
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    output.addFilter(ContextFilter())
+    if sampling:
+        output.addFilter(SamplingFilter())
+    logger.addHandler(output)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def start_process_log_listener(log_format=None):
+    """
+    Starts a listener for records sent by worker processes.
+
+    Returns:
+        tuple: (multiprocessing queue to pass to workers, listener to stop when the workers finish).
+    """
+    import multiprocessing
+    log_format = log_format or os.environ.get('FINANCIAL_MODELING_LOG_FORMAT', 'json')
+    log_queue = multiprocessing.Queue()
+    listener = QueueListener(log_queue, _output_handler(log_format), respect_handler_level=True)
+    listener.start()
+    return log_queue, listener
+
+def configure_worker_logging(log_queue, level=logging.INFO, sampling=True):
+    """Routes a worker process's "FinancialModeling" records to the parent's listener."""
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(_queue_handler(log_queue, sampling))
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
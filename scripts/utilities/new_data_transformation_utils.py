@@ -1,19 +1,9 @@
 import os
-import logging
 import pandas as pd
 from fuzzywuzzy import process
+from scripts.utilities.logging_config import configure_logging
 
-logger = logging.getLogger("FinancialModeling")
-logger.setLevel(logging.INFO)
-
-# Configure logging
-def configure_logging():
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        handler.setLevel(logging.INFO)
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+logger = configure_logging()
 
 # Get data paths
 def get_data_paths():
@@ -134,9 +124,9 @@ def archive_files(source_dir, archive_dir):
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 archived_file = f"{os.path.splitext(file)[0]}_{timestamp}.csv"
                 os.rename(file_path, os.path.join(archive_dir, archived_file))
-                logger.info(f"Archived: {file}")
+                logger.info("Archived: %s", file)
     except Exception as e:
-        logger.error(f"Error archiving files: {e}")
+        logger.error("Error archiving files: %s", e)
 
 # Pruning old archives
 def prune_archives(archive_dir, retention_days=30):
@@ -149,6 +139,6 @@ def prune_archives(archive_dir, retention_days=30):
             file_path = os.path.join(archive_dir, file)
             if os.path.isfile(file_path) and datetime.fromtimestamp(os.path.getmtime(file_path)) < cutoff_time:
                 os.remove(file_path)
-                logger.info(f"Pruned archive file: {file}")
+                logger.info("Pruned archive file: %s", file)
     except Exception as e:
-        logger.error(f"Error pruning archives: {e}")
+        logger.error("Error pruning archives: %s", e)
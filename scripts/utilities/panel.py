@@ -0,0 +1,109 @@
+# scripts/utilities/panel.py
+
+import os
+import re
+import pandas as pd
+from scripts.utilities.data_transformation_utils import get_data_paths, logger
+
+# Display labels used for the 'Statement Type' column across the pipeline
+STATEMENT_LABELS = {
+    'balance_sheet': 'Balance Sheet',
+    'income_statement': 'Income Statement',
+    'cash_flow': 'Cash Flow Statement',
+}
+
+# Column layout of the long statement panel
+PANEL_COLUMNS = ['Ticker', 'Statement Type', 'Category', 'Period', 'Amount']
+
+def find_tagged_files(processed_dir=None, default_ticker='DEFAULT'):
+    """
+    Lists the tagged statement files under the processed data directory.
+
+    Files written directly into the processed directory belong to `default_ticker`;
+    files in a per-ticker subdirectory (processed/<TICKER>/tagged_<statement>.csv)
+    belong to that ticker. generate_scripts archives the live files once a run has
+    loaded them, so a statement without a live file falls back to the newest copy in
+    that directory's archive folder. Every run archives under a new name, so callers
+    watching paths and mtimes also see later runs.
+
+    Returns:
+        list[tuple[str, str, str]]: (ticker, statement_type, file_path) entries.
+    """
+    if processed_dir is None:
+        _, processed_dir = get_data_paths()
+    if not os.path.isdir(processed_dir):
+        logger.warning("Processed data directory does not exist: %s", processed_dir)
+        return []
+
+    tagged_files = []
+    candidates = [(default_ticker, processed_dir)]
+    for entry in sorted(os.listdir(processed_dir)):
+        entry_path = os.path.join(processed_dir, entry)
+        if os.path.isdir(entry_path) and entry != 'archive':
+            candidates.append((entry, entry_path))
+
+    for ticker, directory in candidates:
+        archived = {statement_type: path for _, statement_type, path in find_archived_tagged_files(directory, ticker)}
+        for statement_type in STATEMENT_LABELS:
+            file_path = os.path.join(directory, f'tagged_{statement_type}.csv')
+            if os.path.isfile(file_path):
+                tagged_files.append((ticker, statement_type, file_path))
+            elif statement_type in archived:
+                tagged_files.append((ticker, statement_type, archived[statement_type]))
+    return tagged_files
+
+def find_archived_tagged_files(directory, ticker):
+    """
+    The newest archived copy of each tagged statement in directory/archive (archive_files
+    appends a _YYYYmmdd_HHMMSS timestamp, so names sort chronologically).
+
+    Returns:
+        list[tuple[str, str, str]]: (ticker, statement_type, file_path) entries.
+    """
+    archive_dir = os.path.join(directory, 'archive')
+    if not os.path.isdir(archive_dir):
+        return []
+    names = sorted(os.listdir(archive_dir))
+    archived = []
+    for statement_type in STATEMENT_LABELS:
+        pattern = re.compile(rf'^tagged_{statement_type}_\d{{8}}_\d{{6}}\.csv$')
+        matches = [name for name in names if pattern.match(name)]
+        if matches:
+            archived.append((ticker, statement_type, os.path.join(archive_dir, matches[-1])))
+    return archived
+
+def read_tagged_statement(file_path, statement_type, ticker):
+    """
+    Reads one tagged statement (Category x Period layout) into the long panel layout.
+
+    The 'Standardized Category' column is preferred over 'Category' when present.
+    Blank and non-numeric amounts are dropped.
+    """
+    df = pd.read_csv(file_path)
+    category_column = 'Standardized Category' if 'Standardized Category' in df.columns else 'Category'
+    period_columns = [col for col in df.columns if col not in ('Category', 'Standardized Category')]
+
+    long_df = df.melt(
+        id_vars=[category_column],
+        value_vars=period_columns,
+        var_name='Period',
+        value_name='Amount'
+    ).rename(columns={category_column: 'Category'})
+    long_df['Amount'] = pd.to_numeric(long_df['Amount'], errors='coerce')
+    long_df = long_df.dropna(subset=['Category', 'Amount'])
+
+    long_df['Ticker'] = ticker
+    long_df['Statement Type'] = STATEMENT_LABELS[statement_type]
+    return long_df[PANEL_COLUMNS].reset_index(drop=True)
+
+def load_tagged_panel(processed_dir=None, default_ticker='DEFAULT'):
+    """Loads every tagged statement into a single long panel with a Ticker column."""
+    frames = [
+        read_tagged_statement(file_path, statement_type, ticker)
+        for ticker, statement_type, file_path in find_tagged_files(processed_dir, default_ticker)
+    ]
+    if not frames:
+        return pd.DataFrame(columns=PANEL_COLUMNS)
+    panel = pd.concat(frames, ignore_index=True)
+    logger.info("Loaded tagged panel with %s tickers and %s rows.", panel['Ticker'].nunique(), len(panel))
+    return panel
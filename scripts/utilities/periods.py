@@ -0,0 +1,210 @@
+# scripts/utilities/periods.py
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+# Quarter labels such as "Q3 2023", "2023Q3", "2023-Q3" or "3Q23"
+_QUARTER_PATTERNS = [
+    re.compile(r'^Q([1-4])\s*[-/ ]?\s*((?:19|20)\d{2})$', re.IGNORECASE),
+    re.compile(r'^((?:19|20)\d{2})\s*[-/ ]?\s*Q([1-4])$', re.IGNORECASE),
+    re.compile(r'^([1-4])Q\s*(\d{2})$', re.IGNORECASE),
+]
+# Fiscal year labels such as "2023", "FY2023" or "FY 2023A"
+_YEAR_PATTERN = re.compile(r'^(?:FY\s*)?((?:19|20)\d{2})\s*[AE]?$', re.IGNORECASE)
+
+class FiscalPeriod(NamedTuple):
+    """A parsed period label. `quarter` is 0 for annual periods."""
+    label: str
+    end_date: pd.Timestamp
+    fiscal_year: int
+    quarter: int
+
+    @property
+    def canonical(self):
+        """Grid key shared by every company: "2023" for years, "2023Q3" for calendar quarters."""
+        if self.quarter:
+            return f'{self.end_date.year}Q{self.end_date.quarter}'
+        return str(self.fiscal_year)
+
+def snap_to_month_end(date):
+    """
+    Maps a period end date onto the nearest calendar month end.
+
+    52/53-week fiscal calendars end on a fixed weekday, so their period ends drift
+    around the month boundary (e.g. 2022-09-24, 2023-09-30, 2020-01-02). Dates in the
+    first week of a month belong to the previous month.
+    """
+    date = pd.Timestamp(date).normalize()
+    if date.day <= 7:
+        return date.replace(day=1) - pd.Timedelta(days=1)
+    return date + pd.offsets.MonthEnd(0)
+
+@lru_cache(maxsize=65536)
+def parse_period_label(label, quarterly=False):
+    """
+    Parses a provider period label into a FiscalPeriod. Memoized: every ticker of a
+    universe shares the same few dozen labels.
+
+    Args:
+        label: Column label such as "2023-09-30", "2023-09-30 00:00:00", "FY2023" or "Q3 2023".
+        quarterly (bool): Treat date labels as quarter ends rather than fiscal year ends.
+
+    Returns:
+        FiscalPeriod or None: None if the label is not a period.
+    """
+    text = str(label).strip()
+    for i, pattern in enumerate(_QUARTER_PATTERNS):
+        match = pattern.match(text)
+        if match:
+            if i == 0:
+                quarter, year = int(match.group(1)), int(match.group(2))
+            elif i == 1:
+                year, quarter = int(match.group(1)), int(match.group(2))
+            else:
+                quarter, year = int(match.group(1)), 2000 + int(match.group(2))
+            end_date = pd.Timestamp(year=year, month=3 * quarter, day=1) + pd.offsets.MonthEnd(0)
+            return FiscalPeriod(text, end_date, year, quarter)
+
+    match = _YEAR_PATTERN.match(text)
+    if match:
+        year = int(match.group(1))
+        return FiscalPeriod(text, pd.Timestamp(year=year, month=12, day=31), year, 0)
+
+    date = pd.to_datetime(text, errors='coerce')
+    if pd.isna(date):
+        return None
+    end_date = snap_to_month_end(date)
+    quarter = end_date.quarter if quarterly else 0
+    return FiscalPeriod(text, end_date, end_date.year, quarter)
+
+def reported_period_end(label):
+    """
+    The period end date as reported: the label's own date for date labels, without
+    snapping 52/53-week calendars to the month end, or the parsed end date otherwise.
+    None when the label is not a period.
+    """
+    period = parse_period_label(label)
+    if period is None:
+        return None
+    if _YEAR_PATTERN.match(period.label) or any(pattern.match(period.label) for pattern in _QUARTER_PATTERNS):
+        return period.end_date
+    return pd.Timestamp(period.label).normalize()
+
+def period_sort_key(label):
+    """Sort key ordering labels by period end; unparseable labels sort last, by text."""
+    period = parse_period_label(label)
+    if period is None:
+        return (1, pd.Timestamp.max, str(label))
+    return (0, period.end_date, str(label))
+
+def sort_period_labels(labels, descending=False):
+    """Sorts period labels chronologically instead of as strings."""
+    parsed = sorted(labels, key=period_sort_key)
+    if descending:
+        # Keep unparseable labels at the end either way
+        valid = [label for label in parsed if parse_period_label(label) is not None]
+        return valid[::-1] + parsed[len(valid):]
+    return parsed
+
+def latest_period_label(labels):
+    """The chronologically latest period label in a collection, or None when there is none."""
+    valid = [label for label in pd.unique(pd.Series(labels).dropna()) if parse_period_label(label) is not None]
+    return max(valid, key=period_sort_key) if valid else None
+
+def is_quarterly(labels):
+    """True when the parsed period ends are about a quarter apart."""
+    ends = sorted({p.end_date for p in map(parse_period_label, labels) if p is not None})
+    if len(ends) < 2:
+        return False
+    return float(np.median(np.diff(ends).astype('timedelta64[D]').astype(int))) < 135
+
+def normalize_periods(panel, quarterly=None, filing_date_column='Filing Date', keys=('Ticker', 'Statement Type', 'Category')):
+    """
+    Adds typed period columns to a long panel and drops superseded restatements.
+
+    Adds 'Period End' (snapped month end), 'Fiscal Year', 'Fiscal Quarter' and
+    'Canonical Period'; `quarterly` is inferred from each ticker's own period spacing when
+    omitted, so a quarterly filer keeps its quarters in a mostly annual panel. Rows whose
+    period cannot be parsed are dropped. When the same series `keys` and Period End appear
+    more than once (restatements, or two providers), the row with the latest
+    `filing_date_column` wins, falling back to the last occurrence when no filing date is
+    available.
+    """
+    tickers = panel['Ticker'] if 'Ticker' in panel.columns else pd.Series('', index=panel.index)
+    if quarterly is None:
+        # Decide per company: fiscal year-ends of different companies are also months apart
+        frequency = panel['Period'].groupby(tickers).agg(lambda periods: is_quarterly(pd.unique(periods)))
+        row_quarterly = tickers.map(frequency).astype(bool)
+    else:
+        row_quarterly = pd.Series(bool(quarterly), index=panel.index)
+
+    codes, pairs = pd.MultiIndex.from_arrays([panel['Period'], row_quarterly]).factorize()
+    parsed = [parse_period_label(label, bool(is_q)) for label, is_q in pairs]
+    valid = np.array([period is not None for period in parsed], dtype=bool)
+    kept = valid[codes]
+    result = panel[kept].copy()
+    codes = codes[kept]
+    take = lambda field: np.array([getattr(p, field) if p is not None else None for p in parsed], dtype=object)[codes]
+    result['Period End'] = pd.to_datetime(take('end_date'))
+    result['Fiscal Year'] = take('fiscal_year').astype(int)
+    result['Fiscal Quarter'] = take('quarter').astype(int)
+    result['Canonical Period'] = np.array([p.canonical if p is not None else None for p in parsed], dtype=object)[codes]
+    return dedupe_restatements(result, filing_date_column, keys)
+
+def dedupe_restatements(panel, filing_date_column='Filing Date', keys=('Ticker', 'Statement Type', 'Category')):
+    """
+    Keeps the latest filing per series `keys` and Period End. Rows of different fiscal
+    periods are never merged, even when they share a canonical label.
+    """
+    keys = [key for key in [*keys, 'Period End'] if key in panel.columns]
+    if filing_date_column in panel.columns:
+        order = pd.to_datetime(panel[filing_date_column], errors='coerce')
+        panel = panel.assign(_filed=order).sort_values('_filed', kind='stable', na_position='first')
+        panel = panel.drop(columns='_filed')
+    return panel.drop_duplicates(subset=keys, keep='last')
+
+class PeriodGrid:
+    """
+    The sorted canonical periods of a normalized panel, with an index for
+    constant-time label -> column lookups.
+    """
+
+    def __init__(self, canonical_periods):
+        self.periods = pd.Index(sorted(set(canonical_periods)))
+        self._positions = {period: i for i, period in enumerate(self.periods)}
+
+    def __len__(self):
+        return len(self.periods)
+
+    def positions(self, canonical_periods):
+        """Column position of every label (-1 when not on the grid)."""
+        return self.periods.get_indexer(canonical_periods)
+
+    def position(self, canonical_period):
+        return self._positions.get(canonical_period, -1)
+
+def align_panel(panel, keys=('Ticker', 'Statement Type', 'Category'), grid=None):
+    """
+    Scatters a normalized panel into a dense (series x canonical period) array.
+
+    Series and periods are factorized to integer codes and the amounts written with
+    one fancy-indexed assignment, so combining statements and peers never goes
+    through pairwise outer joins.
+
+    Returns:
+        tuple[pd.MultiIndex, PeriodGrid, np.ndarray]: Series keys, period grid and values (NaN where missing).
+    """
+    if 'Canonical Period' not in panel.columns:
+        panel = normalize_periods(panel)
+    grid = grid or PeriodGrid(panel['Canonical Period'])
+    series_codes, series = pd.MultiIndex.from_frame(panel[list(keys)]).factorize()
+    columns = grid.positions(panel['Canonical Period'])
+    on_grid = columns >= 0
+
+    values = np.full((len(series), len(grid)), np.nan)
+    values[series_codes[on_grid], columns[on_grid]] = pd.to_numeric(panel['Amount'], errors='coerce').to_numpy()[on_grid]
+    return pd.MultiIndex.from_tuples(series, names=list(keys)), grid, values
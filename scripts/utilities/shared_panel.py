@@ -0,0 +1,120 @@
+# scripts/utilities/shared_panel.py
+
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from scripts.utilities.data_transformation_utils import logger
+from scripts.utilities.periods import PeriodGrid, normalize_periods
+
+class SharedPanel:
+    """
+    The numeric statement panel as a (tickers x line items x periods) float64 array in
+    shared memory, with the labels of every axis. Line items are (Statement Type, Category)
+    pairs, so a category reported in two statements keeps both series. Periods are the
+    canonical grid of periods.normalize_periods ("2023", "2023Q3"), so tickers with
+    different fiscal year-ends share a column per fiscal period.
+
+    The publishing process owns the block and unlinks it on close(); workers attach
+    by handle and get zero-copy NumPy views, so no task ever pickles panel data.
+    """
+
+    def __init__(self, shm, shape, tickers, line_items, periods, owner):
+        self._shm = shm
+        self.values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        self.tickers = pd.Index(tickers)
+        self.line_items = pd.MultiIndex.from_tuples(line_items, names=['Statement Type', 'Category'])
+        self.periods = pd.Index(periods)
+        self.owner = owner
+
+    @classmethod
+    def publish(cls, panel):
+        """Copies a long panel (Ticker, Statement Type, Category, Period, Amount) into a new shared memory block."""
+        panel = normalize_periods(panel)
+        tickers = sorted(panel['Ticker'].unique())
+        keys = pd.MultiIndex.from_frame(panel[['Statement Type', 'Category']])
+        line_items = sorted(keys.unique())
+        periods = PeriodGrid(panel['Canonical Period']).periods
+        shape = (len(tickers), len(line_items), len(periods))
+
+        shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+        shared = cls(shm, shape, tickers, line_items, periods, owner=True)
+        shared.values.fill(np.nan)
+        shared.values[
+            shared.tickers.get_indexer(panel['Ticker']),
+            shared.line_items.get_indexer(keys),
+            shared.periods.get_indexer(panel['Canonical Period'])
+        ] = pd.to_numeric(panel['Amount'], errors='coerce').to_numpy()
+        logger.info("Published panel %s (%.1f MB) to shared memory %s.", shape, shm.size / 1e6, shm.name)
+        return shared
+
+    @property
+    def handle(self):
+        """Small picklable description used by workers to attach."""
+        return {
+            'name': self._shm.name,
+            'shape': self.values.shape,
+            'tickers': list(self.tickers),
+            'line_items': list(self.line_items),
+            'periods': list(self.periods),
+        }
+
+    @classmethod
+    def attach(cls, handle):
+        """Maps a block published by the parent process (pool workers of the publisher)."""
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=handle['name'], track=False)
+        else:
+            # Pool workers share the publisher's resource tracker, so registering the
+            # block again is a no-op and only the publisher's unlink frees it
+            shm = shared_memory.SharedMemory(name=handle['name'])
+        return cls(shm, tuple(handle['shape']), handle['tickers'], handle['line_items'], handle['periods'], owner=False)
+
+    def series(self, ticker, category, statement=None):
+        """
+        One ticker's line item across periods, as a view. `statement` may be omitted when
+        the category appears in only one statement.
+        """
+        if statement is None:
+            statements = self.line_items.get_level_values('Statement Type')[
+                self.line_items.get_level_values('Category') == category
+            ]
+            if len(statements) != 1:
+                raise KeyError(f"Category {category!r} is in {len(statements)} statements; pass statement.")
+            statement = statements[0]
+        return self.values[self.tickers.get_loc(ticker), self.line_items.get_loc((statement, category))]
+
+    def close(self):
+        """Releases this process's mapping; the publisher also frees the block."""
+        self.values = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# Panel attached once per worker process
+_WORKER_PANEL = None
+
+def _attach_worker(handle):
+    global _WORKER_PANEL
+    _WORKER_PANEL = SharedPanel.attach(handle)
+
+def _run_with_panel(args):
+    func, item = args
+    return func(_WORKER_PANEL, item)
+
+def map_shared(func, shared, items, max_workers=None):
+    """
+    Runs func(panel, item) for every item in a process pool whose workers attach to the
+    shared panel once, at start-up. `func` must be a module-level function.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach_worker, initargs=(shared.handle,)) as executor:
+        return list(executor.map(_run_with_panel, [(func, item) for item in items]))
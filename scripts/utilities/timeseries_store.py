@@ -0,0 +1,175 @@
+# scripts/utilities/timeseries_store.py
+
+import os
+import json
+import glob
+import shutil
+import numpy as np
+import pandas as pd
+from scripts.utilities.data_transformation_utils import get_data_paths, logger
+
+_EPOCH = np.datetime64('1970-01-01', 'D')
+
+def to_days(dates):
+    """Dates as int64 days since 1970-01-01."""
+    return (pd.DatetimeIndex(dates).to_numpy(dtype='datetime64[D]') - _EPOCH).astype(np.int64)
+
+def default_store_path():
+    raw_data_dir, _ = get_data_paths()
+    return os.path.join(os.path.dirname(raw_data_dir), 'market')
+
+class TimeSeriesStore:
+    """
+    Append-only store of daily (ticker, date, value) series, one directory per field.
+
+    Every append writes a new compressed segment (seg_<n>.npz) and never touches
+    existing files. compact() merges the compacted arrays and all segments into a new
+    version directory (v_<n>/) holding days.npy / values.npy sorted by (ticker, date) plus
+    per-ticker offsets, which are read back memory-mapped. index.json names the current
+    version and is swapped last, so readers see either the old or the new version whole.
+    Later segments win when the same ticker and date repeat.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or default_store_path()
+
+    def _field_dir(self, field):
+        return os.path.join(self.root, field)
+
+    def _segments(self, field):
+        return sorted(glob.glob(os.path.join(self._field_dir(field), 'seg_*.npz')))
+
+    def append(self, field, tickers, dates, values):
+        """Writes one segment; `tickers`, `dates` and `values` are equal-length sequences."""
+        directory = self._field_dir(field)
+        os.makedirs(directory, exist_ok=True)
+        segments = self._segments(field)
+        sequence = int(os.path.basename(segments[-1])[4:-4]) + 1 if segments else 0
+        path = os.path.join(directory, f'seg_{sequence:08d}.npz')
+        np.savez_compressed(
+            path,
+            tickers=np.asarray(tickers, dtype=str),
+            days=to_days(dates),
+            values=np.asarray(values, dtype=float)
+        )
+        return path
+
+    def _read_index(self, field):
+        index_path = os.path.join(self._field_dir(field), 'index.json')
+        if not os.path.isfile(index_path):
+            return None
+        with open(index_path) as f:
+            return json.load(f)
+
+    def _version_dir(self, field, index):
+        """Directory of the compacted arrays an index points at (the field directory before versioning)."""
+        version = index.get('version')
+        directory = self._field_dir(field)
+        return directory if version is None else os.path.join(directory, f'v_{version:08d}')
+
+    def _load_compacted(self, field):
+        index = self._read_index(field)
+        if index is None:
+            return [], np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+        directory = self._version_dir(field, index)
+        offsets = np.load(os.path.join(directory, 'offsets.npy'))
+        days = np.load(os.path.join(directory, 'days.npy'), mmap_mode='r')
+        values = np.load(os.path.join(directory, 'values.npy'), mmap_mode='r')
+        return index['tickers'], offsets, days, values
+
+    def _merge(self, field):
+        """Compacted data plus pending segments as sorted, de-duplicated flat arrays."""
+        tickers, offsets, days, values = self._load_compacted(field)
+        segments = self._segments(field)
+        if not segments:
+            return tickers, offsets, days, values, segments
+
+        names = [np.repeat(np.array(tickers, dtype=str), np.diff(offsets))]
+        all_days, all_values = [np.asarray(days)], [np.asarray(values)]
+        for path in segments:
+            with np.load(path) as segment:
+                names.append(segment['tickers'])
+                all_days.append(segment['days'])
+                all_values.append(segment['values'])
+        names, all_days, all_values = np.concatenate(names), np.concatenate(all_days), np.concatenate(all_values)
+
+        universe, codes = np.unique(names, return_inverse=True)
+        order = np.lexsort((np.arange(len(codes)), all_days, codes))
+        codes, all_days, all_values = codes[order], all_days[order], all_values[order]
+        # Keep the last write of every (ticker, date)
+        last = np.ones(len(codes), dtype=bool)
+        last[:-1] = (codes[1:] != codes[:-1]) | (all_days[1:] != all_days[:-1])
+        codes, all_days, all_values = codes[last], all_days[last], all_values[last]
+        offsets = np.searchsorted(codes, np.arange(len(universe) + 1))
+        return list(universe), offsets, all_days, all_values, segments
+
+    def compact(self, field):
+        """
+        Writes the merged field to a new version directory, points index.json at it with one
+        atomic replace, and only then removes the previous version and the merged segments.
+        """
+        previous = self._read_index(field)
+        tickers, offsets, days, values, segments = self._merge(field)
+        if not segments:
+            return
+        directory = self._field_dir(field)
+        version = 0 if previous is None else previous.get('version', -1) + 1
+        # mkdir fails if a concurrent compaction already claimed this version
+        version_dir = os.path.join(directory, f'v_{version:08d}')
+        os.mkdir(version_dir)
+        for name, array in [('offsets', offsets), ('days', days), ('values', values)]:
+            np.save(os.path.join(version_dir, f'{name}.npy'), np.asarray(array))
+        with open(os.path.join(directory, 'index.tmp.json'), 'w') as f:
+            json.dump({'version': version, 'tickers': tickers}, f)
+        os.replace(os.path.join(directory, 'index.tmp.json'), os.path.join(directory, 'index.json'))
+
+        if previous is not None:
+            previous_dir = self._version_dir(field, previous)
+            if previous_dir == directory:
+                for name in ['offsets', 'days', 'values']:
+                    os.remove(os.path.join(directory, f'{name}.npy'))
+            else:
+                shutil.rmtree(previous_dir, ignore_errors=True)
+        for path in segments:
+            os.remove(path)
+        logger.info("Compacted %s: %d tickers, %d points from %d segments.", field, len(tickers), len(days), len(segments))
+
+    def read(self, field, ticker):
+        """One ticker's series as a date-indexed pd.Series."""
+        tickers, offsets, days, values, _ = self._merge(field)
+        if ticker not in tickers:
+            return pd.Series(dtype=float)
+        i = tickers.index(ticker)
+        start, end = offsets[i], offsets[i + 1]
+        index = pd.DatetimeIndex(np.asarray(days[start:end]) + _EPOCH)
+        return pd.Series(np.asarray(values[start:end]), index=index, name=field)
+
+    def last_dates(self, field):
+        """Ticker -> last stored date."""
+        tickers, offsets, days, _, _ = self._merge(field)
+        return {
+            ticker: pd.Timestamp(_EPOCH + days[offsets[i + 1] - 1])
+            for i, ticker in enumerate(tickers) if offsets[i + 1] > offsets[i]
+        }
+
+    def asof(self, field, tickers, dates):
+        """
+        As-of join: the last value on or before each (ticker, date) query, NaN when none.
+
+        All series live in one array sorted by (ticker, date), so queries for the whole
+        universe are answered by a single searchsorted on a composite (ticker, day) key.
+        """
+        universe, offsets, days, values, _ = self._merge(field)
+        query_days = to_days(dates)
+        positions = {ticker: i for i, ticker in enumerate(universe)}
+        codes = np.array([positions.get(ticker, -1) for ticker in tickers], dtype=np.int64)
+        if not len(days):
+            return np.full(len(codes), np.nan)
+
+        # Days since epoch fit far below 2**32, so (code << 32) + day sorts like (ticker, date)
+        stored_codes = np.repeat(np.arange(len(universe), dtype=np.int64), np.diff(offsets))
+        keys = (stored_codes << 32) + np.asarray(days, dtype=np.int64)
+        found = np.searchsorted(keys, (np.maximum(codes, 0) << 32) + query_days, side='right') - 1
+        valid = (codes >= 0) & (found >= 0)
+        valid &= stored_codes[np.maximum(found, 0)] == codes
+        return np.where(valid, np.asarray(values)[np.maximum(found, 0)], np.nan)
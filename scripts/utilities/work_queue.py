@@ -0,0 +1,181 @@
+# scripts/utilities/work_queue.py
+
+import os
+import time
+import sqlite3
+from contextlib import contextmanager
+from scripts.utilities.data_transformation_utils import logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticker TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    duration REAL,
+    worker TEXT,
+    error TEXT,
+    UNIQUE (ticker, stage)
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_claim ON tasks (status, priority DESC, not_before);
+"""
+
+class WorkQueue:
+    """
+    Durable (ticker, stage) task queue stored in a local SQLite database.
+
+    Tasks move pending -> running -> done | failed. A failed attempt returns the
+    task to pending with an exponential backoff until `max_attempts` is reached.
+    Because all state is on disk, a crashed or interrupted run resumes by calling
+    `requeue_running()` and starting the workers again.
+    """
+
+    def __init__(self, db_path, max_attempts=3, backoff_seconds=30.0):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Autocommit connection that is closed on exit; WAL lets workers read while one writes."""
+        connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def enqueue(self, ticker, stage, priority=0):
+        """Adds a task unless the (ticker, stage) pair is already queued."""
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO tasks (ticker, stage, priority, enqueued_at) VALUES (?, ?, ?, ?)",
+                (ticker, stage, priority, time.time())
+            )
+
+    def start_pipeline(self, ticker, first_stage, priority=0):
+        """
+        Starts a new pipeline run for a ticker unless one is still unfinished.
+
+        A ticker with pending or running tasks (an interrupted run) is left to resume.
+        Otherwise its done and failed tasks from earlier runs are dropped and the first
+        stage is enqueued again, so every batch reprocesses and retries its tickers.
+
+        Returns:
+            bool: True when a new run was started, False when an unfinished one resumes.
+        """
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                unfinished = connection.execute(
+                    "SELECT COUNT(*) FROM tasks WHERE ticker = ? AND status IN ('pending', 'running')", (ticker,)
+                ).fetchone()[0]
+                if not unfinished:
+                    connection.execute("DELETE FROM tasks WHERE ticker = ?", (ticker,))
+                    connection.execute(
+                        "INSERT INTO tasks (ticker, stage, priority, enqueued_at) VALUES (?, ?, ?, ?)",
+                        (ticker, first_stage, priority, time.time())
+                    )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        return not unfinished
+
+    def claim(self, worker):
+        """
+        Atomically claims the highest-priority runnable task.
+
+        Returns:
+            dict or None: The claimed task, or None if nothing is runnable right now.
+        """
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT * FROM tasks WHERE status = 'pending' AND not_before <= ? "
+                    "ORDER BY priority DESC, id LIMIT 1",
+                    (time.time(),)
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        "UPDATE tasks SET status = 'running', started_at = ?, worker = ? WHERE id = ?",
+                        (time.time(), worker, row['id'])
+                    )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        return dict(row) if row is not None else None
+
+    def complete(self, task_id):
+        """Marks a task as done and records its duration."""
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE tasks SET status = 'done', finished_at = ?, duration = ? - started_at, error = NULL "
+                "WHERE id = ?",
+                (now, now, task_id)
+            )
+
+    def fail(self, task_id, error):
+        """Records a failed attempt and schedules a retry with exponential backoff."""
+        now = time.time()
+        with self._connect() as connection:
+            attempts = connection.execute("SELECT attempts FROM tasks WHERE id = ?", (task_id,)).fetchone()[0] + 1
+            if attempts >= self.max_attempts:
+                status, not_before = 'failed', now
+            else:
+                status, not_before = 'pending', now + self.backoff_seconds * 2 ** (attempts - 1)
+            connection.execute(
+                "UPDATE tasks SET status = ?, attempts = ?, not_before = ?, finished_at = ?, "
+                "duration = ? - started_at, error = ? WHERE id = ?",
+                (status, attempts, not_before, now, now, str(error), task_id)
+            )
+        return status
+
+    def requeue_running(self):
+        """Returns tasks left 'running' by a crashed or interrupted run to the pending state."""
+        with self._connect() as connection:
+            count = connection.execute("UPDATE tasks SET status = 'pending' WHERE status = 'running'").rowcount
+        if count:
+            logger.info("Requeued %s interrupted tasks.", count)
+        return count
+
+    def next_retry_in(self):
+        """Seconds until the next backed-off task becomes runnable, or None if no task is pending."""
+        with self._connect() as connection:
+            row = connection.execute("SELECT MIN(not_before) FROM tasks WHERE status = 'pending'").fetchone()
+        if row[0] is None:
+            return None
+        return max(row[0] - time.time(), 0.0)
+
+    def has_unfinished(self):
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'running')"
+            ).fetchone()
+        return row[0] > 0
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM tasks")
+
+    def summary(self):
+        """Task counts and total duration by stage and status."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT stage, status, COUNT(*) AS tasks, SUM(duration) AS seconds "
+                "FROM tasks GROUP BY stage, status ORDER BY stage, status"
+            ).fetchall()
+        return [dict(row) for row in rows]
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from scripts.outputs.analytical_store import AnalyticalStore
+
+def _panel(amounts):
+    return pd.DataFrame({
+        'Ticker': 'AAA',
+        'Statement Type': 'Income Statement',
+        'Category': ['Revenue', 'Net Income'][:len(amounts)],
+        'Period': '2023-12-31',
+        'Amount': amounts,
+    })
+
+def test_upsert_is_idempotent(tmp_path):
+    store = AnalyticalStore(str(tmp_path / 'analytics.sqlite'))
+    assert store.upsert_statements(_panel([100.0, 10.0])) == 2
+    assert store.upsert_statements(_panel([100.0, 10.0])) == 0
+    assert store.upsert_statements(_panel([120.0, 10.0])) == 1
+    stored = store.query("SELECT category, amount FROM statements ORDER BY category")
+    assert stored.to_dict('records') == [
+        {'category': 'Net Income', 'amount': 10.0},
+        {'category': 'Revenue', 'amount': 120.0},
+    ]
+
+def test_conflicting_keys_are_not_written(tmp_path):
+    store = AnalyticalStore(str(tmp_path / 'analytics.sqlite'))
+    panel = pd.concat([_panel([100.0]), _panel([80.0]), _panel([10.0, 10.0]).iloc[[1]]], ignore_index=True)
+    assert store.upsert_statements(panel) == 1
+    assert store.query("SELECT category FROM statements")['category'].tolist() == ['Net Income']
+
+def test_repeated_rows_are_written_once(tmp_path):
+    store = AnalyticalStore(str(tmp_path / 'analytics.sqlite'))
+    assert store.upsert_statements(pd.concat([_panel([100.0])] * 2, ignore_index=True)) == 1
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from scripts.analysis.backtesting import run_backtest
+
+def _panel(series):
+    rows = [
+        (ticker, 'Income Statement', 'Revenue', period, amount)
+        for ticker, periods in series.items() for period, amount in periods
+    ]
+    return pd.DataFrame(rows, columns=['Ticker', 'Statement Type', 'Category', 'Period', 'Amount'])
+
+def test_staggered_fiscal_years_are_scored_on_their_own_next_periods():
+    panel = _panel({
+        'DEC': [(f'{2016 + i}-12-31', 100.0 + 10 * i) for i in range(7)],
+        'SEP': [(f'{2016 + i}-09-30', 200.0 + 20 * i) for i in range(7)],
+    })
+    report, detail = run_backtest(panel, horizon=2, min_history=3, methods=['linear'], max_workers=1)
+    assert np.allclose(report['MAPE'], 0.0)
+    # Both tickers are scored at every cutoff: 4 cutoffs for step 1, 3 for step 2
+    assert report.set_index('Step')['Observations'].to_dict() == {1: 8, 2: 6}
+    assert sorted(detail['Cutoff'].unique()) == [1, 2, 3, 4]
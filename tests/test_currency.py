@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.utilities import currency
+from scripts.utilities.currency import FxTable, convert_panel, load_reporting_currency, record_reporting_currency
+
+def _fx():
+    dates = pd.date_range('2022-01-01', '2022-12-31', freq='D')
+    rates = np.where(dates <= pd.Timestamp('2022-09-24'), 1.0, 2.0)
+    return FxTable(pd.DataFrame({'Date': dates, 'Currency': 'eur', 'Rate': rates}))
+
+def test_closing_and_average_rates():
+    fx = _fx()
+    ends = pd.DatetimeIndex(['2021-12-31', '2022-09-24', '2022-12-31'])
+    np.testing.assert_allclose(fx.closing_rates('EUR', ends), [np.nan, 1.0, 2.0])
+    np.testing.assert_allclose(fx.average_rates('EUR', ends[2:], months=3), [2.0])
+    assert fx.rate_vector('EUR', ends, 'closing') is fx.rate_vector('EUR', ends, 'closing')
+    with pytest.raises(KeyError):
+        fx.closing_rates('GBP', ends)
+
+def test_stocks_convert_at_the_reported_period_end():
+    panel = pd.DataFrame({
+        'Ticker': ['EEE', 'EEE', 'USA'],
+        'Statement Type': ['Balance Sheet', 'Income Statement', 'Balance Sheet'],
+        'Category': ['Total Assets', 'Revenue', 'Total Assets'],
+        'Period': ['2022-09-24', '2022-09-24', '2022-09-24'],
+        'Amount': [10.0, 10.0, 10.0],
+    })
+    converted = convert_panel(panel, _fx(), currencies={'EEE': 'EUR'})
+    # The closing rate is the one on 2022-09-24, not on the snapped month end (2022-09-30)
+    assert converted['Amount'].tolist() == [10.0, 10.0, 10.0]
+    assert converted['Reporting Currency'].tolist() == ['EUR', 'EUR', 'USD']
+
+def test_reporting_currency_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(currency, 'get_data_paths', lambda ticker=None: (str(tmp_path / 'raw' / (ticker or '')), ''))
+    assert load_reporting_currency('EEE') == 'USD'
+    record_reporting_currency('EEE', 'eur')
+    assert load_reporting_currency('EEE') == 'EUR'
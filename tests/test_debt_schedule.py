@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.models.debt_schedule import debt_inputs_from_panel, solve_debt_schedule, tranche_schedule
+
+def test_tranches_amortize_and_accrue_on_average_balances():
+    closing, repayments, interest = tranche_schedule(
+        np.array([[100.0]]), np.array([[[50.0, 50.0, 50.0]]]), np.array([[0.1]])
+    )
+    np.testing.assert_allclose(closing[0, 0], [50.0, 0.0, 0.0])
+    np.testing.assert_allclose(repayments[0, 0], [50.0, 50.0, 0.0])
+    np.testing.assert_allclose(interest[0, 0], [7.5, 2.5, 0.0])
+
+def test_circular_schedule_converges_to_a_consistent_fixed_point():
+    cash_flow = np.array([[-40.0, 10.0, 30.0], [20.0, 20.0, 20.0]])
+    results, report = solve_debt_schedule(
+        cash_flow=cash_flow,
+        opening_cash=[10.0, 50.0],
+        minimum_cash=[5.0, 10.0],
+        tranche_balances=np.array([[100.0], [0.0]]),
+        tranche_amortization=np.array([[[10.0, 10.0, 10.0]], [[0.0, 0.0, 0.0]]]),
+        tranche_rates=np.array([[0.06], [0.0]]),
+        revolver_balance=[0.0, 0.0],
+        revolver_rate=[0.08, 0.08],
+        revolver_capacity=[100.0, 100.0],
+        cash_rate=0.02,
+        tax_rate=0.25,
+    )
+    assert report['Converged'].all()
+
+    # Cash rolls forward from the converged interest, repayments and revolver draws
+    cash = results['Cash']
+    opening = np.column_stack([[10.0, 50.0], cash[:, :-1]])
+    expected = (opening + cash_flow - results['Net Interest Expense'] * 0.75
+                - results['Mandatory Repayments'] + results['Revolver Draw'])
+    np.testing.assert_allclose(cash, expected)
+    # The first ticker draws on the revolver to hold its minimum cash and repays it later
+    assert results['Revolver Balance'][0, 0] > 0
+    assert cash[0, 0] == pytest.approx(5.0)
+    assert (results['Revolver Draw'][1] == 0).all()
+
+def test_inputs_use_the_chronologically_latest_balances():
+    panel = pd.DataFrame({
+        'Ticker': 'AAA',
+        'Category': ['Long-Term Debt', 'Long-Term Debt', 'Cash and Cash Equivalents', 'Cash and Cash Equivalents'],
+        'Period': ['FY2024', 'FY2023', 'FY2024', 'FY2023'],
+        'Amount': [60.0, 80.0, 20.0, 30.0],
+    })
+    tickers, inputs = debt_inputs_from_panel(panel, forecast_periods=2, long_term_years=2)
+    assert tickers == ['AAA']
+    np.testing.assert_allclose(inputs['tranche_balances'], [[0.0, 60.0]])
+    np.testing.assert_allclose(inputs['opening_cash'], [20.0])
+    np.testing.assert_allclose(inputs['tranche_amortization'][0, 1], [30.0, 30.0])
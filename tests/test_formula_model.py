@@ -0,0 +1,16 @@
+import pandas as pd
+
+from scripts.outputs.formula_model import historical_from_panel
+
+def test_historical_periods_are_chronological():
+    periods = ['Q4 2023', 'Q1 2024', 'Q2 2023', 'Q3 2023']
+    panel = pd.DataFrame({
+        'Ticker': 'AAA',
+        'Statement Type': 'Income Statement',
+        'Category': 'Revenue',
+        'Period': periods,
+        'Amount': [4.0, 5.0, 2.0, 3.0],
+    })
+    historical = historical_from_panel(panel, 'AAA')
+    assert list(historical.columns) == ['Q2 2023', 'Q3 2023', 'Q4 2023', 'Q1 2024']
+    assert list(historical.loc['Revenue']) == [2.0, 3.0, 4.0, 5.0]
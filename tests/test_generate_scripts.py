@@ -0,0 +1,51 @@
+import os
+
+import pandas as pd
+import pytest
+
+from scripts import generate_scripts
+
+PERIODS = ['2023-12-31', '2022-12-31']
+
+def _write(directory, statement_type, rows):
+    frame = pd.DataFrame(
+        [(label, *amounts) for label, amounts in rows.items()], columns=['Category', *PERIODS]
+    )
+    frame['Standardized Category'] = frame['Category']
+    frame.to_csv(os.path.join(directory, f'tagged_{statement_type}.csv'), index=False)
+
+@pytest.fixture
+def processed_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'processed'
+    directory.mkdir()
+    monkeypatch.setattr(generate_scripts, 'get_data_paths', lambda ticker=None: (str(tmp_path / 'raw'), str(directory)))
+    _write(directory, 'income_statement', {'Revenue': (100.0, 90.0), 'Net Income': (10.0, 9.0)})
+    _write(directory, 'cash_flow', {'Free Cash Flow': (8.0, 7.0)})
+    return directory
+
+def test_clean_statements_get_a_baseline(processed_dir):
+    _write(processed_dir, 'balance_sheet', {
+        'Total Assets': (50.0, 40.0), 'Total Liabilities': (30.0, 25.0), 'Total Equity': (20.0, 15.0),
+    })
+    assert generate_scripts.main() is True
+    baseline = pd.read_csv(processed_dir / 'baseline_values.csv')
+    assert dict(zip(baseline['Category'], baseline['Amount']))['Revenue'] == 95.0
+
+def test_identity_errors_quarantine_the_baseline(processed_dir):
+    (processed_dir / 'baseline_values.csv').write_text('Category,Statement Type,Amount\nRevenue,Income Statement,1\n')
+    _write(processed_dir, 'balance_sheet', {
+        'Total Assets': (80.0, 40.0), 'Total Liabilities': (30.0, 25.0), 'Total Equity': (20.0, 15.0),
+    })
+    assert generate_scripts.main() is False
+    assert not (processed_dir / 'baseline_values.csv').exists()
+    violations = pd.read_csv(processed_dir / 'validation_violations.csv')
+    assert violations['Rule'].tolist() == ['Balance Sheet Identity']
+
+def test_missing_subtotals_are_filled_before_the_baseline(processed_dir):
+    _write(processed_dir, 'income_statement', {'Revenue': (100.0, 90.0), 'Cost of Goods Sold': (60.0, 50.0)})
+    _write(processed_dir, 'balance_sheet', {
+        'Total Assets': (50.0, 40.0), 'Total Liabilities': (30.0, 25.0), 'Total Equity': (20.0, 15.0),
+    })
+    assert generate_scripts.main() is True
+    baseline = pd.read_csv(processed_dir / 'baseline_values.csv')
+    assert dict(zip(baseline['Category'], baseline['Amount']))['Gross Profit'] == 40.0
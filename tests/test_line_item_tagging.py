@@ -0,0 +1,35 @@
+import pandas as pd
+
+from scripts.data_preprocessing.transform_plans import tag_labels
+from scripts.utilities.data_transformation_utils import line_item_dict, tag_line_item_indices
+
+# yfinance labels of one income statement and one cash flow statement
+RAW_LABELS = [
+    'Total Revenue', 'Operating Revenue', 'Cost Of Revenue', 'Gross Profit', 'Net Income',
+    'Net Income From Continuing Operations', 'Operating Cash Flow', 'Investing Cash Flow',
+    'Financing Cash Flow', 'Free Cash Flow', 'Capital Expenditure',
+]
+
+def test_distinct_raw_lines_never_merge():
+    tagged = tag_labels(pd.DataFrame({'Category': RAW_LABELS}), line_item_dict)
+    assert tagged['Standardized Category'].is_unique
+
+def test_aliases_map_to_their_own_category():
+    tagged = tag_labels(pd.DataFrame({'Category': RAW_LABELS}), line_item_dict)
+    tags = dict(zip(tagged['Category'], tagged['Standardized Category']))
+    assert tags['Total Revenue'] == 'Revenue'
+    assert tags['Cost Of Revenue'] == 'Cost of Goods Sold'
+    assert tags['Operating Cash Flow'] == 'Net Cash Provided by Operating Activities'
+    assert tags['Investing Cash Flow'] == 'Net Cash Used in Investing Activities'
+    assert tags['Financing Cash Flow'] == 'Net Cash Provided by Financing Activities'
+
+def test_unmatched_labels_stay_raw():
+    tagged = tag_labels(pd.DataFrame({'Category': RAW_LABELS}), line_item_dict)
+    tags = dict(zip(tagged['Category'], tagged['Standardized Category']))
+    assert tags['Operating Revenue'] == 'Operating Revenue'
+    assert tags['Net Income From Continuing Operations'] == 'Net Income From Continuing Operations'
+
+def test_best_ranked_label_wins_a_shared_category():
+    # 'Revenue' is the category name itself, 'Total Revenue' only an alias
+    tagged = tag_line_item_indices(pd.DataFrame({'Category': ['Total Revenue', 'Revenue']}), line_item_dict)
+    assert list(tagged['Standardized Category']) == ['Total Revenue', 'Revenue']
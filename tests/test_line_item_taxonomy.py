@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+from scripts.utilities.line_item_taxonomy import check_subtotals, compute_subtotals, fill_subtotals
+
+def _panel(rows):
+    return pd.DataFrame(rows, columns=['Ticker', 'Statement Type', 'Category', 'Period', 'Amount'])
+
+INCOME = [
+    ('AAA', 'Income Statement', 'Revenue', '2023', 100.0),
+    ('AAA', 'Income Statement', 'Cost of Goods Sold', '2023', 60.0),
+    ('AAA', 'Income Statement', 'Selling General and Administrative', '2023', 15.0),
+    ('AAA', 'Income Statement', 'Research and Development', '2023', 5.0),
+    ('BBB', 'Income Statement', 'Gross Profit', '2024', 30.0),
+    ('BBB', 'Income Statement', 'Operating Expenses', '2024', 10.0),
+]
+
+def test_subtotals_roll_up_from_leaves_or_reported_children():
+    subtotals = compute_subtotals(_panel(INCOME))
+    assert subtotals.loc[('AAA', '2023'), 'Operating Income'] == pytest.approx(20.0)
+    # BBB reports no leaves, so Operating Income falls back to its reported children
+    assert subtotals.loc[('BBB', '2024'), 'Operating Income'] == pytest.approx(20.0)
+    assert pd.isna(subtotals.loc[('BBB', '2024'), 'Net Income'])
+
+def test_check_flags_only_inconsistent_reported_subtotals():
+    panel = _panel(INCOME + [
+        ('AAA', 'Income Statement', 'Gross Profit', '2023', 40.0),
+        ('AAA', 'Income Statement', 'Operating Expenses', '2023', 25.0),
+    ])
+    mismatches = check_subtotals(panel)
+    assert mismatches[['Ticker', 'Category', 'Value', 'Expected']].values.tolist() == [
+        ['AAA', 'Operating Expenses', 25.0, 20.0],
+    ]
+
+def test_fill_adds_missing_subtotals_without_replacing_reported_ones():
+    panel = _panel(INCOME + [('AAA', 'Income Statement', 'Gross Profit', '2023', 41.0)])
+    filled = fill_subtotals(panel)
+    added = filled.iloc[len(panel):].set_index(['Ticker', 'Category'])['Amount']
+    assert added[('AAA', 'Operating Expenses')] == 20.0
+    assert added[('BBB', 'Operating Income')] == 20.0
+    assert ('AAA', 'Gross Profit') not in added.index
+    assert (filled['Category'] == 'Gross Profit').sum() == 2
@@ -0,0 +1,37 @@
+import json
+import logging
+
+from scripts.utilities import logging_config
+from scripts.utilities.logging_config import ContextFilter, JsonFormatter, SamplingFilter, log_context
+
+def _record(msg, level=logging.INFO, args=()):
+    return logging.LogRecord('FinancialModeling', level, __file__, 1, msg, args, None)
+
+def test_repeated_messages_are_sampled_after_the_burst():
+    sampling = SamplingFilter(burst=3, window=60.0, sample_every=5)
+    passed = [sampling.filter(_record('Loaded %s', args=(i,))) for i in range(13)]
+    assert passed == [True] * 3 + [False] * 4 + [True] + [False] * 4 + [True]
+    assert all(sampling.filter(_record('Failed %s', logging.ERROR, (i,))) for i in range(10))
+
+def test_window_restarts_the_burst(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(logging_config.time, 'monotonic', lambda: now[0])
+    sampling = SamplingFilter(burst=1, window=10.0, sample_every=100)
+    assert [sampling.filter(_record('tick')) for _ in range(2)] == [True, False]
+    now[0] = 11.0
+    assert sampling.filter(_record('tick'))
+
+def test_tracked_templates_stay_bounded():
+    sampling = SamplingFilter(max_keys=10)
+    for i in range(100):
+        sampling.filter(_record(f'message {i}'))
+    assert len(sampling._counts) <= 10
+
+def test_json_lines_carry_context_and_sample_counts():
+    record = _record('Loaded %d rows', args=(5,))
+    with log_context(ticker='AAA', stage='ingest'):
+        ContextFilter().filter(record)
+    record.sampled = 100
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload['message'] == 'Loaded 5 rows'
+    assert (payload['ticker'], payload['stage'], payload['sampled']) == ('AAA', 'ingest', 100)
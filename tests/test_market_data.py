@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.data_ingestion.market_data import FakePriceProvider, ingest_prices, market_multiples
+from scripts.utilities.timeseries_store import TimeSeriesStore
+
+def test_asof_takes_last_value_on_or_before_each_date(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    store.append('close', ['AAA', 'AAA', 'BBB'], pd.to_datetime(['2023-01-02', '2023-01-05', '2023-01-03']), [1.0, 2.0, 10.0])
+    store.compact('close')
+    # A later segment overrides a stored day and adds a new one
+    store.append('close', ['AAA', 'AAA'], pd.to_datetime(['2023-01-05', '2023-01-09']), [3.0, 4.0])
+
+    prices = store.asof(
+        'close',
+        ['AAA', 'AAA', 'AAA', 'BBB', 'BBB', 'CCC'],
+        pd.to_datetime(['2023-01-01', '2023-01-06', '2023-01-09', '2023-01-02', '2023-02-01', '2023-01-09'])
+    )
+    np.testing.assert_array_equal(prices, [np.nan, 3.0, 4.0, np.nan, 10.0, np.nan])
+
+    store.compact('close')
+    assert list(store.read('close', 'AAA')) == [1.0, 3.0, 4.0]
+
+def test_ingest_fetches_only_new_dates(tmp_path):
+    store, provider = TimeSeriesStore(str(tmp_path)), FakePriceProvider()
+    first = ingest_prices(['AAA'], provider, store, start='2023-01-02', end='2023-01-06')
+    second = ingest_prices(['AAA'], provider, store, start='2023-01-02', end='2023-01-10')
+    assert (first, second) == (5, 2)
+    assert provider.calls[-1] == ('AAA', '2023-01-07', '2023-01-10')
+
+def test_52_week_period_end_is_priced_without_look_ahead(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    # Fiscal year ends Saturday 2022-09-24; the snapped month end is 2022-09-30
+    store.append('close', ['AAA', 'AAA'], pd.to_datetime(['2022-09-23', '2022-09-30']), [10.0, 99.0])
+    panel = pd.DataFrame({
+        'Ticker': 'AAA',
+        'Statement Type': 'Income Statement',
+        'Category': ['Net Income', 'Diluted Average Shares'],
+        'Period': '2022-09-24',
+        'Amount': [5.0, 2.0],
+    })
+    multiples = market_multiples(panel, store).iloc[0]
+    assert multiples['Price'] == 10.0
+    assert multiples['P/E'] == pytest.approx(4.0)
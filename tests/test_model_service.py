@@ -0,0 +1,25 @@
+import os
+
+import pandas as pd
+
+from scripts.service.model_service import ModelState
+
+def _archive_tagged(processed_dir, ticker, stamp, revenue):
+    archive_dir = os.path.join(processed_dir, ticker, 'archive')
+    os.makedirs(archive_dir, exist_ok=True)
+    pd.DataFrame({
+        'Category': ['Total Revenue'],
+        '2023-12-31': [revenue],
+        'Standardized Category': ['Revenue'],
+    }).to_csv(os.path.join(archive_dir, f'tagged_income_statement_{stamp}.csv'), index=False)
+
+def test_service_serves_archived_statements_and_later_runs(tmp_path):
+    _archive_tagged(str(tmp_path), 'AAA', '20240101_000000', 100.0)
+    state = ModelState(str(tmp_path), refresh_interval=0.0)
+    assert state.tickers() == ['AAA']
+    assert state.ticker_rows('AAA')['Amount'].tolist() == [100.0]
+
+    assert not state.refresh()
+    _archive_tagged(str(tmp_path), 'AAA', '20240201_000000', 120.0)
+    assert state.refresh()
+    assert state.ticker_rows('AAA')['Amount'].tolist() == [120.0]
@@ -0,0 +1,39 @@
+import pandas as pd
+
+from scripts.utilities.periods import align_panel, latest_period_label, normalize_periods, sort_period_labels
+
+def _panel(series):
+    rows = [
+        (ticker, 'Income Statement', 'Revenue', period, amount)
+        for ticker, periods in series.items() for period, amount in periods
+    ]
+    return pd.DataFrame(rows, columns=['Ticker', 'Statement Type', 'Category', 'Period', 'Amount'])
+
+def test_sort_period_labels_is_chronological():
+    assert sort_period_labels(['2023-09-30', 'Q1 2024', '2022-12-31']) == ['2022-12-31', '2023-09-30', 'Q1 2024']
+    assert latest_period_label(['2023-09-30', '2023-12-31', 'not a period']) == '2023-12-31'
+
+def test_staggered_fiscal_years_share_the_annual_grid():
+    panel = _panel({
+        'DEC': [('2021-12-31', 1.0), ('2022-12-31', 2.0), ('2023-12-31', 3.0)],
+        'SEP': [('2022-09-30', 10.0), ('2023-09-30', 20.0), ('2023-09-29 00:00:00', 20.0)],
+    })
+    series, grid, values = align_panel(panel, keys=('Ticker',))
+    assert list(grid.periods) == ['2021', '2022', '2023']
+    assert values[list(series.get_level_values('Ticker')).index('SEP')].tolist()[1:] == [10.0, 20.0]
+
+def test_quarterly_ticker_keeps_its_quarters_in_an_annual_panel():
+    annual = {ticker: [(f'{year}-12-31', 1.0) for year in range(2019, 2024)] for ticker in ['A', 'B', 'C']}
+    quarters = [('2023-03-31', 1.0), ('2023-06-30', 2.0), ('2023-09-30', 3.0), ('2023-12-31', 4.0)]
+    normalized = normalize_periods(_panel({**annual, 'Q': quarters}))
+    rows = normalized[normalized['Ticker'] == 'Q']
+    assert rows['Canonical Period'].tolist() == ['2023Q1', '2023Q2', '2023Q3', '2023Q4']
+    assert (normalized['Ticker'] != 'Q').sum() == 15
+
+def test_restatements_keep_the_latest_filing_only_for_the_same_period():
+    panel = _panel({'A': [('2022-06-30', 1.0), ('2022-12-31', 2.0), ('2022-12-31', 3.0)]}).assign(
+        **{'Filing Date': ['2022-08-01', '2023-02-01', '2023-05-01']}
+    )
+    normalized = normalize_periods(panel, quarterly=False)
+    # A fiscal year-end change gives two FY2022 periods; neither is dropped
+    assert sorted(normalized['Amount']) == [1.0, 3.0]
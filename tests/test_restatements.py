@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.data_ingestion import restatements
+from scripts.data_ingestion.restatements import diff_statement, record_pull
+
+def _statement(revenue_2023, periods=('2023-09-30', '2022-09-24')):
+    values = {'2023-09-30': [revenue_2023, 10.0], '2022-09-24': [90.0, 9.0], '2024-09-28': [120.0, 12.0]}
+    return pd.DataFrame(
+        {pd.Timestamp(period): values[period] for period in periods}, index=['Total Revenue', 'Net Income']
+    )
+
+def test_diff_reports_restated_added_and_removed_cells():
+    previous = _statement(100.0)
+    current = _statement(103.0, periods=('2024-09-28', '2023-09-30')).drop(index='Net Income')
+    changes = diff_statement(previous, current, 'income_statement').set_index(['Category', 'Period'])
+    assert changes.loc[('Total Revenue', '2023-09-30'), 'Change'] == 'Restated'
+    assert changes.loc[('Total Revenue', '2023-09-30'), 'Relative Change'] == pytest.approx(0.03)
+    assert changes.loc[('Total Revenue', '2024-09-28'), 'Change'] == 'Added'
+    assert set(changes.loc[changes['Change'] == 'Removed'].index) == {
+        ('Total Revenue', '2022-09-24'), ('Net Income', '2022-09-24'), ('Net Income', '2023-09-30'),
+    }
+
+def test_only_material_pulls_after_a_commit_rerun_the_pipeline(tmp_path, monkeypatch):
+    raw = tmp_path / 'raw' / 'AAA'
+    monkeypatch.setattr(restatements, 'get_data_paths', lambda ticker=None: (str(raw), str(tmp_path / 'processed')))
+
+    def pull(revenue):
+        data = {'income_statement': _statement(revenue)}
+        raw.mkdir(parents=True, exist_ok=True)
+        data['income_statement'].to_csv(raw / 'income_statement.csv')
+        return record_pull(data, 'AAA')
+
+    assert pull(100.0) is True
+    # Until the run commits, the same pull stays material so a failed run is rebuilt
+    assert pull(100.0) is True
+    restatements.commit_snapshot('AAA')
+    assert pull(100.0) is False
+    assert pull(100.5) is False
+    assert pull(103.0) is True
+
+    log = pd.read_csv(raw / 'change_log.csv')
+    assert log['Change'].tolist() == ['Restated', 'Restated']
+    np.testing.assert_allclose(log['Current'], [100.5, 103.0])
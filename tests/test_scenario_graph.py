@@ -0,0 +1,30 @@
+import pandas as pd
+import pytest
+
+from scripts.models.scenario_graph import build_scenario_graph, what_if
+
+def _panel():
+    rows = []
+    for ticker, revenue in (('AAA', 100.0), ('BBB', 200.0)):
+        for category, amount in (('Revenue', revenue), ('Cost of Goods Sold', revenue / 2), ('Net Income', revenue / 10)):
+            rows.append((ticker, 'Income Statement', category, '2023', amount))
+    return pd.DataFrame(rows, columns=['Ticker', 'Statement Type', 'Category', 'Period', 'Amount'])
+
+def test_every_default_threshold_is_an_input():
+    graph = build_scenario_graph(_panel())
+    for key in ('Revenue Growth Rate', 'COGS % Revenue', 'CapEx Growth Rate', 'Net Income'):
+        assert ('threshold', key) in graph
+
+def test_driver_threshold_rescales_its_category():
+    graph = build_scenario_graph(_panel())
+    assert graph.get(('scenario', 'AAA', 'Revenue'))['Strong'] == pytest.approx(102.0)
+
+    changed = what_if(graph, {('threshold', 'Revenue Growth Rate'): 0.1})
+    assert set(changed) == {('scenarios', 'AAA'), ('scenarios', 'BBB')}
+    scenarios = changed[('scenarios', 'BBB')].set_index('Metric')
+    assert scenarios.loc['Revenue', 'Strong'] == pytest.approx(220.0)
+    assert scenarios.loc['Cost of Goods Sold', 'Strong'] == pytest.approx(105.0)
+
+def test_driver_without_baseline_category_changes_nothing():
+    graph = build_scenario_graph(_panel())
+    assert what_if(graph, {('threshold', 'CapEx Growth Rate'): 0.2}) == {}
@@ -0,0 +1,45 @@
+import os
+
+import pandas as pd
+
+from scripts.analysis.screening import ScreeningIndex, build_metric_frame
+from scripts.utilities.data_transformation_utils import archive_files
+
+def _write_tagged(directory, revenue, gross_profit, name='tagged_income_statement.csv'):
+    os.makedirs(directory, exist_ok=True)
+    pd.DataFrame({
+        'Category': ['Total Revenue', 'Gross Profit'],
+        '2023-12-31': [revenue, gross_profit],
+        '2022-12-31': [revenue * 0.9, gross_profit * 0.9],
+        'Standardized Category': ['Revenue', 'Gross Profit'],
+    }).to_csv(os.path.join(directory, name), index=False)
+
+def test_index_reads_statements_archived_by_the_pipeline(tmp_path):
+    ticker_dir = tmp_path / 'AAA'
+    _write_tagged(ticker_dir, 100.0, 50.0)
+    archive_files(ticker_dir, ticker_dir / 'archive')
+    assert not (ticker_dir / 'tagged_income_statement.csv').exists()
+
+    index = ScreeningIndex(str(tmp_path))
+    assert list(index.tickers) == ['AAA']
+    assert list(index.screen(['Gross Margin > 40%'])['Ticker']) == ['AAA']
+
+def test_refresh_sees_a_later_archived_run(tmp_path):
+    archive_dir = tmp_path / 'AAA' / 'archive'
+    _write_tagged(archive_dir, 100.0, 50.0, 'tagged_income_statement_20240101_000000.csv')
+    index = ScreeningIndex(str(tmp_path))
+    assert list(index.screen(['Gross Margin < 40%'])['Ticker']) == []
+
+    _write_tagged(archive_dir, 100.0, 30.0, 'tagged_income_statement_20240201_000000.csv')
+    assert index.refresh() == ['AAA']
+    assert list(index.screen(['Gross Margin < 40%'])['Ticker']) == ['AAA']
+
+def test_growth_spans_52_week_years_ending_in_january():
+    panel = pd.DataFrame({
+        'Category': 'Revenue',
+        'Period': ['2018-12-29', '2020-01-04', '2021-01-02'],
+        'Amount': [100.0, 110.0, 121.0],
+    })
+    frame = build_metric_frame(panel)
+    assert list(frame.index) == [2018, 2019, 2020]
+    assert frame['Revenue Growth'].iloc[1:].round(6).tolist() == [0.1, 0.1]
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from scripts.models.segment_model import consolidated_revenue, forecast_segments
+
+def _segments():
+    rows = []
+    for ticker, year_end in (('AAA', '12-31'), ('BBB', '09-24')):
+        for year, scale in ((2022, 1.0), (2023, 1.1)):
+            period = f'{year}-{year_end}'
+            rows += [
+                (ticker, 'Product', 'Hardware', period, 60.0 * scale),
+                (ticker, 'Product', 'Services', period, 40.0 * scale),
+                (ticker, 'Geography', 'Americas', period, 70.0 * scale),
+                (ticker, 'Geography', 'Services', period, 30.0 * scale),
+            ]
+    return pd.DataFrame(rows, columns=['Ticker', 'Segment Type', 'Segment', 'Period', 'Amount'])
+
+def test_growth_override_applies_to_one_breakdown_only():
+    forecast = forecast_segments(_segments(), horizon=1, growth={('AAA', 'Product', 'Services'): 0.5})
+    projected = forecast[forecast['Projected']].set_index(['Ticker', 'Segment Type', 'Segment'])['Amount']
+    assert projected[('AAA', 'Product', 'Services')] == pytest.approx(66.0)
+    # Same segment name in another breakdown keeps its historical growth
+    assert projected[('AAA', 'Geography', 'Services')] == pytest.approx(36.3)
+    assert projected[('BBB', 'Product', 'Services')] == pytest.approx(48.4)
+
+def test_top_down_scales_each_breakdown_to_the_forecast_by_step():
+    revenue_forecast = pd.DataFrame({
+        'Ticker': ['AAA', 'AAA', 'BBB', 'BBB'],
+        'Statement Type': 'Income Statement',
+        'Category': 'Revenue',
+        'Step': [1, 2, 1, 2],
+        'Method': 'drift',
+        'Forecast': [150.0, 160.0, 100.0, 200.0],
+    })
+    forecast = forecast_segments(_segments(), horizon=2, reconcile='top_down', revenue_forecast=revenue_forecast)
+    totals = consolidated_revenue(forecast[forecast['Projected']], segment_type='Geography')
+    assert totals['Amount'].tolist() == pytest.approx([150.0, 160.0, 100.0, 200.0])
+    # BBB's fiscal year ends in September, so its steps are labeled from its own calendar
+    assert totals['Period'].tolist() == ['2024E', '2025E', '2024E', '2025E']
+
+def test_top_down_requires_the_consolidated_forecast():
+    with pytest.raises(ValueError):
+        forecast_segments(_segments(), reconcile='top_down')
+
+def test_revenue_gap_is_reported_per_breakdown_and_fiscal_year():
+    revenue = pd.DataFrame({
+        'Ticker': ['AAA', 'AAA', 'BBB', 'BBB'],
+        'Period': ['2022-12-31', '2023-12-31', '2022-09-24', '2023-09-30'],
+        'Amount': [100.0, 120.0, 100.0, 110.0],
+    })
+    forecast = forecast_segments(_segments(), horizon=1, revenue=revenue)
+    history = forecast[~forecast['Projected']]
+    assert set(history['Period']) == {'2022', '2023'}
+    unallocated = history[history['Segment'] == 'Unallocated']
+    assert unallocated[['Ticker', 'Segment Type', 'Period', 'Amount']].values.tolist() == [
+        ['AAA', 'Product', '2023', pytest.approx(10.0)],
+        ['AAA', 'Geography', '2023', pytest.approx(10.0)],
+    ]
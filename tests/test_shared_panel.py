@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.utilities.shared_panel import SharedPanel, map_shared
+
+PANEL = pd.DataFrame({
+    'Ticker': ['AAA', 'AAA', 'BBB', 'BBB', 'BBB'],
+    'Statement Type': ['Income Statement'] * 4 + ['Cash Flow Statement'],
+    'Category': ['Revenue', 'Revenue', 'Revenue', 'Revenue', 'Revenue'],
+    'Period': ['2022-12-31', '2023-12-31', '2022-09-24', '2023-09-30', '2023-09-30'],
+    'Amount': [100.0, 110.0, 50.0, 55.0, 1.0],
+})
+
+def revenue_total(panel, ticker):
+    return float(np.nansum(panel.series(ticker, 'Revenue', 'Income Statement')))
+
+def test_staggered_year_ends_share_period_columns():
+    with SharedPanel.publish(PANEL) as shared:
+        assert list(shared.periods) == ['2022', '2023']
+        np.testing.assert_array_equal(shared.series('AAA', 'Revenue', 'Income Statement'), [100.0, 110.0])
+        np.testing.assert_array_equal(shared.series('BBB', 'Revenue', 'Income Statement'), [50.0, 55.0])
+        with pytest.raises(KeyError):
+            shared.series('BBB', 'Revenue')
+
+def test_workers_read_the_published_block():
+    with SharedPanel.publish(PANEL) as shared:
+        assert map_shared(revenue_total, shared, ['AAA', 'BBB'], max_workers=2) == [210.0, 105.0]
@@ -0,0 +1,19 @@
+import pandas as pd
+
+from scripts.analysis.tagging_evaluation import UNMAPPED, evaluate, match_exact
+
+def test_exact_match_uses_the_dictionary_passed():
+    assert match_exact('Total Revenue') == 'Revenue'
+    assert match_exact('Turnover') == 'Turnover'
+    assert match_exact(' turnover ', dictionary={'Revenue': ['Turnover']}) == 'Revenue'
+    assert match_exact('Total Revenue', dictionary={'Sales': ['Turnover']}) == 'Total Revenue'
+
+def test_exact_strategy_scores_the_gold_set():
+    gold = pd.DataFrame({
+        'Label': ['Total Revenue', 'Cost Of Sales And Services', 'Net Income'],
+        'Category': ['Revenue', 'Cost of Goods Sold', UNMAPPED],
+    })
+    report, confusion = evaluate(gold, {'exact': match_exact})
+    row = report.iloc[0]
+    assert (row['Precision'], row['Recall']) == (0.5, 0.5)
+    assert set(confusion['Expected']) == {'Cost of Goods Sold', UNMAPPED}
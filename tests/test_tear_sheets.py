@@ -0,0 +1,22 @@
+import os
+
+import pandas as pd
+
+from scripts.outputs import tear_sheets
+from scripts.utilities.data_transformation_utils import archive_files
+
+def test_nightly_run_renders_archived_statements(tmp_path):
+    ticker_dir = tmp_path / 'processed' / 'AAA'
+    os.makedirs(ticker_dir)
+    pd.DataFrame({
+        'Category': ['Total Revenue', 'Net Income'],
+        '2022-12-31': [90.0, 9.0],
+        '2023-12-31': [100.0, 10.0],
+        'Standardized Category': ['Revenue', 'Net Income'],
+    }).to_csv(ticker_dir / 'tagged_income_statement.csv', index=False)
+    archive_files(ticker_dir, ticker_dir / 'archive')
+
+    output_dir = tmp_path / 'tear_sheets'
+    summary = tear_sheets.main(str(tmp_path / 'processed'), str(output_dir))
+    assert summary == {'rendered': 1, 'skipped': 0, 'failed': 0}
+    assert (output_dir / 'AAA_tear_sheet.png').is_file()
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from scripts.models.time_series_forecast import (
+    align_to_last_observation,
+    aligned_panel_groups,
+    forecast_auto,
+    forecast_panel,
+    forecast_series,
+    infer_season_length
+)
+
+def _panel(series):
+    rows = [
+        (ticker, 'Income Statement', 'Revenue', period, amount)
+        for ticker, periods in series.items() for period, amount in periods
+    ]
+    return pd.DataFrame(rows, columns=['Ticker', 'Statement Type', 'Category', 'Period', 'Amount'])
+
+def _annual(month_day, start=2018, years=6, first=150.0, step=10.0):
+    return [(f'{start + i}-{month_day}', first + step * i) for i in range(years)]
+
+def test_linear_extends_the_trend():
+    values = np.array([[1.0, 2.0, 3.0, 4.0], [10.0, np.nan, 30.0, 40.0]])
+    assert np.allclose(forecast_series(values, 2, 'linear'), [[5.0, 6.0], [50.0, 60.0]])
+
+def test_auto_picks_seasonal_for_a_seasonal_series():
+    values = np.tile([10.0, 20.0, 30.0, 40.0], 3)[None, :]
+    forecast, chosen = forecast_auto(values, 4, season_length=4)
+    assert chosen[0] == 'seasonal'
+    assert np.allclose(forecast, [[10.0, 20.0, 30.0, 40.0]], atol=1e-6)
+
+def test_infer_season_length():
+    assert infer_season_length(['2021-12-31', '2022-12-31', '2023-12-31']) == 1
+    assert infer_season_length(['2023-03-31', '2023-06-30', '2023-09-30']) == 4
+
+def test_align_to_last_observation():
+    values = np.array([[1.0, 2.0, np.nan], [np.nan, 1.0, 2.0], [np.nan, np.nan, np.nan]])
+    aligned = align_to_last_observation(values)
+    assert np.allclose(aligned[:2], [[np.nan, 1.0, 2.0], [np.nan, 1.0, 2.0]], equal_nan=True)
+    assert np.isnan(aligned[2]).all()
+
+def test_staggered_fiscal_years_forecast_their_own_next_periods():
+    panel = _panel({
+        'DEC': _annual('12-31'),
+        'SEP': _annual('09-30'),
+        'STALE': _annual('12-31', start=2015, years=5, first=100.0),
+    })
+    forecast = forecast_panel(panel, horizon=3, method='linear')
+    by_ticker = forecast.pivot(index='Ticker', columns='Step', values='Forecast')
+    assert np.allclose(by_ticker.loc['DEC'], [210.0, 220.0, 230.0])
+    assert np.allclose(by_ticker.loc['SEP'], [210.0, 220.0, 230.0])
+    assert np.allclose(by_ticker.loc['STALE'], [150.0, 160.0, 170.0])
+
+def test_auto_never_falls_back_for_lack_of_holdout_columns():
+    panel = _panel({'DEC': _annual('12-31'), 'SEP': _annual('09-30')})
+    forecast = forecast_panel(panel, horizon=2, method='auto')
+    assert set(forecast['Method']) == {'linear'}
+
+def test_season_length_is_inferred_per_ticker():
+    quarters = pd.date_range('2020-03-31', periods=12, freq='QE').strftime('%Y-%m-%d')
+    panel = _panel({
+        'QTR': list(zip(quarters, [10.0, 20.0, 30.0, 40.0] * 3)),
+        'DEC': _annual('12-31'),
+    })
+    forecast = forecast_panel(panel, horizon=4, method='auto')
+    methods = forecast.groupby('Ticker')['Method'].first()
+    assert methods['QTR'] == 'seasonal'
+    assert methods['DEC'] != 'seasonal'
+
+def test_season_length_ignores_repeated_period_ends_across_categories():
+    panel = pd.concat([_panel({'DEC': _annual('12-31')}), _panel({'DEC': _annual('12-31')}).assign(Category='Net Income')])
+    groups = list(aligned_panel_groups(panel))
+    assert [season_length for season_length, *_ in groups] == [1]
+    assert groups[0][3].shape == (2, 6)
+
+def test_generate_forecast_follows_the_period_index():
+    from scripts.models.financial_forecast import generate_forecast
+    annual = pd.DataFrame({'Revenue': [100.0, 110.0, 120.0, 130.0, 140.0, 150.0]},
+                          index=[f'{year}-12-31' for year in range(2018, 2024)])
+    forecast = generate_forecast({'income_statement': annual}, forecast_years=2, method='auto')
+    assert np.allclose(forecast['income_statement']['Revenue'], [160.0, 170.0])
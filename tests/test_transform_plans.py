@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from scripts.data_preprocessing import transform_plans
+from scripts.data_preprocessing.transform_plans import compile_plan, plan_for, register_row_order
+
+def _raw():
+    return pd.DataFrame({
+        'Unnamed: 0': ['Net Income', None, 'Cost Of Revenue', 'Total Revenue'],
+        '2022-12-31': [9.0, 0.0, 50.0, 90.0],
+        '2023-12-31': [10.0, 0.0, 55.0, 100.0],
+    })
+
+def test_plan_orders_periods_and_rows_once_per_layout():
+    raw = _raw()
+    plan = plan_for(raw, 'income_statement')
+    assert plan is plan_for(raw.copy(), 'income_statement')
+
+    result = plan.apply(raw)
+    assert list(result.columns) == ['Category', '2023-12-31', '2022-12-31']
+    assert result['Category'].tolist() == ['Total Revenue', 'Cost Of Revenue', 'Net Income']
+
+def test_registered_hook_replaces_compiled_plans(monkeypatch):
+    monkeypatch.setattr(transform_plans, 'ROW_ORDER_HOOKS', {})
+    before = plan_for(_raw(), 'income_statement', provider='filings')
+
+    @register_row_order('filings', ['income_statement'])
+    def keep_filed_order(n_rows):
+        return np.arange(n_rows)
+
+    after = plan_for(_raw(), 'income_statement', provider='filings')
+    assert after is not before
+    assert after.apply(_raw())['Category'].tolist() == ['Net Income', 'Cost Of Revenue', 'Total Revenue']
+    compile_plan.cache_clear()
+
+def test_tagging_keeps_distinct_lines_apart():
+    tagged = transform_plans.tag_labels(plan_for(_raw(), 'income_statement').apply(_raw()))
+    assert tagged['Standardized Category'].tolist() == ['Revenue', 'Cost of Goods Sold', 'Net Income']
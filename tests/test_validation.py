@@ -0,0 +1,35 @@
+import pandas as pd
+
+from scripts.data_preprocessing.validation import quarantine, validate_panel
+
+def _series(ticker, category, amounts, statement='Income Statement'):
+    return pd.DataFrame({
+        'Ticker': ticker,
+        'Statement Type': statement,
+        'Category': category,
+        'Period': [f'{2018 + i}-12-31' for i in range(len(amounts))],
+        'Amount': amounts,
+    })
+
+def test_jump_in_a_short_series_is_flagged():
+    panel = _series('AAA', 'Other Income', [100.0, 105.0, 110.0, 114.0, 400.0, 405.0])
+    violations = validate_panel(panel)
+    assert violations['Rule'].tolist() == ['Robust Z-Score Jump']
+    assert violations['Period'].tolist() == ['2022-12-31']
+
+def test_steady_series_is_not_flagged():
+    panel = pd.concat([
+        _series('AAA', 'Other Income', [100.0, 105.0, 110.0, 114.0, 119.0, 124.0]),
+        _series('BBB', 'Other Income', [100.0, 130.0, 120.0, 150.0, 170.0, 160.0]),
+    ])
+    assert validate_panel(panel).empty
+
+def test_quarantine_drops_only_tickers_with_errors():
+    panel = pd.concat([
+        _series('AAA', 'Revenue', [-1.0, 10.0]),
+        _series('BBB', 'Revenue', [1.0, 10.0]),
+    ])
+    violations = validate_panel(panel)
+    kept, quarantined = quarantine(panel, violations)
+    assert quarantined == ['AAA']
+    assert set(kept['Ticker']) == {'BBB'}
@@ -0,0 +1,37 @@
+from scripts import batch_runner
+from scripts.utilities.work_queue import WorkQueue
+
+def test_failed_attempts_back_off_then_fail(tmp_path):
+    queue = WorkQueue(str(tmp_path / 'queue.sqlite'), max_attempts=2, backoff_seconds=60.0)
+    queue.enqueue('AAA', 'ingest')
+    task = queue.claim('w')
+    assert queue.fail(task['id'], RuntimeError('boom')) == 'pending'
+    assert queue.claim('w') is None
+    assert queue.next_retry_in() > 50
+
+def test_interrupted_run_resumes_and_finished_run_restarts(tmp_path):
+    queue = WorkQueue(str(tmp_path / 'queue.sqlite'))
+    assert queue.start_pipeline('AAA', 'ingest') is True
+    queue.claim('w')
+    # The process dies mid-task: the next run requeues it instead of starting over
+    assert queue.start_pipeline('AAA', 'ingest') is False
+    assert queue.requeue_running() == 1
+    task = queue.claim('w')
+    queue.complete(task['id'])
+    assert queue.start_pipeline('AAA', 'ingest') is True
+    assert [row['status'] for row in queue.summary()] == ['pending']
+
+def test_batch_stops_a_ticker_whose_stage_returns_false(tmp_path, monkeypatch):
+    calls, committed = [], []
+    def stage(name, proceed=None):
+        return name, lambda ticker: calls.append((ticker, name)) or (proceed(ticker) if proceed else None)
+    monkeypatch.setattr(batch_runner, 'STAGES', [
+        stage('ingest'), stage('baseline', lambda ticker: ticker != 'BBB'), stage('store'),
+    ])
+    monkeypatch.setattr(batch_runner, 'commit_snapshot', committed.append)
+
+    batch_runner.run_batch(['aaa', 'BBB'], processes=0, db_path=str(tmp_path / 'queue.sqlite'))
+    assert sorted(calls) == [
+        ('AAA', 'baseline'), ('AAA', 'ingest'), ('AAA', 'store'), ('BBB', 'baseline'), ('BBB', 'ingest'),
+    ]
+    assert committed == ['AAA']
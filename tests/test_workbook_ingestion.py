@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from openpyxl import Workbook
+
+from scripts.data_ingestion.workbook_ingestion import harvest_workbooks, parse_sheet_rows
+
+def test_header_and_transposed_layouts_parse_alike():
+    across = [
+        ('Income Statement', None, None),
+        (None, 'FY2022', 'FY2023E'),
+        ('Revenue:', 100, 110.0),
+        ('Notes', 'n/a', None),
+    ]
+    down = [
+        (None, 'Revenue'),
+        ('FY2022', 100),
+        ('FY2023E', 110.0),
+    ]
+    expected = [('Revenue', '2022', False, 100.0), ('Revenue', '2023', True, 110.0)]
+    assert parse_sheet_rows(across) == expected
+    assert parse_sheet_rows(down) == expected
+
+def test_workbook_rows_are_tagged_by_exact_name_or_alias(tmp_path):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = 'Model'
+    for row in [
+        (None, datetime(2022, 12, 31), datetime(2023, 12, 31)),
+        ('Total Revenue', 100, 110),
+        ('Cost Of Sales And Services', 60, 65),
+        ('Revenue Growth %', None, 0.1),
+    ]:
+        sheet.append(row)
+    path = tmp_path / 'model.xlsx'
+    workbook.save(path)
+
+    harvest = harvest_workbooks([str(path)])
+    categories = harvest.drop_duplicates('Row Label').set_index('Row Label')[['Kind', 'Category']]
+    assert categories.loc['Total Revenue'].tolist() == ['Line Item', 'Revenue']
+    # Close but not an alias: left as reported rather than merged into Revenue or COGS
+    assert categories.loc['Cost Of Sales And Services'].tolist() == ['Line Item', 'Cost Of Sales And Services']
+    assert categories.loc['Revenue Growth %'].tolist() == ['Assumption', 'Revenue Growth %']
+    assert set(harvest['Period']) == {'2022-12-31', '2023-12-31'}
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.models.working_capital import generate_working_capital, working_capital_by_period
+
+def _ticker(ticker, periods, revenue, receivables):
+    rows = []
+    for period, sales, balance in zip(periods, revenue, receivables):
+        rows += [
+            (ticker, 'Income Statement', 'Revenue', period, sales),
+            (ticker, 'Income Statement', 'Cost of Goods Sold', period, sales / 2),
+            (ticker, 'Balance Sheet', 'Accounts Receivable', period, balance),
+            (ticker, 'Balance Sheet', 'Inventory', period, sales / 2 * 60 / 365),
+            (ticker, 'Balance Sheet', 'Accounts Payable', period, sales / 2 * 45 / 365),
+        ]
+    return rows
+
+def _panel():
+    rows = (
+        _ticker('AAA', ['2021-12-31', '2022-12-31', '2023-12-31'], [365.0, 365.0, 730.0], [30.0, 30.0, 60.0])
+        # BBB ends its year in September and has not reported 2023 yet
+        + _ticker('BBB', ['2020-09-26', '2021-09-25', '2022-09-24'], [730.0, 730.0, 730.0], [40.0, 40.0, 40.0])
+    )
+    return pd.DataFrame(rows, columns=['Ticker', 'Statement Type', 'Category', 'Period', 'Amount'])
+
+def test_drivers_use_each_tickers_own_latest_periods():
+    _, drivers = generate_working_capital(_panel(), horizon=2, lookback=2)
+    drivers = drivers.set_index('Ticker')
+    np.testing.assert_allclose(drivers.loc['AAA', ['DSO', 'DIO', 'DPO']], [30.0, 60.0, 45.0])
+    np.testing.assert_allclose(drivers.loc['BBB', ['DSO', 'DIO', 'DPO']], [20.0, 60.0, 45.0])
+    assert drivers.loc['BBB', 'Cash Conversion Cycle'] == pytest.approx(35.0)
+
+def test_change_in_working_capital_follows_supplied_flows():
+    revenue = pd.DataFrame({1: [730.0, 730.0], 2: [1095.0, 730.0]}, index=['AAA', 'BBB'])
+    schedule, _ = generate_working_capital(_panel(), horizon=2, lookback=2, revenue=revenue, cogs=revenue / 2)
+    change = working_capital_by_period(schedule)
+    assert list(change.columns) == ['Year 1', 'Year 2']
+    # BBB's flows are flat from its last reported year, so its working capital does not move
+    np.testing.assert_allclose(change.loc['BBB'], [0.0, 0.0], atol=1e-9)
+    # AAA grows Revenue by 365 and COGS by 182.5: receivables +30, inventory +30, payables +22.5
+    np.testing.assert_allclose(change.loc['AAA'], [0.0, -37.5])